@@ -1,20 +1,35 @@
-from flask import Flask, render_template, request, jsonify, send_file
+import time
+# Taken before any other import so the startup profile covers the whole module import
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context, Request, g, has_request_context
 import os
+import shutil
 import sys
 import tempfile
-from groq import Groq
 from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
 from dotenv import load_dotenv
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
 from datetime import datetime
 import json
+import html
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+import zipfile
+import xml.etree.ElementTree as ElementTree
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+import asyncio
+import hashlib
+import mmap
+import multiprocessing
+from contextlib import contextmanager
+import re
+import unicodedata
+import sqlite3
+import threading
+import uuid
+from skill_taxonomy import SKILLS, ROLE_REQUIREMENTS
 
 # Configure UTF-8 encoding
 if sys.stdout.encoding != 'utf-8':
@@ -27,77 +42,120 @@ if sys.stderr.encoding != 'utf-8':
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 load_dotenv()
 
+# Imported after load_dotenv() so the settings the package reads from the environment see .env
+from skillgap.caches import AnalysisResultCache, ByteBoundedLRUCache, ExtractedTextCache, SemanticAnalysisCache, SessionStore, SQLiteCacheBackend, embed_cv_text
+from skillgap.concurrency import AsyncLoopThread, ConcurrencyLimiter, FlightAbandoned, ServerBusyError, SingleFlight
+from skillgap.jobs import JobQueue, JobWorkerPool
+from skillgap.matching import RoleFitIndex, SkillMatcher
+from skillgap.observability import metrics
+from skillgap.resilience import CircuitBreaker, CircuitOpenError, ResilientGroqClient
+from skillgap.routing import ModelRouter
+from skillgap.serialization import encode_json, get_orjson, safe_encode
+from skillgap.startup import current_rss_mb, lazy_import, startup_profile
+from skillgap.workers import CPUPoolBusy, CPUTaskTimeout, CPUWorkerPool
+
+STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', '').strip().lower() in ('1', 'true', 'yes')
+
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv('UPLOAD_SPOOL_THRESHOLD', str(2 * 1024 * 1024)))
+PDF_MMAP_THRESHOLD = int(os.getenv('PDF_MMAP_THRESHOLD', str(4 * 1024 * 1024)))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '50000'))
+PDF_TIME_LIMIT = float(os.getenv('PDF_TIME_LIMIT', '10'))
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+PDF_PAGES_PER_TASK = int(os.getenv('PDF_PAGES_PER_TASK', '4'))
+DOCX_MAX_CHARS = int(os.getenv('DOCX_MAX_CHARS', str(PDF_MAX_CHARS)))
+CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', str(PDF_EXTRACT_WORKERS)))
+CPU_POOL_MAX_QUEUE = int(os.getenv('CPU_POOL_MAX_QUEUE', '32'))
+CPU_POOL_TASK_TIMEOUT = float(os.getenv('CPU_POOL_TASK_TIMEOUT', '30'))
+CPU_POOL_MAX_TASKS_PER_WORKER = int(os.getenv('CPU_POOL_MAX_TASKS_PER_WORKER', '200'))
+CPU_POOL_EXTRACT_MIN_BYTES = int(os.getenv('CPU_POOL_EXTRACT_MIN_BYTES', str(256 * 1024)))
+CPU_POOL_QUEUE_TIMEOUT = float(os.getenv('CPU_POOL_QUEUE_TIMEOUT', '5'))
+
+
+# Purpose: Upload buffer that fingerprints the file while it is being received
+# Functionality:
+#   - A SpooledTemporaryFile whose write() also feeds a BLAKE2b hash, so the content hash of an
+#     upload is ready as soon as Werkzeug has parsed it, without reading the file a second time
+#   - content_digest() returns the hex digest of everything written so far
+# Used by: SpooledUploadRequest for every uploaded file; extract_text_cached() keys on the digest
+class HashingSpooledFile(tempfile.SpooledTemporaryFile):
+    """SpooledTemporaryFile that hashes the bytes written to it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hasher = hashlib.blake2b(digest_size=20)
+
+    def write(self, data):
+        self._hasher.update(data)
+        return super().write(data)
+
+    def content_digest(self):
+        return self._hasher.hexdigest()
+
+
+# Purpose: Keep uploaded files in memory instead of writing them to disk
+# Functionality:
+#   - Buffers each uploaded file in a HashingSpooledFile that stays in RAM up to
+#     UPLOAD_SPOOL_THRESHOLD bytes and only then rolls over to an anonymous temp file
+#   - Every upload gets its own private buffer, so concurrent uploads never share a path
+#   - The buffer hashes the upload as it arrives (used to cache extracted text)
+# Used by: Flask as app.request_class for all incoming requests
+class SpooledUploadRequest(Request):
+    """Request class that spools file uploads in memory up to a configurable size."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpooledFile(max_size=UPLOAD_SPOOL_THRESHOLD, mode='rb+')
+
+
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
-app.config['UPLOAD_FOLDER'] = os.path.join(tempfile.gettempdir(), 'skillgap_ai_uploads')
 app.config['JSON_AS_ASCII'] = False
 app.config['JSON_SORT_KEYS'] = False
 
 
-# Helper to create safe JSON responses
-# Purpose: Convert Python objects to JSON responses with proper UTF-8 encoding
+# Purpose: Build every JSON response of the API
 # Functionality:
-#   - Recursively processes dictionaries and lists to encode all string values
-#   - Uses safe_encode() helper to handle special characters and non-ASCII text
-#   - Creates Flask response object with explicit UTF-8 charset header
-#   - Sets proper mimetype to ensure browser interprets content as JSON
-#   - Handles nested data structures (dicts within lists, etc.)
-# Used by: API endpoints that return success responses with data
+#   - Serializes the payload with encode_json() and hands the bytes to Flask as the response body
+#   - Sets the final Content-Type (with charset) up front, so set_utf8_response() leaves it alone
+# Used by: safe_jsonify() and safe_jsonify_error()
+def json_response(data, status=200):
+    """Returns a Flask response with data encoded as UTF-8 JSON."""
+    return app.response_class(
+        response=encode_json(data),
+        status=status,
+        content_type='application/json; charset=utf-8'
+    )
 
+
+# Purpose: Convert Python objects to JSON responses with proper UTF-8 encoding
+# Used by: API endpoints that return success responses with data
 def safe_jsonify(data):
-    """Converts data to JSON response with UTF-8 encoding. Recursively encodes all strings to handle special characters."""
-    def encode_dict(obj):
-        if isinstance(obj, dict):
-            return {k: encode_dict(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [encode_dict(item) for item in obj]
-        elif isinstance(obj, str):
-            return safe_encode(obj)
-        else:
-            return obj
-    
-    safe_data = encode_dict(data)
-    response_str = json.dumps(safe_data, ensure_ascii=False)
-    response = app.response_class(
-        response=response_str,
-        status=200,
-        mimetype='application/json; charset=utf-8'
-    )
-    return response
+    """Converts data to a 200 JSON response with UTF-8 encoding."""
+    return json_response(data)
+
 
 # Purpose: Convert error data to JSON responses with custom HTTP status codes and UTF-8 encoding
-# Functionality:
-#   - Similar to safe_jsonify() but accepts custom HTTP status codes (400, 404, 500, etc.)
-#   - Recursively encodes all strings in error data to handle special characters
-#   - Creates Flask response object with custom status code and UTF-8 charset
-#   - Maintains consistent error response format across the application
-#   - Prevents encoding errors when returning error messages to clients
 # Used by: API endpoints that return error responses with appropriate HTTP status codes
-
 def safe_jsonify_error(data, status_code=500):
     """Converts error data to JSON response with proper HTTP status code and UTF-8 encoding."""
-    def encode_dict(obj):
-        if isinstance(obj, dict):
-            return {k: encode_dict(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [encode_dict(item) for item in obj]
-        elif isinstance(obj, str):
-            return safe_encode(obj)
-        else:
-            return obj
-    
-    safe_data = encode_dict(data)
-    response_str = json.dumps(safe_data, ensure_ascii=False)
-    response = app.response_class(
-        response=response_str,
-        status=status_code,
-        mimetype='application/json; charset=utf-8'
-    )
-    return response
+    return json_response(data, status_code)
+
+
+# Purpose: Stream many records as JSON Lines without building the whole body in memory
+# Functionality:
+#   - Encodes each record with encode_json() as it arrives and yields it as one newline-terminated line
+# Used by: analyze_batch() for the per-item results of /analyze-batch
+def iter_json_lines(records):
+    """Yields each record as a UTF-8 JSON line (bytes)."""
+    for record in records:
+        yield encode_json(record) + b"\n"
+
 
 # Purpose: Flask middleware that ensures all HTTP response headers have UTF-8 encoding specified
 # Functionality:
 #   - Runs after every Flask route returns a response (after_request decorator)
+#   - Leaves responses that already declare a charset (e.g. json_response()) untouched
 #   - Checks if Content-Type header is missing or contains 'application/json'
 #   - Appends '; charset=utf-8' to Content-Type headers to explicitly declare UTF-8 encoding
 #   - Handles both JSON responses and text/html responses
@@ -106,6 +164,8 @@ def safe_jsonify_error(data, status_code=500):
 @app.after_request
 def set_utf8_response(response):
     """Ensures all responses have UTF-8 content-type header set correctly."""
+    if response.content_type and 'charset=' in response.content_type:
+        return response
     if response.content_type is None or 'application/json' in response.content_type:
         response.headers['Content-Type'] = 'application/json; charset=utf-8'
     elif response.content_type and 'text' in response.content_type:
@@ -113,36 +173,413 @@ def set_utf8_response(response):
     return response
 
 
-def ensure_upload_folder():
-    """Create the writable upload directory when the app needs it."""
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', '').strip().lower() in ('1', 'true', 'yes')
+
+
+metrics.declare('skillgap_stage_duration_seconds', 'histogram', 'Time spent in each stage of request handling.')
+metrics.declare('skillgap_http_request_duration_seconds', 'histogram', 'Time to fully serve a request, by endpoint.')
+metrics.declare('skillgap_http_requests_total', 'counter', 'Requests served, by endpoint and status code.')
+metrics.declare('skillgap_http_requests_in_flight', 'gauge', 'Requests currently being served.')
+metrics.declare('skillgap_groq_tokens_total', 'counter', 'Tokens reported by Groq responses, by type.')
+metrics.inc('skillgap_http_requests_in_flight', 0)
+
+# Purpose: Time one stage of a request (extraction, LLM call, PDF build, ...)
+# Functionality:
+#   - Records the elapsed time in the skillgap_stage_duration_seconds histogram under the stage name
+#   - Inside a request, also keeps (stage, seconds) on flask.g for the Server-Timing header
+#   - Works outside requests too (job workers, background renders), where only the histogram is updated
+# Used by: /analyze, analyze_cv_with_groq(), render_session_report() and /download-pdf
+@contextmanager
+def timed_stage(stage):
+    """Context manager that records how long the enclosed block took as a named stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe('skillgap_stage_duration_seconds', elapsed, stage=stage)
+        if has_request_context():
+            g.setdefault('stage_timings', []).append((stage, elapsed))
+
 
+def record_token_usage(usage):
+    """Adds the prompt/completion token counts of a Groq usage object to the token counters."""
+    if usage is None:
+        return
+    for kind in ('prompt', 'completion'):
+        tokens = getattr(usage, f'{kind}_tokens', None)
+        if tokens:
+            metrics.inc('skillgap_groq_tokens_total', tokens, type=kind)
 
-# Initialize Groq AI client
-# Purpose: Set up connection to Groq API for CV analysis
+# Purpose: Request-level metrics and the optional Server-Timing header
+# Functionality:
+#   - Counts in-flight requests and, when each request is torn down (after a streamed body is fully
+#     sent), records its total duration per endpoint
+#   - Counts responses by endpoint and status code
+#   - With SERVER_TIMING_HEADER enabled, adds a Server-Timing header listing the stages timed so far,
+#     so browser devtools show where the time went (streamed responses only include pre-stream stages)
+# Used by: Automatically applied to all Flask requests
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    metrics.inc('skillgap_http_requests_in_flight', 1)
+
+
+@app.after_request
+def finish_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.inc('skillgap_http_requests_total', endpoint=endpoint, status=str(response.status_code))
+    if SERVER_TIMING_HEADER:
+        timings = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in g.get('stage_timings', [])]
+        if 'request_started' in g:
+            timings.append(f"total;dur={(time.perf_counter() - g.request_started) * 1000:.1f}")
+        if timings:
+            response.headers['Server-Timing'] = ', '.join(timings)
+    return response
+
+
+@app.teardown_request
+def end_request_metrics(error=None):
+    if 'request_started' not in g:
+        return
+    metrics.inc('skillgap_http_requests_in_flight', -1)
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.observe('skillgap_http_request_duration_seconds', time.perf_counter() - g.pop('request_started'), endpoint=endpoint)
+
+
+# Groq AI client settings
+# Purpose: Configure the connection to Groq API for CV analysis
 # Functionality:
 #   - Reads GROQ_API_KEY from .env environment file
 #   - Validates API key is not empty and not the default placeholder value
 #   - Prints warning message if API key is missing or invalid
 #   - Encodes API key to ASCII format to remove any non-ASCII characters
-#   - Creates Groq client instance for API communication
-#   - Sets client to None if initialization fails (allows graceful degradation)
+#   - The client itself is created on first use by get_groq_client()
+
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL') or None
+GROQ_TIMEOUT = float(os.getenv('GROQ_TIMEOUT', '30'))
+GROQ_CONNECT_TIMEOUT = float(os.getenv('GROQ_CONNECT_TIMEOUT', '5'))
+GROQ_MAX_CONNECTIONS = int(os.getenv('GROQ_MAX_CONNECTIONS', '100'))
+GROQ_MAX_KEEPALIVE = int(os.getenv('GROQ_MAX_KEEPALIVE', '20'))
+
+
+def groq_http_timeout():
+    """Returns the httpx timeout used for every Groq call."""
+    httpx = lazy_import('httpx')
+    return httpx.Timeout(GROQ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT)
+
+
+def groq_http_limits():
+    """Returns the httpx connection pool limits shared by all Groq calls."""
+    httpx = lazy_import('httpx')
+    return httpx.Limits(max_connections=GROQ_MAX_CONNECTIONS, max_keepalive_connections=GROQ_MAX_KEEPALIVE)
+
 
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 if not GROQ_API_KEY or GROQ_API_KEY == 'your_groq_api_key_here':
-    print("WARNING: GROQ_API_KEY not set or using default value!")
-    print("Please set your GROQ_API_KEY in the .env file")
-    print("Get your API key from: https://console.groq.com/keys")
-    client = None
+    # CPU pool workers import this module too; warn once, from the server process
+    if multiprocessing.current_process().name == 'MainProcess':
+        print("WARNING: GROQ_API_KEY not set or using default value!")
+        print("Please set your GROQ_API_KEY in the .env file")
+        print("Get your API key from: https://console.groq.com/keys")
+    GROQ_API_KEY = None
 else:
-    try:
-        GROQ_API_KEY = GROQ_API_KEY.encode('ascii', errors='ignore').decode('ascii')
-        client = Groq(api_key=GROQ_API_KEY)
-    except Exception as e:
-        print(f"ERROR: Failed to initialize Groq client: {e}")
-        client = None
+    GROQ_API_KEY = GROQ_API_KEY.encode('ascii', errors='ignore').decode('ascii')
+
+client = None
+_groq_client_failed = False
+_groq_client_lock = threading.Lock()
+
+# Purpose: Create the shared Groq client the first time an analysis needs it
+# Functionality:
+#   - Imports the Groq SDK and httpx lazily, so requests that never call Groq do not load them
+#   - Creates the Groq client on a tuned, reused HTTP connection pool
+#   - Optional GROQ_BASE_URL points the client at another endpoint (e.g. fake_groq_server.py)
+#   - Disables the SDK's own retries; ResilientGroqClient (groq_gateway) handles them
+#   - Returns None without an API key or if initialization failed (allows graceful degradation);
+#     a failed initialization is logged once and not retried
+# Used by: groq_gateway, analyze_cv_with_groq() and its streaming/async variants, warm_up()
+def get_groq_client():
+    """Returns the shared Groq client, creating it on first use; None if Groq is not configured."""
+    global client, _groq_client_failed
+    if client is not None or GROQ_API_KEY is None or _groq_client_failed:
+        return client
+    with _groq_client_lock:
+        if client is None and not _groq_client_failed:
+            try:
+                groq = lazy_import('groq')
+                httpx = lazy_import('httpx')
+                client = groq.Groq(
+                    api_key=GROQ_API_KEY,
+                    base_url=GROQ_BASE_URL,
+                    max_retries=0,
+                    timeout=groq_http_timeout(),
+                    http_client=httpx.Client(limits=groq_http_limits(), timeout=groq_http_timeout())
+                )
+            except Exception as e:
+                print(f"ERROR: Failed to initialize Groq client: {e}")
+                _groq_client_failed = True
+    return client
+
+
+GROQ_MAX_RETRIES = int(os.getenv('GROQ_MAX_RETRIES', '3'))
+GROQ_BACKOFF_BASE = float(os.getenv('GROQ_BACKOFF_BASE', '0.5'))
+GROQ_BACKOFF_MAX = float(os.getenv('GROQ_BACKOFF_MAX', '8'))
+GROQ_HEDGE = os.getenv('GROQ_HEDGE', '').strip().lower() in ('1', 'true', 'yes')
+GROQ_HEDGE_PERCENTILE = float(os.getenv('GROQ_HEDGE_PERCENTILE', '95'))
+GROQ_HEDGE_MIN_SAMPLES = int(os.getenv('GROQ_HEDGE_MIN_SAMPLES', '20'))
+GROQ_BREAKER_THRESHOLD = int(os.getenv('GROQ_BREAKER_THRESHOLD', '5'))
+GROQ_BREAKER_RESET = float(os.getenv('GROQ_BREAKER_RESET', '30'))
+
+
+def create_groq_gateway():
+    """Builds a ResilientGroqClient from the GROQ_* retry, hedging and circuit breaker settings."""
+    return ResilientGroqClient(
+        get_groq_client,
+        timeout=GROQ_TIMEOUT,
+        max_retries=GROQ_MAX_RETRIES,
+        backoff_base=GROQ_BACKOFF_BASE,
+        backoff_max=GROQ_BACKOFF_MAX,
+        hedge=GROQ_HEDGE,
+        hedge_percentile=GROQ_HEDGE_PERCENTILE,
+        hedge_min_samples=GROQ_HEDGE_MIN_SAMPLES,
+        breaker=CircuitBreaker(GROQ_BREAKER_THRESHOLD, GROQ_BREAKER_RESET),
+        max_workers=GROQ_MAX_CONNECTIONS
+    )
+
+
+# One gateway per model so each keeps its own latency window and circuit breaker
+groq_gateway = create_groq_gateway()
+fast_groq_gateway = create_groq_gateway()
+
+
+# Purpose: Turn Groq client failures into messages that make sense to end users
+# Functionality:
+#   - Rate limiting, timeouts and an open circuit breaker get short, actionable messages
+#   - Anything else falls back to the exception text
+# Used by: analyze_cv_with_groq() and its streaming/async variants
+def describe_groq_error(error):
+    """Returns a user-facing description of a failed Groq call."""
+    if isinstance(error, CircuitOpenError):
+        return "The AI service is temporarily unavailable. Please try again in a few seconds."
+    # Any Groq error means the SDK is already loaded; do not import it just to classify other errors
+    groq = sys.modules.get('groq')
+    if groq is None:
+        return safe_encode(str(error))
+    if isinstance(error, groq.RateLimitError):
+        return "The AI service is receiving too many requests right now. Please try again in a moment."
+    if isinstance(error, groq.APITimeoutError):
+        return "The AI service took too long to respond. Please try again."
+    return safe_encode(str(error))
+
+# Model and prompt identity used to key cached analyses.
+# Bump PROMPT_VERSION whenever the prompt in analyze_cv_with_groq() changes so stale results are not served.
+GROQ_MODEL = os.getenv('GROQ_MODEL', 'llama-3.3-70b-versatile')
+PROMPT_VERSION = '2'
+
+GROQ_FAST_MODEL = os.getenv('GROQ_FAST_MODEL', 'llama-3.1-8b-instant')
+GROQ_MAX_TOKENS = int(os.getenv('GROQ_MAX_TOKENS', '1500'))
+GROQ_FAST_MAX_TOKENS = int(os.getenv('GROQ_FAST_MAX_TOKENS', '1200'))
+MODEL_ROUTING = os.getenv('MODEL_ROUTING', '1').strip().lower() in ('1', 'true', 'yes')
+ROUTE_SHORT_CV_TOKENS = int(os.getenv('ROUTE_SHORT_CV_TOKENS', '250'))
+ROUTE_LATENCY_SLO = float(os.getenv('ROUTE_LATENCY_SLO', '12'))
+ROUTE_BUSY_QUEUE = int(os.getenv('ROUTE_BUSY_QUEUE', '8'))
+ROUTE_COOLDOWN = float(os.getenv('ROUTE_COOLDOWN', '30'))
+
+
+model_router = ModelRouter(
+    {'large': groq_gateway, 'fast': fast_groq_gateway},
+    {'large': GROQ_MODEL, 'fast': GROQ_FAST_MODEL},
+    {'large': GROQ_MAX_TOKENS, 'fast': GROQ_FAST_MAX_TOKENS},
+    enabled=MODEL_ROUTING,
+    short_cv_tokens=ROUTE_SHORT_CV_TOKENS,
+    latency_slo=ROUTE_LATENCY_SLO,
+    busy_queue=ROUTE_BUSY_QUEUE,
+    cooldown=ROUTE_COOLDOWN,
+    queue_depth=lambda: analysis_limiter.waiting
+)
+
+
+def cache_model_for(cv_text):
+    """Returns the model whose results are cached for this CV (see ModelRouter.cacheable_route())."""
+    return model_router.cacheable_route(estimate_tokens(safe_encode(cv_text))).model
+
+# "markdown" (default) or "json" (JSON-mode prompt, converted back to the markdown layout)
+ANALYSIS_OUTPUT_FORMAT = os.getenv('ANALYSIS_OUTPUT_FORMAT', 'markdown').strip().lower()
+
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', '256'))
+ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', '3600'))
+ANALYSIS_CACHE_BACKEND = os.getenv('ANALYSIS_CACHE_BACKEND', '').strip().lower()
+ANALYSIS_CACHE_PATH = os.getenv('ANALYSIS_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'skillgap_ai_cache.sqlite3'))
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', '1').strip().lower() in ('1', 'true', 'yes')
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '512'))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+
+
+# Purpose: Build a stable cache key for one analysis request
+# Functionality:
+#   - Normalizes CV text by collapsing all whitespace runs so re-pasted or re-extracted text matches
+#   - Normalizes the target role case-insensitively (dropdown vs custom input of the same role)
+#   - Mixes in the model that serves the CV (the large or, for short CVs, the fast model; see
+#     ModelRouter.cacheable_route()), PROMPT_VERSION and the prompt's output format (ANALYSIS_OUTPUT_FORMAT,
+#     or "markdown" for streamed analyses) so changing any invalidates old results
+#   - Returns a SHA-256 hex digest so raw CV text is never used as a key on disk
+# Used by: analyze_cv_with_groq() for result cache lookups, job de-duplication
+def make_analysis_cache_key(cv_text, target_role, model=None, output_format=None):
+    """Returns a SHA-256 key over normalized CV text, target role, model and prompt version."""
+    if model is None:
+        model = cache_model_for(cv_text)
+    if output_format is None:
+        output_format = ANALYSIS_OUTPUT_FORMAT
+    normalized_cv = ' '.join(safe_encode(cv_text).split())
+    normalized_role = ' '.join(safe_encode(target_role).split()).casefold()
+    digest = hashlib.sha256()
+    for part in (model, PROMPT_VERSION, output_format, normalized_role, normalized_cv):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def create_analysis_result_cache():
+    """Builds the analysis result cache from ANALYSIS_CACHE_* environment settings."""
+    backend = None
+    if ANALYSIS_CACHE_BACKEND == 'sqlite':
+        try:
+            backend = SQLiteCacheBackend(ANALYSIS_CACHE_PATH, table='analysis_results')
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: analysis cache backend unavailable, using memory only: {e}")
+    return AnalysisResultCache(ANALYSIS_CACHE_MAX_ENTRIES, ANALYSIS_CACHE_TTL, backend)
+
+
+analysis_result_cache = create_analysis_result_cache()
+
+
+semantic_analysis_cache = (
+    SemanticAnalysisCache(SEMANTIC_CACHE_MAX_ENTRIES, SEMANTIC_CACHE_THRESHOLD, ANALYSIS_CACHE_TTL)
+    if SEMANTIC_CACHE_ENABLED else None
+)
+
+def semantic_cache_scope(model, output_format=None):
+    """Returns the semantic cache scope for results of this model and prompt output format."""
+    return f"{model}:{output_format or ANALYSIS_OUTPUT_FORMAT}"
+
+
+# Purpose: One cache lookup shared by every analysis entry point
+# Functionality:
+#   - Tries the exact-key analysis_result_cache first
+#   - On a miss, asks semantic_analysis_cache for a near-duplicate CV analyzed for the same role and,
+#     on a hit, also stores the result under the exact key so the next identical submission is cheaper
+#   - Records which layer answered in the optional details dict: cache = "exact", "semantic" or "miss"
+#     (plus cache_similarity on semantic hits)
+#   - Keys both layers by the model that serves the CV and the prompt's output format, so a fast-model
+#     result is never returned for a CV that the large model analyzes
+#   - Returns (analysis or None, cache_key, embedding); pass the last two to store_cached_analysis()
+# Used by: analyze_cv_with_groq(), stream_cv_analysis_with_groq() and analyze_cv_with_groq_async()
+def lookup_cached_analysis(cv_text, target_role, details=None, output_format=None):
+    """Returns (cached analysis or None, exact cache key, CV embedding or None)."""
+    model = cache_model_for(cv_text)
+    cache_key = make_analysis_cache_key(cv_text, target_role, model, output_format)
+    cached_analysis = analysis_result_cache.get(cache_key)
+    if cached_analysis is not None:
+        if details is not None:
+            details['cache'] = 'exact'
+        return cached_analysis, cache_key, None
+
+    embedding = None
+    if semantic_analysis_cache is not None:
+        embedding = embed_cv_text(cv_text)
+        match = semantic_analysis_cache.get(embedding, target_role, semantic_cache_scope(model, output_format))
+        if match is not None:
+            cached_analysis, similarity = match
+            analysis_result_cache.set(cache_key, cached_analysis)
+            if details is not None:
+                details['cache'] = 'semantic'
+                details['cache_similarity'] = similarity
+            return cached_analysis, cache_key, embedding
+
+    if details is not None:
+        details['cache'] = 'miss'
+    return None, cache_key, embedding
+
+
+analysis_flights = SingleFlight()
 
-analysis_cache = {}
+
+def store_cached_analysis(cache_key, embedding, target_role, analysis, route, output_format=None):
+    """Stores a fresh (non-error) analysis from a cacheable route in the exact and semantic caches."""
+    if not route.cacheable:
+        return
+    analysis_result_cache.set(cache_key, analysis)
+    if semantic_analysis_cache is not None and embedding is not None:
+        semantic_analysis_cache.add(embedding, target_role, analysis, semantic_cache_scope(route.model, output_format))
+
+
+SESSION_STORE_MAX_ENTRIES = int(os.getenv('SESSION_STORE_MAX_ENTRIES', '1000'))
+SESSION_STORE_MAX_BYTES = int(os.getenv('SESSION_STORE_MAX_BYTES', str(32 * 1024 * 1024)))
+SESSION_TTL = int(os.getenv('SESSION_TTL', '7200'))
+SESSION_STORE_BACKEND = os.getenv('SESSION_STORE_BACKEND', '').strip().lower()
+SESSION_STORE_PATH = os.getenv('SESSION_STORE_PATH', ANALYSIS_CACHE_PATH)
+
+
+def create_session_store():
+    """Builds the session store from SESSION_STORE_* environment settings."""
+    backend = None
+    if SESSION_STORE_BACKEND == 'sqlite':
+        try:
+            backend = SQLiteCacheBackend(SESSION_STORE_PATH, table='sessions')
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: session store backend unavailable, using memory only: {e}")
+    return SessionStore(SESSION_STORE_MAX_ENTRIES, SESSION_STORE_MAX_BYTES, SESSION_TTL, backend)
+
+
+session_store = create_session_store()
+
+
+ANALYZE_MAX_CONCURRENCY = int(os.getenv('ANALYZE_MAX_CONCURRENCY', '32'))
+ANALYZE_MAX_QUEUE = int(os.getenv('ANALYZE_MAX_QUEUE', '64'))
+ANALYZE_QUEUE_TIMEOUT = float(os.getenv('ANALYZE_QUEUE_TIMEOUT', '30'))
+ANALYZE_RETRY_AFTER = int(os.getenv('ANALYZE_RETRY_AFTER', '5'))
+
+
+analysis_limiter = ConcurrencyLimiter(ANALYZE_MAX_CONCURRENCY, ANALYZE_MAX_QUEUE, ANALYZE_QUEUE_TIMEOUT, ANALYZE_RETRY_AFTER)
+
+JOB_QUEUE_PATH = os.getenv('JOB_QUEUE_PATH', os.path.join(tempfile.gettempdir(), 'skillgap_ai_jobs.sqlite3'))
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_MAX_QUEUE = int(os.getenv('JOB_MAX_QUEUE', '100'))
+JOB_LEASE_SECONDS = float(os.getenv('JOB_LEASE_SECONDS', '300'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', str(SESSION_TTL)))
+JOB_POLL_INTERVAL = 1.0
+
+# Lower runs first; clients pick one by name with the "priority" form field
+JOB_PRIORITIES = {'high': 0, 'normal': 5, 'low': 9}
+
+
+_job_queue = None
+_job_queue_failed = False
+_job_queue_lock = threading.Lock()
+
+# Purpose: Open the durable job queue the first time job mode needs it
+# Functionality:
+#   - Creates (or migrates) the SQLite table at JOB_QUEUE_PATH on first use instead of at import,
+#     so cold starts and requests that never use job mode do not touch the database
+#   - Returns None if SQLite is unusable there; the failure is logged once and not retried
+# Used by: /analyze job mode, the /jobs endpoints and get_job_workers(); /stats and /metrics read _job_queue
+def get_job_queue():
+    """Returns the shared JobQueue, opening it on first use; None if job mode is unavailable."""
+    global _job_queue, _job_queue_failed
+    if _job_queue is not None or _job_queue_failed:
+        return _job_queue
+    with _job_queue_lock:
+        if _job_queue is None and not _job_queue_failed:
+            try:
+                _job_queue = JobQueue(
+                    JOB_QUEUE_PATH, JOB_MAX_QUEUE, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RESULT_TTL, ANALYZE_RETRY_AFTER
+                )
+            except (sqlite3.Error, OSError) as e:
+                print(f"Warning: job queue unavailable, job mode disabled: {e}")
+                _job_queue_failed = True
+    return _job_queue
 
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx'}
 
@@ -158,69 +595,451 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# Purpose: Open any supported document source as a readable binary stream
+# Functionality:
+#   - bytes / bytearray / memoryview: wraps the data in a BytesIO, no disk access
+#   - str path: opens the file; when mmap_threshold is set and the file is at least that large,
+#     memory-maps it read-only so the OS pages the document in on demand
+#   - file-like object (e.g. an upload's SpooledTemporaryFile): rewinds it and uses it directly
+#   - Closes only what it opened itself; caller-provided streams stay open
+# Used by: extract_text_from_pdf(), extract_text_from_docx() and extract_text_from_file()
+@contextmanager
+def open_document_source(source, mmap_threshold=0):
+    """Yields a seekable binary stream for a path, raw bytes or an open file-like object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if mmap_threshold and size >= mmap_threshold:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield mapped
+            else:
+                yield file
+    else:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        yield source
+
+
+def warm_cpu_worker():
+    """Pool worker initializer: loads PyPDF2 and builds the ReportLab styles before the first task."""
+    try:
+        lazy_import('PyPDF2')
+        get_pdf_styles()
+    except Exception as e:
+        print(f"Warning: CPU worker warm-up failed: {e}")
+
 
-# Purpose: Safely convert any Python object to a UTF-8 encoded string
+cpu_pool = CPUWorkerPool(CPU_POOL_WORKERS, CPU_POOL_MAX_QUEUE, CPU_POOL_TASK_TIMEOUT, CPU_POOL_MAX_TASKS_PER_WORKER,
+                         queue_timeout=CPU_POOL_QUEUE_TIMEOUT, initializer=warm_cpu_worker,
+                         preload_modules=('PyPDF2', 'reportlab.platypus', 'reportlab.lib.styles'),
+                         retry_after=ANALYZE_RETRY_AFTER)
+
+# Purpose: Extract the text of a contiguous range of PDF pages
 # Functionality:
-#   - Handles None values by returning empty string
-#   - If input is bytes, decodes using UTF-8 (replaces undecodable characters)
-#   - Converts any other type to string, encodes to UTF-8, then decodes back
-#   - Uses 'replace' error handler to substitute problematic characters with replacement character
-#   - Ensures no encoding errors crash the application when handling user data
-# Used by: Text processing functions and JSON encoding to prevent encoding errors
-def safe_encode(text):
-    """Safely converts any text to UTF-8 string, replacing any unencodable characters."""
-    if text is None:
-        return ""
-    if isinstance(text, bytes):
-        return text.decode('utf-8', errors='replace')
-    return str(text).encode('utf-8', errors='replace').decode('utf-8')
+#   - Opens the PDF (path or bytes) and extracts pages start..stop-1 in order
+#   - Encodes each page's text to UTF-8 to handle special characters
+#   - Stops early once max_chars characters were collected in this range
+#   - Returns (list of page texts, seconds spent)
+# Used by: extract_pdf_pages(), both in-process and inside PDF pool worker processes
+def extract_pdf_page_range(source, start, stop, max_chars):
+    """Returns ([page_text, ...], seconds) for pages start..stop-1 of a PDF."""
+    started = time.perf_counter()
+    page_texts = []
+    chars = 0
+    PyPDF2 = lazy_import('PyPDF2')
+    with open_document_source(source, PDF_MMAP_THRESHOLD) as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for index in range(start, stop):
+            extracted = pdf_reader.pages[index].extract_text() or ""
+            extracted = extracted.encode('utf-8', errors='replace').decode('utf-8')
+            page_texts.append(extracted)
+            chars += len(extracted)
+            if chars >= max_chars:
+                break
+    return page_texts, time.perf_counter() - started
+
+# "3", "Page 2 of 5", "4/7"; at most three digits so years such as "2018" or "2019/2023" are never taken
+PAGE_NUMBER_PATTERN = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.IGNORECASE)
+# Non-empty lines at the top and at the bottom of a page that may be a running header or footer
+PAGE_EDGE_LINES = 3
+
+# Purpose: Remove the page furniture PDF extraction leaves in the text of every page
+# Functionality:
+#   - Only looks at the first and last PAGE_EDGE_LINES non-empty lines of each page, so body text
+#     (dates, repeated headings such as "Responsibilities:") is never touched
+#   - Drops page-number lines found there ("3", "Page 2 of 5", "4/7")
+#   - Short lines found there on at least two pages and at least half of all pages are running
+#     headers/footers: the first one is kept (it often carries the candidate's name), later ones dropped
+#   - Returns the cleaned page texts in the same order
+# Used by: extract_pdf_pages() before it joins the pages
+def strip_page_furniture(page_texts):
+    """Removes page numbers and repeated headers/footers from the edges of PDF pages."""
+    pages = [text.split('\n') for text in page_texts]
+    edges = []
+    for lines in pages:
+        filled = [index for index, line in enumerate(lines) if line.strip()]
+        # {line index: (edge, normalized line)}; a header only repeats headers, a footer only footers
+        edge = {index: ('bottom', ' '.join(lines[index].split()).casefold()) for index in filled[-PAGE_EDGE_LINES:]}
+        edge.update({index: ('top', ' '.join(lines[index].split()).casefold()) for index in filled[:PAGE_EDGE_LINES]})
+        edges.append(edge)
+
+    pages_with = {}
+    for edge in edges:
+        for key in set(edge.values()):
+            pages_with[key] = pages_with.get(key, 0) + 1
+    min_pages = max(2, (len(pages) + 1) // 2)
+
+    seen_repeated = set()
+    cleaned = []
+    for lines, edge in zip(pages, edges):
+        kept = []
+        for index, line in enumerate(lines):
+            key = edge.get(index)
+            if key is not None:
+                if PAGE_NUMBER_PATTERN.match(key[1]):
+                    continue
+                if len(key[1]) <= 80 and pages_with[key] >= min_pages:
+                    if key in seen_repeated:
+                        continue
+                    seen_repeated.add(key)
+            kept.append(line)
+        cleaned.append('\n'.join(kept))
+    return cleaned
+
+# Purpose: Bounded PDF text extraction that stops as soon as a CV's worth of text is collected
+# Functionality:
+#   - Small documents: extracts pages serially on the calling thread
+#   - Documents with at least PDF_PARALLEL_MIN_PAGES pages: fans page ranges out to cpu_pool,
+#     keeping only a few ranges in flight and consuming them in page order
+#   - Workers get a file path, never the document itself: uploads held in memory are written once to
+#     a temporary file (removed afterwards) instead of pickling the whole PDF into every range task
+#   - Stops (and cancels queued ranges) once max_chars characters are collected
+#   - Stops at the time_limit deadline and returns whatever pages finished in time
+#   - Strips page numbers and running headers/footers with strip_page_furniture(), then joins the
+#     page texts once, separated by newlines
+#   - If process pools cannot be used at all, continues serially from the first page no range
+#     delivered; always extracts serially when already running inside a worker process; a busy
+#     pool raises CPUPoolBusy
+#   - Returns a dict with text, pages_total, pages_processed, seconds, seconds_per_page,
+#     truncated (budget reached) and timed_out flags
+# Used by: extract_text_from_pdf() and anything that wants per-page extraction statistics
+def extract_pdf_pages(source, max_chars=None, time_limit=None, workers=None):
+    """Extracts PDF text under a character budget and time limit, returning text plus page statistics."""
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    time_limit = PDF_TIME_LIMIT if time_limit is None else time_limit
+    if workers is None:
+        # Already inside a worker process (e.g. batch extraction): do not spawn nested pools
+        workers = PDF_EXTRACT_WORKERS if multiprocessing.parent_process() is None else 1
+    started = time.perf_counter()
+    deadline = started + time_limit
+    page_texts = []
+    chars = 0
+    pages_total = 0
+    truncated = False
+    timed_out = False
+    spilled_path = None
+
+    def extract_serially(pdf_reader, first_page):
+        nonlocal chars, truncated, timed_out
+        for index in range(first_page, len(pdf_reader.pages)):
+            if time.perf_counter() >= deadline:
+                timed_out = True
+                return
+            extracted = pdf_reader.pages[index].extract_text() or ""
+            extracted = extracted.encode('utf-8', errors='replace').decode('utf-8')
+            page_texts.append(extracted)
+            chars += len(extracted)
+            if chars >= max_chars:
+                truncated = True
+                return
+
+    PyPDF2 = lazy_import('PyPDF2')
+    try:
+        with open_document_source(source, PDF_MMAP_THRESHOLD) as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            pages_total = len(pdf_reader.pages)
+            parallel = workers > 1 and pages_total >= PDF_PARALLEL_MIN_PAGES
+            if parallel and not isinstance(source, (str, os.PathLike)):
+                # Worker processes open the document themselves: give them a path to it
+                file.seek(0)
+                with tempfile.NamedTemporaryFile(prefix='skillgap_pdf_', suffix='.pdf', delete=False) as spilled:
+                    spilled_path = spilled.name
+                    shutil.copyfileobj(file, spilled)
+                source = spilled_path
+
+            if not parallel:
+                extract_serially(pdf_reader, 0)
+
+        if parallel:
+            ranges = iter([(start, min(start + PDF_PAGES_PER_TASK, pages_total))
+                           for start in range(0, pages_total, PDF_PAGES_PER_TASK)])
+            pending = deque()
+            resume_serially = False
+            try:
+                def submit_next():
+                    page_range = next(ranges, None)
+                    if page_range is not None:
+                        pending.append(cpu_pool.submit('pdf_pages', extract_pdf_page_range, source, page_range[0], page_range[1], max_chars))
+
+                for _ in range(workers * 2):
+                    submit_next()
+                while pending:
+                    future = pending.popleft()
+                    try:
+                        texts, _ = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                    except FutureTimeoutError:
+                        timed_out = True
+                        break
+                    page_texts.extend(texts)
+                    chars += sum(len(text) for text in texts)
+                    if chars >= max_chars:
+                        truncated = True
+                        break
+                    submit_next()
+            except NotImplementedError as e:
+                print(f"Warning: PDF process pool unavailable, extracting the remaining pages serially: {e}")
+                resume_serially = True
+            finally:
+                for future in pending:
+                    future.cancel()
+            if resume_serially:
+                # Ranges are consumed in page order, so page_texts holds exactly the first pages
+                with open_document_source(source, PDF_MMAP_THRESHOLD) as file:
+                    extract_serially(PyPDF2.PdfReader(file), len(page_texts))
+    finally:
+        if spilled_path is not None:
+            try:
+                os.remove(spilled_path)
+            except OSError:
+                pass
+
+    seconds = time.perf_counter() - started
+    pages_processed = len(page_texts)
+    text = "\n".join(strip_page_furniture(page_texts))
+    if len(text) > max_chars:
+        text = text[:max_chars]
+        truncated = True
+    return {
+        'text': text,
+        'pages_total': pages_total,
+        'pages_processed': pages_processed,
+        'seconds': seconds,
+        'seconds_per_page': seconds / pages_processed if pages_processed else 0.0,
+        'truncated': truncated,
+        'timed_out': timed_out
+    }
 
 # Purpose: Extract all readable text content from PDF files
 # Functionality:
-#   - Opens PDF file in binary read mode
-#   - Uses PyPDF2 library to read PDF structure
-#   - Iterates through every page in the PDF document
-#   - Calls extract_text() method on each page to get text content
-#   - Encodes extracted text to UTF-8 to handle special characters and international text
-#   - Concatenates text from all pages into single string
+#   - Accepts a file path, raw bytes or a binary file-like object (see open_document_source())
+#   - Memory-maps large PDFs given by path (PDF_MMAP_THRESHOLD) instead of buffering reads
+#   - Delegates to extract_pdf_pages(), which bounds work by PDF_MAX_CHARS and PDF_TIME_LIMIT
+#     and parallelizes large documents across processes
+#   - Fills the optional stats dict with pages processed and time per page
 #   - Returns empty string if file cannot be read or no text found
 # Used by: extract_text_from_file() to process .pdf file uploads
-def extract_text_from_pdf(file_path):
-    """Extracts all text from a PDF file page by page with UTF-8 encoding handling."""
-    text = ""
+def extract_text_from_pdf(source, stats=None):
+    """Extracts text from a PDF (path, bytes or file object) within the configured character and time budget."""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                extracted = page.extract_text()
-                if extracted:
-                    text += extracted.encode('utf-8', errors='replace').decode('utf-8')
+        result = extract_pdf_pages(source)
+    except ServerBusyError:
+        raise
     except Exception as e:
         print(f"Error reading PDF: {e}")
-    return text
+        return ""
+    if stats is not None:
+        stats.update({
+            'pages_total': result['pages_total'],
+            'pages_processed': result['pages_processed'],
+            'seconds': round(result['seconds'], 4),
+            'seconds_per_page': round(result['seconds_per_page'], 4),
+            'truncated': result['truncated'],
+            'timed_out': result['timed_out']
+        })
+    return result['text']
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_RELATIONSHIP_NAMESPACE = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+# Text boxes are stored twice (DrawingML and a VML fallback); only the first copy is read
+DOCX_FALLBACK_TAG = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+# Elements whose children are the top-level paragraphs and tables of a part
+DOCX_CONTAINER_TAGS = {f'{WORD_NAMESPACE}body', f'{WORD_NAMESPACE}hdr', f'{WORD_NAMESPACE}ftr'}
+DOCX_HEADER_FOOTER_PATTERN = re.compile(r'word/(header|footer)\d*\.xml$')
+
+
+# Purpose: Find the document parts of a .docx that hold text, in reading order
+# Functionality:
+#   - Headers first (names and contact details usually live there), then the main document, then footers
+#   - Headers and footers are taken from word/_rels/document.xml.rels in relationship order,
+#     falling back to the header*/footer* part names when the relationships cannot be read
+# Used by: extract_docx_xml_text()
+def docx_text_parts(archive):
+    """Returns the zip member names of the headers, main document and footers of a DOCX."""
+    names = set(archive.namelist())
+    headers, footers = [], []
+    try:
+        with archive.open('word/_rels/document.xml.rels') as rels:
+            for relationship in ElementTree.parse(rels).getroot().iter(f'{DOCX_RELATIONSHIP_NAMESPACE}Relationship'):
+                kind = relationship.get('Type', '').rsplit('/', 1)[-1]
+                target = 'word/' + relationship.get('Target', '').lstrip('/').removeprefix('word/')
+                if kind in ('header', 'footer') and target in names:
+                    (headers if kind == 'header' else footers).append(target)
+    except (KeyError, ElementTree.ParseError):
+        for name in sorted(names):
+            match = DOCX_HEADER_FOOTER_PATTERN.match(name)
+            if match:
+                (headers if match.group(1) == 'header' else footers).append(name)
+    return list(dict.fromkeys(headers)) + ['word/document.xml'] + list(dict.fromkeys(footers))
+
+# Purpose: Stream the text of one WordprocessingML part (document, header or footer)
+# Functionality:
+#   - Parses the decompressing zip stream incrementally with ElementTree.iterparse, so the XML is
+#     never fully in memory; finished paragraphs and tables are cleared from the tree as it goes
+#   - Yields one line per paragraph in document order; w:tab and w:br become tabs and newlines
+#   - Table rows become one line with their cells separated by tabs (a cell's paragraphs joined by spaces),
+#     so skills grids come out as readable rows; nested tables end up inside their outer cell
+#   - Text boxes are read once (their compatibility fallback copy is skipped)
+# Used by: extract_docx_xml_text()
+def iter_docx_part_lines(stream):
+    """Yields the lines of text of a DOCX XML part in reading order."""
+    paragraphs = []
+    cells = []
+    rows = []
+    skip_depth = 0
+    container = None
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if tag == DOCX_FALLBACK_TAG:
+            skip_depth += 1 if event == 'start' else -1
+            continue
+        if skip_depth:
+            continue
+        if event == 'start':
+            if tag in DOCX_CONTAINER_TAGS:
+                container = element
+            elif tag == f'{WORD_NAMESPACE}p':
+                paragraphs.append([])
+            elif tag == f'{WORD_NAMESPACE}tc':
+                cells.append([])
+            elif tag == f'{WORD_NAMESPACE}tr':
+                rows.append([])
+            continue
+
+        if tag == f'{WORD_NAMESPACE}t':
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag == f'{WORD_NAMESPACE}tab':
+            if paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr'):
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag in (f'{WORD_NAMESPACE}p', f'{WORD_NAMESPACE}tc', f'{WORD_NAMESPACE}tr'):
+            if tag == f'{WORD_NAMESPACE}p':
+                line = ''.join(paragraphs.pop())
+            elif tag == f'{WORD_NAMESPACE}tc':
+                text = ' '.join(part for part in cells.pop() if part.strip())
+                if rows:
+                    rows[-1].append(text)
+                continue
+            else:
+                line = '\t'.join(rows.pop())
+            if cells:
+                cells[-1].append(line)
+            else:
+                # Paragraphs of a text box end before the paragraph anchoring it, on a line of their own
+                yield line
+                if not paragraphs and not rows and container is not None:
+                    container.clear()
+
+# Purpose: Fast, low-memory DOCX text extraction straight from the document XML
+# Functionality:
+#   - Opens the .docx zip and streams the headers, main document and footers (docx_text_parts())
+#     through iter_docx_part_lines(), including table cells and text boxes that paragraph-only
+#     extraction misses
+#   - Stops as soon as max_chars characters were collected (truncated flag)
+#   - Returns a dict with text, parts read, chars, truncated and seconds
+#   - Raises on anything that is not a readable WordprocessingML zip so callers can fall back
+# Used by: extract_text_from_docx()
+def extract_docx_xml_text(source, max_chars=None):
+    """Extracts DOCX text in reading order by streaming its XML parts under a character budget."""
+    max_chars = DOCX_MAX_CHARS if max_chars is None else max_chars
+    started = time.perf_counter()
+    lines = []
+    chars = 0
+    parts_read = 0
+    truncated = False
+    with open_document_source(source) as file, zipfile.ZipFile(file) as archive:
+        for part in docx_text_parts(archive):
+            with archive.open(part) as stream:
+                parts_read += 1
+                for line in iter_docx_part_lines(stream):
+                    line = line.encode('utf-8', errors='replace').decode('utf-8')
+                    lines.append(line)
+                    chars += len(line) + 1
+                    if chars >= max_chars:
+                        truncated = True
+                        break
+            if truncated:
+                break
+    return {
+        'text': '\n'.join(lines) + '\n' if lines else '',
+        'parts': parts_read,
+        'chars': chars,
+        'truncated': truncated,
+        'seconds': time.perf_counter() - started
+    }
+
+# Purpose: Extract paragraph text with python-docx (the original extraction path)
+# Functionality:
+#   - Loads the full python-docx object model and returns one line per body paragraph
+#   - Does not see tables, headers, footers or text boxes
+# Used by: extract_text_from_docx() as the fallback engine, benchmarks/micro.py as the baseline
+def extract_docx_paragraph_text(source):
+    """Extracts all body paragraph text from a DOCX with python-docx."""
+    docx = lazy_import('docx')
+    with open_document_source(source) as file:
+        doc = docx.Document(file)
+        return ''.join(
+            paragraph.text.encode('utf-8', errors='replace').decode('utf-8') + "\n"
+            for paragraph in doc.paragraphs
+        )
 
 # Purpose: Extract all text content from Microsoft Word (.docx) files
 # Functionality:
-#   - Opens DOCX file using python-docx library
-#   - Iterates through all paragraphs in the document
-#   - Extracts text content from each paragraph
-#   - Encodes paragraph text to UTF-8 for special character handling
-#   - Adds newline character after each paragraph to preserve document structure
-#   - Concatenates all paragraphs into single string
+#   - Accepts a file path, raw bytes or a binary file-like object (see open_document_source())
+#   - Streams the document XML with extract_docx_xml_text(): headers, body (including tables
+#     and text boxes) and footers in reading order, bounded by DOCX_MAX_CHARS
+#   - Falls back to python-docx paragraph extraction if the XML cannot be read
+#   - Fills the optional stats dict with the engine used, parts read, chars, truncation and time
 #   - Returns empty string if file cannot be read or document is empty
 # Used by: extract_text_from_file() to process .docx file uploads
-def extract_text_from_docx(file_path):
-    """Extracts all paragraph text from a DOCX file with UTF-8 encoding handling."""
-    text = ""
+def extract_text_from_docx(source, stats=None):
+    """Extracts text from a DOCX (path, bytes or file object), including tables, headers and footers."""
     try:
-        doc = docx.Document(file_path)
-        for paragraph in doc.paragraphs:
-            para_text = paragraph.text
-            para_text = para_text.encode('utf-8', errors='replace').decode('utf-8')
-            text += para_text + "\n"
+        result = extract_docx_xml_text(source)
+        if stats is not None:
+            stats.update({
+                'engine': 'xml',
+                'parts': result['parts'],
+                'chars': result['chars'],
+                'truncated': result['truncated'],
+                'seconds': round(result['seconds'], 4)
+            })
+        return result['text']
+    except Exception as e:
+        print(f"Warning: streaming DOCX extraction failed, using python-docx: {e}")
+    try:
+        started = time.perf_counter()
+        text = extract_docx_paragraph_text(source)
+        if stats is not None:
+            stats.update({'engine': 'python-docx', 'seconds': round(time.perf_counter() - started, 4)})
+        return text
     except Exception as e:
         print(f"Error reading DOCX: {e}")
-    return text
+    return ""
 
 # Purpose: Dispatcher function that extracts text from different file formats
 # Functionality:
@@ -229,44 +1048,362 @@ def extract_text_from_docx(file_path):
 #   - Calls appropriate extraction function based on file type:
 #     * .pdf files → extract_text_from_pdf()
 #     * .docx files → extract_text_from_docx()
-#     * .txt files → reads file directly with UTF-8 encoding
+#     * .txt files → decodes the content as UTF-8
+#   - Source may be a file path, raw bytes or a binary file-like object (e.g. an upload stream)
+#   - Optional stats dict receives extraction statistics (PDF pages processed and time per page,
+#     DOCX engine and parts read)
 #   - Returns empty string if file type not recognized
 # Used by: /analyze route to extract text from user-uploaded CV files
-def extract_text_from_file(file_path, filename):
-    """Extracts text from file based on its extension (pdf, docx, or txt)."""
+def extract_text_from_file(source, filename, stats=None):
+    """Extracts text from a file path, bytes or file object based on the filename's extension (pdf, docx, or txt)."""
     extension = filename.rsplit('.', 1)[1].lower()
     
     if extension == 'pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source, stats)
     elif extension == 'docx':
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source, stats)
     elif extension == 'txt':
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        with open_document_source(source) as file:
+            return file.read().decode('utf-8')
     return ""
 
-# Purpose: Send CV text to Groq AI API for intelligent skill gap analysis
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+EXTRACTION_CACHE_TTL = int(os.getenv('EXTRACTION_CACHE_TTL', '86400'))
+EXTRACTION_CACHE_BACKEND = os.getenv('EXTRACTION_CACHE_BACKEND', '').strip().lower()
+EXTRACTION_CACHE_PATH = os.getenv('EXTRACTION_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'skillgap_ai_extracted.sqlite3'))
+# Bump whenever an extractor's output changes so text extracted by older code is not served
+EXTRACTION_VERSION = '2'
+
+
+def create_extracted_text_cache():
+    """Builds the extracted text cache from EXTRACTION_CACHE_* settings; None when disabled."""
+    if EXTRACTION_CACHE_MAX_BYTES <= 0:
+        return None
+    backend = None
+    if EXTRACTION_CACHE_BACKEND == 'sqlite':
+        try:
+            backend = SQLiteCacheBackend(EXTRACTION_CACHE_PATH, table='extracted_text')
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: extraction cache backend unavailable, using memory only: {e}")
+    return ExtractedTextCache(EXTRACTION_CACHE_MAX_BYTES, EXTRACTION_CACHE_TTL, backend)
+
+
+extracted_text_cache = create_extracted_text_cache()
+
+# Purpose: Skip PDF/DOCX parsing for files that were uploaded before
 # Functionality:
-#   - Checks if Groq client is initialized (API key is valid)
-#   - Encodes all input text (CV and target role) to UTF-8 format
-#   - Constructs detailed prompt instructing AI on analysis format and requirements
+#   - Uses the digest HashingSpooledFile computed while the upload was received (raw bytes are
+#     hashed directly; other sources are extracted without caching)
+#   - Keys the cache on digest, file type, extractor version and character budgets, so changing
+#     how text is extracted never serves stale text
+#   - On a hit returns the cached text without opening the document; on a miss extracts with
+#     extract_text_from_file() and caches non-empty text (never text cut short by the time limit)
+#   - stats["cache"] says whether extraction was a "hit", "backend_hit" or "miss"
+# Used by: read_analysis_request() for /analyze and /rank-roles uploads
+def extract_text_cached(source, filename, stats=None):
+    """Extracts text from an uploaded file, reusing the text of identical earlier uploads."""
+    stats = {} if stats is None else stats
+    if hasattr(source, 'content_digest'):
+        digest = source.content_digest()
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        digest = hashlib.blake2b(source, digest_size=20).hexdigest()
+    else:
+        digest = None
+    if digest is None or extracted_text_cache is None:
+        return extract_text_offloaded(source, filename, stats)
+
+    extension = filename.rsplit('.', 1)[1].lower()
+    key = f"{digest}:{extension}:{EXTRACTION_VERSION}:{PDF_MAX_CHARS}:{DOCX_MAX_CHARS}"
+    text, level = extracted_text_cache.get(key)
+    if text is not None:
+        stats['cache'] = level
+        return text
+    text = extract_text_offloaded(source, filename, stats)
+    stats['cache'] = 'miss'
+    if text and not stats.get('timed_out'):
+        extracted_text_cache.set(key, text)
+    return text
+
+def extract_document_in_worker(data, filename):
+    """Pool task: extracts text from document bytes and returns (text, stats)."""
+    stats = {}
+    return extract_text_from_file(data, filename, stats), stats
+
+
+# Purpose: Keep large document parsing off the request thread
+# Functionality:
+#   - PDF and DOCX uploads of at least CPU_POOL_EXTRACT_MIN_BYTES are read into bytes and extracted
+#     in cpu_pool (whole document in one worker, under the usual character and time budgets)
+#   - Smaller files and TXT are extracted directly; the pool round trip would cost more than the work
+#   - Copies the worker's extraction stats into the caller's stats dict
+#   - Raises CPUTaskTimeout when the worker does not finish within CPU_POOL_TASK_TIMEOUT
+# Used by: extract_text_cached()
+def extract_text_offloaded(source, filename, stats=None):
+    """Extracts text from an upload, in a worker process when the document is large."""
+    extension = filename.rsplit('.', 1)[1].lower()
+    if extension not in ('pdf', 'docx'):
+        return extract_text_from_file(source, filename, stats)
+    with open_document_source(source) as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        if size < CPU_POOL_EXTRACT_MIN_BYTES:
+            return extract_text_from_file(source, filename, stats)
+        file.seek(0)
+        data = file.read()
+    text, worker_stats = cpu_pool.run('extract', extract_document_in_worker, data, filename)
+    if stats is not None:
+        stats.update(worker_stats)
+    return text
+
+CV_TOKEN_BUDGET = int(os.getenv('CV_TOKEN_BUDGET', '3000'))
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Purpose: Cheap local estimate of how many LLM tokens a text will use
+# Functionality:
+#   - Splits text into words and punctuation marks
+#   - Counts one token per punctuation mark and roughly one token per 4 characters of a word,
+#     which tracks BPE tokenizers such as LLaMA's closely enough for budgeting
+# Used by: preprocess_cv_text() for budgeting and before/after reporting
+def estimate_tokens(text):
+    """Returns an approximate LLM token count for text without calling a tokenizer service."""
+    return sum((len(token) + 3) // 4 for token in TOKEN_PATTERN.findall(text or ''))
+
+# Purpose: Shrink raw extracted CV text before it is pasted into the analysis prompt
+# Functionality:
+#   - Normalizes Unicode (NFKC), line endings and whitespace runs; drops control characters
+#   - Drops paragraphs that are exact duplicates of an earlier paragraph (repeated sections); short
+#     one-line paragraphs such as section headings are always kept
+#   - Page numbers and running headers/footers are not touched here: they only exist in PDF output,
+#     where extract_pdf_pages() removes them page by page
+#   - Collapses runs of blank lines
+#   - Truncates at a line (or, for one very long line, word) boundary once the token budget is reached
+#   - Returns (clean_text, stats) where stats holds before/after token and character counts
+# Used by: /analyze and batch analysis, right before the text is sent to Groq
+def preprocess_cv_text(cv_text, token_budget=None):
+    """Normalizes, de-duplicates and token-budgets CV text; returns (text, stats)."""
+    token_budget = CV_TOKEN_BUDGET if token_budget is None else token_budget
+    original = safe_encode(cv_text)
+    tokens_before = estimate_tokens(original)
+
+    text = unicodedata.normalize('NFKC', original).replace('\r\n', '\n').replace('\r', '\n')
+    lines = []
+    for raw_line in text.split('\n'):
+        line = ''.join(ch for ch in raw_line if ch == '\t' or unicodedata.category(ch)[0] != 'C')
+        lines.append(' '.join(line.split()))
+
+    # Drop repeated paragraphs and collapse blank runs
+    paragraphs = []
+    seen_paragraphs = set()
+    current = []
+    for line in lines + ['']:
+        if line:
+            current.append(line)
+            continue
+        if current:
+            paragraph = '\n'.join(current)
+            key = paragraph.casefold()
+            if len(current) == 1 and len(paragraph) <= 80:
+                paragraphs.append(paragraph)
+            elif key not in seen_paragraphs:
+                seen_paragraphs.add(key)
+                paragraphs.append(paragraph)
+            current = []
+    text = '\n\n'.join(paragraphs)
+
+    truncated = False
+    if token_budget and estimate_tokens(text) > token_budget:
+        used = 0
+        budget_lines = []
+        for line in text.split('\n'):
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                # Keep the words of the overflowing line that still fit
+                words = []
+                for word in line.split(' '):
+                    used += estimate_tokens(word)
+                    if used > token_budget:
+                        break
+                    words.append(word)
+                if words:
+                    budget_lines.append(' '.join(words))
+                truncated = True
+                break
+            budget_lines.append(line)
+            used += cost
+        text = '\n'.join(budget_lines).rstrip()
+
+    tokens_after = estimate_tokens(text)
+    return text, {
+        'tokens_before': tokens_before,
+        'tokens_after': tokens_after,
+        'tokens_saved': tokens_before - tokens_after,
+        'chars_before': len(original),
+        'chars_after': len(text),
+        'token_budget': token_budget,
+        'truncated': truncated
+    }
+
+FAST_MODE_FALLBACK = os.getenv('FAST_MODE_FALLBACK', '1').strip().lower() in ('1', 'true', 'yes')
+LOCAL_SKILLS_IN_PROMPT = 12
+
+
+_skill_matcher = None
+
+
+def get_skill_matcher():
+    """Returns the shared SkillMatcher, building its automaton on first use instead of at import."""
+    global _skill_matcher
+    if _skill_matcher is None:
+        _skill_matcher = SkillMatcher(SKILLS)
+    return _skill_matcher
+
+# Purpose: Map a target role (dropdown or free text) onto the taxonomy's role requirements
+# Functionality:
+#   - Exact, case-insensitive match against ROLE_REQUIREMENTS
+#   - Otherwise the longest known role contained in the text ("Senior Data Scientist" -> "Data Scientist")
+#   - Otherwise the General Professional Role requirements, plus any skills named in the role
+#     itself as core skills ("Python Developer" -> Python)
+#   - Returns (matched role name or None, {skill: weight})
+# Used by: extract_skill_profile()
+def find_role_requirements(target_role):
+    """Returns (known role name, {skill: weight}) for a target role."""
+    role = ' '.join((target_role or '').lower().split())
+    for name, requirements in ROLE_REQUIREMENTS.items():
+        if name.lower() == role:
+            return name, requirements
+    contained = [name for name in ROLE_REQUIREMENTS if re.search(rf'\b{re.escape(name.lower())}\b', role)]
+    if contained:
+        name = max(contained, key=len)
+        return name, ROLE_REQUIREMENTS[name]
+    general = ROLE_REQUIREMENTS['General Professional Role']
+    named_skills = get_skill_matcher().find(role)
+    if named_skills:
+        return None, dict(general, **{skill: 3 for skill in named_skills})
+    return None, general
+
+# Purpose: Local, no-LLM view of which skills a CV has and which the target role still needs
+# Functionality:
+#   - Runs the shared SkillMatcher (get_skill_matcher()) over the CV text once
+#   - Splits the role requirements into matched and missing skills, most important first
+#   - Computes weighted coverage (0-1) of the role requirements
+#   - Returns a plain JSON-serializable dict
+# Used by: build_analysis_messages() to shrink the prompt, build_fast_analysis() and /analyze responses
+def extract_skill_profile(cv_text, target_role):
+    """Returns the locally detected skills and role requirement coverage for a CV."""
+    found = get_skill_matcher().find(cv_text)
+    role, requirements = find_role_requirements(target_role)
+    ranked = sorted(requirements, key=lambda skill: (-requirements[skill], skill))
+    matched = [skill for skill in ranked if skill in found]
+    missing = [skill for skill in ranked if skill not in found]
+    other = sorted((skill for skill in found if skill not in requirements), key=lambda skill: (-found[skill], skill))
+    total_weight = sum(requirements.values())
+    return {
+        'role': role,
+        'skills': matched + other,
+        'matched': matched,
+        'missing': missing,
+        'weights': {skill: requirements[skill] for skill in ranked},
+        'coverage': round(sum(requirements[skill] for skill in matched) / total_weight, 3) if total_weight else 0.0
+    }
+
+# Purpose: Markdown CURRENT SKILLS section built from the local skill profile
+# Functionality:
+#   - Lists up to LOCAL_SKILLS_IN_PROMPT detected skills, role-relevant ones first
+#   - Returns '' when no skills were detected (the model then identifies them itself)
+# Used by: normalize_model_output() and stream_cv_analysis_with_groq(), which put it in front of
+#   the model's gap analysis
+def local_skills_section(profile):
+    """Returns the **CURRENT SKILLS IDENTIFIED:** markdown for a skill profile, or ''."""
+    if not profile or not profile['skills']:
+        return ''
+    lines = ['**CURRENT SKILLS IDENTIFIED:**']
+    lines.extend(f"- {skill}" for skill in profile['skills'][:LOCAL_SKILLS_IN_PROMPT])
+    return '\n'.join(lines) + '\n\n'
+
+GROQ_API_KEY_MISSING_MESSAGE = "Error: GROQ_API_KEY not configured. Please set your API key in the .env file. Get your free API key from https://console.groq.com/keys"
+
+ANALYSIS_SYSTEM_PROMPT = "You are an expert career counselor and technical recruiter specializing in skill gap analysis for tech professionals. Provide actionable, specific, and realistic feedback."
+
+# Purpose: Tell the model what the local skill scan already found
+# Functionality:
+#   - Lists the skills detected by extract_skill_profile() and the role requirements it did not find
+#   - Returns '' when nothing was detected, in which case the prompt asks the model for current skills
+# Used by: build_analysis_messages() and build_json_analysis_messages()
+def build_skill_context(profile, target_role):
+    """Returns the prompt paragraph describing locally detected skills, or ''."""
+    if not profile or not profile['skills']:
+        return ''
+    context = (
+        f"\nSkills already detected in this CV (treat them as present and do not list them as missing): "
+        f"{', '.join(profile['skills'][:LOCAL_SKILLS_IN_PROMPT])}.\n"
+    )
+    if profile['missing']:
+        context += (
+            f"Skills usually expected for {target_role} that were not detected "
+            f"(check the CV before listing them as missing): {', '.join(profile['missing'])}.\n"
+        )
+    return context
+
+# Purpose: JSON-mode variant of the analysis prompt
+# Functionality:
+#   - Asks for the same content as the markdown prompt as one JSON object with fixed keys
+#   - Is sent with response_format={"type": "json_object"} so Groq guarantees valid JSON
+#   - Leaves out "current_skills" when they were already detected locally (see build_skill_context())
+# Used by: build_analysis_messages() when ANALYSIS_OUTPUT_FORMAT is "json"
+def build_json_analysis_messages(cv_text, target_role, profile=None):
+    """Returns chat messages asking for the analysis as a JSON object."""
+    skill_context = build_skill_context(profile, target_role)
+    current_skills_key = '' if skill_context else '\n  "current_skills": ["skill"],'
+    current_skills_ask = '' if skill_context else 'List 3-5 current skills, '
+    prompt = f"""Analyze the following CV/resume for the target role: {target_role}
+
+Respond with a single JSON object with exactly these keys:
+{{
+  "missing_skills": [{{"name": "skill", "description": "brief description", "priority": 1, "resource": "YouTube"}}],{current_skills_key}
+  "roadmap": [{{"step": 1, "skill": "skill to learn", "detail": "why it matters for {target_role} and estimated time"}}],
+  "score": 0,
+  "explanation": "2-3 sentences"
+}}
+
+List 6-8 missing skills. Give the 2-3 most critical ones priority 1, 2 and 3 and the rest priority null. For each, suggest the best free learning platform (YouTube, Coursera, FreeCodeCamp, Udemy, LinkedIn Learning, Codecademy, etc). {current_skills_ask}exactly 5 roadmap steps, and a job readiness score from 0 to 100 for {target_role}. The explanation evaluates readiness for {target_role}, highlighting relevant strengths and critical gaps.
+{skill_context}
+CV/Resume:
+{cv_text}
+"""
+    return [
+        {
+            "role": "system",
+            "content": ANALYSIS_SYSTEM_PROMPT + " Always answer with valid JSON."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# Purpose: Build the chat messages sent to Groq for one skill gap analysis
+# Functionality:
+#   - Fills the target role and CV text into the analysis prompt template
 #   - Specifies prompt structure: missing skills, current skills, learning roadmap, job readiness score, explanation
-#   - Sends request to Groq API using llama-3.3-70b-versatile model
-#   - Sets temperature to 0.7 for balanced creativity and consistency
-#   - Receives AI-generated analysis response
-#   - Encodes response to UTF-8 to handle special characters in output
-#   - Returns formatted analysis string or error message
-# Used by: /analyze route to generate skill gap analysis reports
-def analyze_cv_with_groq(cv_text, target_role="General Professional Role"):
-    """Analyzes CV text using Groq AI to identify skill gaps, create learning roadmap, and provide job readiness score."""
-    try:
-        if client is None:
-            return "Error: GROQ_API_KEY not configured. Please set your API key in the .env file. Get your free API key from https://console.groq.com/keys"
-        
-        cv_text = safe_encode(cv_text)
-        target_role = safe_encode(target_role)
-        
-        prompt = f"""You are a career development advisor specializing in skill assessment and career growth.
+#   - Returns the system + user message list expected by the chat completions API
+#   - With output_format="json", asks for a JSON object matching AnalysisResult instead
+#   - With a local skill profile that found skills, skips the CURRENT SKILLS section and passes the
+#     detected skills as context, so the model only does the gap analysis and roadmap
+# Used by: analyze_cv_with_groq() and stream_cv_analysis_with_groq()
+def build_analysis_messages(cv_text, target_role, output_format='markdown', profile=None):
+    """Returns the Groq chat messages (system and user prompt) for analyzing a CV against a target role."""
+    if output_format == 'json':
+        return build_json_analysis_messages(cv_text, target_role, profile)
+    skill_context = build_skill_context(profile, target_role)
+    current_skills_format = '' if skill_context else """**CURRENT SKILLS IDENTIFIED:**
+List 3-5 skills that the candidate already has:
+- [Skill name]
+- [Skill name]
+- [Skill name]
+
+"""
+    prompt = f"""You are a career development advisor specializing in skill assessment and career growth.
 
 Analyze the following CV/resume for the target role: {target_role}
 
@@ -282,13 +1419,7 @@ Then list 4-5 additional important skills:
 - [Skill name] - [Brief description] | Learn: [Resource type]
 - [Skill name] - [Brief description] | Learn: [Resource type]
 
-**CURRENT SKILLS IDENTIFIED:**
-List 3-5 skills that the candidate already has:
-- [Skill name]
-- [Skill name]
-- [Skill name]
-
-**LEARNING ROADMAP:**
+{current_skills_format}**LEARNING ROADMAP:**
 Step 1: [First skill to learn] - [Why it matters for {target_role} and estimated time]
 Step 2: [Second skill to learn] - [Why it matters for {target_role} and estimated time]
 Step 3: [Third skill to learn] - [Why it matters for {target_role} and estimated time]
@@ -302,34 +1433,867 @@ Score: [X]/100
 [2-3 sentences evaluating readiness specifically for {target_role}, highlighting relevant strengths and critical gaps]
 
 Focus your analysis on skills and experience that matter for a {target_role} position. Consider both technical and non-technical competencies. For each missing skill, suggest which free learning platform would be best (YouTube, Coursera, FreeCodeCamp, Udemy, LinkedIn Learning, Codecademy, etc).
-
+{skill_context}
 CV/Resume:
 {cv_text}
 """
 
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert career counselor and technical recruiter specializing in skill gap analysis for tech professionals. Provide actionable, specific, and realistic feedback."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0.7,
-            max_tokens=1500
+    return [
+        {
+            "role": "system",
+            "content": ANALYSIS_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# Purpose: Send CV text to Groq AI API for intelligent skill gap analysis
+# Functionality:
+#   - Encodes all input text (CV and target role) to UTF-8 format
+#   - Returns a cached result when the same normalized CV and role, or a near-duplicate CV for the
+#     same role, were analyzed recently (lookup_cached_analysis(); which cache answered goes in details)
+#   - Checks if Groq client is initialized (API key is valid)
+#   - Joins an identical analysis already in flight instead of calling Groq again (analysis_flights);
+#     details["coalesced"] is set for callers that shared another request's call
+#   - Scans the CV for known skills locally (extract_skill_profile()) unless a profile is passed in
+#   - Builds the prompt with build_analysis_messages(), asking only for the gap analysis when skills were found
+#   - Picks the model and output-token cap with model_router (CV length, upstream health and load)
+#     and sends the request through that model's gateway (timeouts, jittered retries on 429/5xx,
+#     optional hedging, circuit breaker), failing over to the fast model when the large one is
+#     rate-limited or slow; the serving model, routing reason and latency go in details
+#   - Sets temperature to 0.7 for balanced creativity and consistency
+#   - Receives AI-generated analysis response
+#   - Times the cache lookup, prompt construction and Groq call as stages and counts the tokens used
+#   - Encodes response to UTF-8 to handle special characters in output
+#   - Adds the locally detected CURRENT SKILLS section (normalize_model_output())
+#   - Stores successful responses in the exact and semantic caches (errors are never cached, nor
+#     answers the fast model gave only because of load or a failover)
+#   - Returns formatted analysis string or error message
+# Used by: /analyze route to generate skill gap analysis reports
+def analyze_cv_with_groq(cv_text, target_role="General Professional Role", profile=None, details=None):
+    """Analyzes CV text using Groq AI to identify skill gaps, create learning roadmap, and provide job readiness score."""
+    try:
+        cv_text = safe_encode(cv_text)
+        target_role = safe_encode(target_role)
+        
+        # Serve repeated (or near-identical) submissions of the same CV and role from the result caches
+        with timed_stage('cache_lookup'):
+            cached_analysis, cache_key, embedding = lookup_cached_analysis(cv_text, target_role, details)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        if get_groq_client() is None:
+            return GROQ_API_KEY_MISSING_MESSAGE
+        
+        if profile is None:
+            profile = extract_skill_profile(cv_text, target_role)
+        
+        def call_groq():
+            with timed_stage('prompt'):
+                messages = build_analysis_messages(cv_text, target_role, ANALYSIS_OUTPUT_FORMAT, profile)
+            route = model_router.choose(estimate_tokens(cv_text))
+            started = time.perf_counter()
+            with timed_stage('llm'):
+                chat_completion, route = model_router.complete(
+                    route,
+                    messages=messages,
+                    temperature=0.7,
+                    **json_mode_options()
+                )
+            model_router.record(route, time.perf_counter() - started, details)
+            record_token_usage(getattr(chat_completion, 'usage', None))
+            response_text = normalize_model_output(safe_encode(chat_completion.choices[0].message.content), profile)
+            store_cached_analysis(cache_key, embedding, target_role, response_text, route)
+            return response_text
+        
+        response_text, shared = analysis_flights.do(cache_key, call_groq)
+        if shared and details is not None:
+            details['coalesced'] = True
+        return response_text
+    
+    except Exception as e:
+        error_msg = describe_groq_error(e)
+        return f"Error analyzing CV: {error_msg}"
+
+# Purpose: Stream a skill gap analysis from Groq token by token
+# Functionality:
+#   - Same inputs, prompt, model routing, result caches and details as analyze_cv_with_groq(), except
+#     that it always uses the markdown prompt (JSON mode cannot be shown while it streams), so its
+#     results are cached and coalesced under the "markdown" format even when ANALYSIS_OUTPUT_FORMAT is json
+#   - Yields the whole cached analysis as a single chunk on a cache hit, and likewise the finished
+#     analysis of an identical request already in flight (analysis_flights) instead of calling Groq again
+#   - Otherwise yields the locally detected CURRENT SKILLS section first, then calls the chat
+#     completions API with stream=True and yields each content delta as it arrives
+#   - Stores the assembled analysis in the result cache once the stream finishes and hands it to any
+#     coalesced waiters; if the stream fails or the client disconnects, waiters get an error instead
+#   - Yields an "Error ..." string (like analyze_cv_with_groq) instead of raising on failure
+# Used by: /analyze in streaming mode to forward tokens to the browser
+def stream_cv_analysis_with_groq(cv_text, target_role="General Professional Role", profile=None, details=None):
+    """Generator yielding analysis text chunks from Groq as they are produced."""
+    try:
+        cv_text = safe_encode(cv_text)
+        target_role = safe_encode(target_role)
+        
+        cached_analysis, cache_key, embedding = lookup_cached_analysis(cv_text, target_role, details, 'markdown')
+        if cached_analysis is not None:
+            yield cached_analysis
+            return
+        
+        if get_groq_client() is None:
+            yield GROQ_API_KEY_MISSING_MESSAGE
+            return
+        
+        # The same CV and role may be being analyzed right now: then wait for that result
+        call, shared_analysis = analysis_flights.wait(cache_key)
+        if call is None:
+            if details is not None:
+                details['coalesced'] = True
+            yield shared_analysis
+            return
+        
+        parts = []
+        error = None
+        finished = False
+        try:
+            if profile is None:
+                profile = extract_skill_profile(cv_text, target_role)
+            route = model_router.choose(estimate_tokens(cv_text))
+            started = time.perf_counter()
+            stream, route = model_router.open_stream(
+                route,
+                messages=build_analysis_messages(cv_text, target_role, profile=profile),
+                temperature=0.7
+            )
+            
+            local_section = local_skills_section(profile)
+            for chunk in stream:
+                # Groq reports usage on the final chunk
+                record_token_usage(getattr(getattr(chunk, 'x_groq', None), 'usage', None))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    delta = safe_encode(delta)
+                    if local_section and not parts:
+                        # Sent with the first model delta so a failed call still starts with "Error ..."
+                        parts.append(local_section)
+                        yield local_section
+                    parts.append(delta)
+                    yield delta
+            
+            model_router.record(route, time.perf_counter() - started, details)
+            if parts:
+                store_cached_analysis(cache_key, embedding, target_role, ''.join(parts), route, 'markdown')
+            finished = True
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if finished and parts:
+                analysis_flights.finish(cache_key, call, value=''.join(parts))
+            else:
+                analysis_flights.finish(cache_key, call, error=error or FlightAbandoned('The analysis was interrupted before it finished.'))
+    
+    except Exception as e:
+        error_msg = describe_groq_error(e)
+        yield f"Error analyzing CV: {error_msg}"
+
+
+async_runtime = AsyncLoopThread()
+
+# Purpose: Give async callers the one AsyncGroq client of the shared background loop
+# Functionality:
+#   - Creates the client lazily on first use, on async_runtime's loop, and keeps it for the process
+#     lifetime so its connection pool is reused and closed once at shutdown
+#   - Refuses to run on any other event loop: an httpx pool must not be shared across loops
+# Used by: analyze_cv_with_groq_async()
+def get_async_groq_client():
+    """Returns the shared AsyncGroq client, or None if no API key is configured."""
+    if get_groq_client() is None:
+        return None
+    if not async_runtime.is_current():
+        raise RuntimeError('Async Groq calls must run on the shared background loop (async_runtime.submit).')
+    if async_runtime.client is None:
+        groq = lazy_import('groq')
+        httpx = lazy_import('httpx')
+        async_runtime.client = groq.AsyncGroq(
+            api_key=GROQ_API_KEY,
+            base_url=GROQ_BASE_URL,
+            max_retries=0,
+            timeout=groq_http_timeout(),
+            http_client=httpx.AsyncClient(limits=groq_http_limits(), timeout=groq_http_timeout())
         )
+    return async_runtime.client
+
+# Purpose: Non-blocking variant of analyze_cv_with_groq() for asyncio callers
+# Functionality:
+#   - Same prompt, model routing, result caches and error-string contract as analyze_cv_with_groq()
+#   - Joins identical analyses already in flight in any thread (analysis_flights), waiting off the event loop
+#   - Awaits the Groq call through AsyncGroq, so one event loop can keep hundreds of analyses
+#     in flight over a shared connection pool instead of tying up one thread per call
+#   - Must run on async_runtime's loop; callers bound concurrency themselves
+# Used by: iter_batch_llm_results() to dispatch many analyses with bounded concurrency
+async def analyze_cv_with_groq_async(cv_text, target_role="General Professional Role", profile=None, details=None):
+    """Analyzes CV text with the async Groq client; returns the analysis or an error message."""
+    try:
+        cv_text = safe_encode(cv_text)
+        target_role = safe_encode(target_role)
         
-        response_text = safe_encode(chat_completion.choices[0].message.content)
+        cached_analysis, cache_key, embedding = lookup_cached_analysis(cv_text, target_role, details)
+        if cached_analysis is not None:
+            return cached_analysis
+        
+        async_client = get_async_groq_client()
+        if async_client is None:
+            return GROQ_API_KEY_MISSING_MESSAGE
+        
+        call, shared_analysis = await asyncio.to_thread(analysis_flights.wait, cache_key)
+        if call is None:
+            if details is not None:
+                details['coalesced'] = True
+            return shared_analysis
+        
+        try:
+            if profile is None:
+                profile = extract_skill_profile(cv_text, target_role)
+            route = model_router.choose(estimate_tokens(cv_text))
+            started = time.perf_counter()
+            chat_completion, route = await model_router.complete_async(
+                async_client,
+                route,
+                messages=build_analysis_messages(cv_text, target_role, ANALYSIS_OUTPUT_FORMAT, profile),
+                temperature=0.7,
+                **json_mode_options()
+            )
+            model_router.record(route, time.perf_counter() - started, details)
+            
+            record_token_usage(getattr(chat_completion, 'usage', None))
+            response_text = normalize_model_output(safe_encode(chat_completion.choices[0].message.content), profile)
+            store_cached_analysis(cache_key, embedding, target_role, response_text, route)
+        except BaseException as e:
+            analysis_flights.finish(cache_key, call, error=e if isinstance(e, Exception) else FlightAbandoned('The analysis was cancelled.'))
+            raise
+        analysis_flights.finish(cache_key, call, value=response_text)
         return response_text
     
     except Exception as e:
-        error_msg = safe_encode(str(e))
+        error_msg = describe_groq_error(e)
         return f"Error analyzing CV: {error_msg}"
 
+ANALYSIS_SECTION_KEYS = {
+    'MISSING SKILLS': 'missing_skills',
+    'CURRENT SKILLS IDENTIFIED': 'current_skills',
+    'LEARNING ROADMAP': 'roadmap',
+    'JOB READINESS SCORE': 'score',
+    'EXPLANATION': 'explanation'
+}
+
+# Purpose: Split a streamed analysis into its sections as soon as each one is complete
+# Functionality:
+#   - Buffers incoming text chunks and only inspects whole lines (chunks can split lines anywhere)
+#   - Recognizes section headings of the form **SECTION NAME:** from the analysis prompt
+#   - When a new heading starts, returns the previous section as finished
+#   - finish() flushes the trailing partial line and the last open section
+#   - Attaches the section's typed data (skills, roadmap steps, integer score) from parse_analysis()
+# Used by: /analyze streaming mode to emit one structured "section" event per completed section
+class AnalysisSectionParser:
+    """Incremental parser that turns streamed analysis text into completed sections."""
+
+    def __init__(self):
+        self._pending = ''
+        self._title = None
+        self._lines = []
+
+    def feed(self, text):
+        self._pending += text
+        completed = []
+        while '\n' in self._pending:
+            line, self._pending = self._pending.split('\n', 1)
+            section = self._consume_line(line)
+            if section is not None:
+                completed.append(section)
+        return completed
+
+    def finish(self):
+        completed = []
+        if self._pending:
+            section = self._consume_line(self._pending)
+            self._pending = ''
+            if section is not None:
+                completed.append(section)
+        if self._title is not None:
+            completed.append(self._build_section())
+            self._title = None
+            self._lines = []
+        return completed
+
+    def _consume_line(self, line):
+        stripped = line.strip()
+        if stripped.startswith('**') and stripped.endswith('**') and len(stripped) > 4:
+            finished = self._build_section() if self._title is not None else None
+            self._title = stripped.strip('*').strip().rstrip(':').strip()
+            self._lines = []
+            return finished
+        if self._title is not None:
+            self._lines.append(line)
+        return None
+
+    def _build_section(self):
+        content = '\n'.join(self._lines).strip()
+        section = {
+            'name': ANALYSIS_SECTION_KEYS.get(self._title.upper(), self._title.lower().replace(' ', '_')),
+            'title': self._title,
+            'content': content
+        }
+        if section['name'] in ANALYSIS_SECTION_KEYS.values():
+            # Attach the typed data for this section so clients need not re-parse the text
+            parsed = parse_analysis(f"**{self._title}:**\n{content}").to_dict()
+            section['data'] = parsed[section['name']]
+        return section
+
+# Purpose: Extract the numeric job readiness score from analysis text
+# Functionality:
+#   - Looks for the "Score: X/100" pattern requested in the analysis prompt
+#   - Clamps the value to the 0-100 range
+#   - Returns None when no score line is present
+# Used by: AnalysisSectionParser for the score section
+def parse_readiness_score(text):
+    """Returns the integer score from a "Score: X/100" line, or None if not found."""
+    match = re.search(r'Score:\s*(\d{1,3})\s*/\s*100', text or '')
+    if not match:
+        return None
+    return max(0, min(100, int(match.group(1))))
+
+# Purpose: Typed, compact representation of one skill gap analysis
+# Functionality:
+#   - MissingSkill: skill name, description, learning resource and priority (1-3, or None)
+#   - RoadmapStep: step number, skill to learn and why/how long
+#   - AnalysisResult: missing and current skills, roadmap, integer score, explanation, plus
+#     notes for any text outside the known sections (e.g. an error message)
+#   - to_dict()/from_dict() convert to and from plain JSON-serializable dicts
+# Used by: parse_analysis(), the session store, /analyze responses and generate_pdf_report()
+@dataclass
+class MissingSkill:
+    name: str
+    description: str = ''
+    resource: str = ''
+    priority: Optional[int] = None
+
+
+@dataclass
+class RoadmapStep:
+    step: int
+    skill: str
+    detail: str = ''
+
+
+@dataclass
+class AnalysisResult:
+    missing_skills: list = field(default_factory=list)
+    current_skills: list = field(default_factory=list)
+    roadmap: list = field(default_factory=list)
+    score: Optional[int] = None
+    explanation: str = ''
+    notes: list = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            missing_skills=[MissingSkill(**item) for item in data.get('missing_skills', [])],
+            current_skills=list(data.get('current_skills', [])),
+            roadmap=[RoadmapStep(**item) for item in data.get('roadmap', [])],
+            score=data.get('score'),
+            explanation=data.get('explanation', ''),
+            notes=list(data.get('notes', []))
+        )
+
+
+SECTION_HEADING_PATTERN = re.compile(r'^\*\*(.+?)\*\*\s*(.*)$')
+PRIORITY_PATTERN = re.compile(r'PRIORITY\s*(\d)\s*(?:\([^)]*\))?\s*:\s*(.+)$', re.IGNORECASE)
+STEP_PATTERN = re.compile(r'^Step\s*(\d+)\s*:\s*(.+)$', re.IGNORECASE)
+
+def split_skill_line(text):
+    """Splits "Name - description | Learn: resource" into its three parts."""
+    text, _, resource = text.partition('| Learn:')
+    name, _, description = text.partition(' - ')
+    return name.strip(' *'), description.strip(), resource.strip()
+
+# Purpose: Turn the markdown analysis returned by the model into an AnalysisResult in one pass
+# Functionality:
+#   - Walks the text line by line once, tracking the current **SECTION:** heading
+#   - MISSING SKILLS: "PRIORITY n: ..." lines and "- ..." bullets become MissingSkill entries
+#   - CURRENT SKILLS IDENTIFIED: bullets become plain skill names
+#   - LEARNING ROADMAP: "Step n: skill - detail" lines become RoadmapStep entries
+#   - JOB READINESS SCORE: "Score: X/100" becomes an integer
+#   - EXPLANATION: remaining lines are joined into one paragraph
+#   - Any other non-empty line is kept in notes so nothing is silently lost
+# Used by: /analyze, streaming and batch analysis to build the stored result
+def parse_analysis(text):
+    """Parses analysis markdown into an AnalysisResult."""
+    result = AnalysisResult()
+    section = None
+    explanation = []
+    for raw_line in safe_encode(text).split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = SECTION_HEADING_PATTERN.match(line)
+        if heading and heading.group(1).strip().rstrip(':').strip().upper() in ANALYSIS_SECTION_KEYS:
+            section = ANALYSIS_SECTION_KEYS[heading.group(1).strip().rstrip(':').strip().upper()]
+            line = heading.group(2).strip()
+            if not line:
+                continue
+
+        bullet = line[1:].strip() if line[0] in '-•*' else None
+        if section == 'missing_skills':
+            priority = PRIORITY_PATTERN.search(line)
+            if priority:
+                name, description, resource = split_skill_line(priority.group(2))
+                result.missing_skills.append(MissingSkill(name, description, resource, int(priority.group(1))))
+                continue
+            if bullet:
+                name, description, resource = split_skill_line(bullet)
+                result.missing_skills.append(MissingSkill(name, description, resource))
+                continue
+        elif section == 'current_skills' and bullet:
+            result.current_skills.append(bullet)
+            continue
+        elif section == 'roadmap':
+            step = STEP_PATTERN.match(line)
+            if step:
+                skill, _, detail = step.group(2).partition(' - ')
+                result.roadmap.append(RoadmapStep(int(step.group(1)), skill.strip(), detail.strip()))
+                continue
+        elif section == 'score' and result.score is None:
+            score = parse_readiness_score(line)
+            if score is not None:
+                result.score = score
+                continue
+        elif section == 'explanation':
+            explanation.append(line)
+            continue
+        result.notes.append(line)
+    result.explanation = ' '.join(explanation)
+    return result
+
+# Purpose: Render an AnalysisResult back into the markdown layout the frontend understands
+# Functionality:
+#   - Produces the same headings, PRIORITY lines, bullets, Step lines and Score line as the prompt format
+#   - Skips empty sections
+# Used by: normalize_model_output() for JSON-mode responses
+def render_analysis_markdown(result):
+    """Returns the analysis as markdown in the standard prompt layout."""
+    lines = []
+    if result.missing_skills:
+        lines.append('**MISSING SKILLS:**')
+        for skill in result.missing_skills:
+            text = skill.name + (f" - {skill.description}" if skill.description else '')
+            if skill.resource:
+                text += f" | Learn: {skill.resource}"
+            if skill.priority:
+                marker = '🔴' if skill.priority <= 2 else '🟡'
+                lines.append(f"{marker} PRIORITY {skill.priority}: {text}")
+            else:
+                lines.append(f"- {text}")
+        lines.append('')
+    if result.current_skills:
+        lines.append('**CURRENT SKILLS IDENTIFIED:**')
+        lines.extend(f"- {skill}" for skill in result.current_skills)
+        lines.append('')
+    if result.roadmap:
+        lines.append('**LEARNING ROADMAP:**')
+        lines.extend(f"Step {step.step}: {step.skill}" + (f" - {step.detail}" if step.detail else '') for step in result.roadmap)
+        lines.append('')
+    if result.score is not None:
+        lines.extend(['**JOB READINESS SCORE:**', f"Score: {result.score}/100", ''])
+    if result.explanation:
+        lines.extend(['**EXPLANATION:**', result.explanation, ''])
+    lines.extend(result.notes)
+    return '\n'.join(lines).strip()
+
+# Purpose: Convert a JSON-mode model response into an AnalysisResult
+# Functionality:
+#   - Reads the JSON object and coerces each field defensively (models do not always follow types)
+#   - Returns None if the text is not a JSON object
+# Used by: normalize_model_output()
+def analysis_result_from_json(text):
+    """Builds an AnalysisResult from a JSON-mode response, or returns None if it is not JSON."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    result = AnalysisResult()
+    for item in data.get('missing_skills') or []:
+        if isinstance(item, dict) and item.get('name'):
+            priority = item.get('priority')
+            result.missing_skills.append(MissingSkill(
+                str(item['name']), str(item.get('description') or ''), str(item.get('resource') or ''),
+                int(priority) if isinstance(priority, (int, float)) or str(priority).isdigit() else None
+            ))
+    result.current_skills = [str(skill) for skill in data.get('current_skills') or [] if skill]
+    for index, item in enumerate(data.get('roadmap') or [], start=1):
+        if isinstance(item, dict) and item.get('skill'):
+            step = item.get('step')
+            result.roadmap.append(RoadmapStep(
+                int(step) if str(step).isdigit() else index, str(item['skill']), str(item.get('detail') or '')
+            ))
+    score = data.get('score')
+    if isinstance(score, (int, float)) or str(score).isdigit():
+        result.score = max(0, min(100, int(score)))
+    result.explanation = str(data.get('explanation') or '')
+    return result
+
+# Purpose: Give every analysis the same markdown shape regardless of prompt variant
+# Functionality:
+#   - Markdown mode: puts the locally detected CURRENT SKILLS section in front of the model output
+#     (unless the model wrote that section itself)
+#   - JSON mode: parses the JSON object, fills in locally detected current skills, and renders it
+#     with render_analysis_markdown(), falling back to the raw text if the model did not return valid JSON
+# Used by: analyze_cv_with_groq() and analyze_cv_with_groq_async()
+def normalize_model_output(text, profile=None):
+    """Returns the analysis markdown for a raw model response."""
+    if ANALYSIS_OUTPUT_FORMAT != 'json':
+        if 'CURRENT SKILLS IDENTIFIED' in text.upper():
+            return text
+        return local_skills_section(profile) + text
+    result = analysis_result_from_json(text)
+    if result is None:
+        return text
+    if not result.current_skills and profile:
+        result.current_skills = profile['skills'][:LOCAL_SKILLS_IN_PROMPT]
+    return render_analysis_markdown(result)
+
+def json_mode_options():
+    """Returns extra chat completion arguments for the configured output format."""
+    if ANALYSIS_OUTPUT_FORMAT == 'json':
+        return {'response_format': {'type': 'json_object'}}
+    return {}
+
+FAST_MODE_STUDY_TIME = {3: 'about 4 weeks', 2: 'about 2 weeks', 1: 'about 1 week'}
+FAST_MODE_WEIGHT_LABELS = {3: 'Core skill', 2: 'Important skill', 1: 'Useful skill'}
+
+# Purpose: Estimate job readiness from the local skill profile alone
+# Functionality:
+#   - Maps weighted coverage of the role requirements onto 10-95
+#   - Adds up to 5 points for relevant breadth (detected skills outside the requirement list)
+# Used by: build_fast_analysis()
+def heuristic_readiness_score(profile):
+    """Returns a 0-100 readiness score computed from skill coverage."""
+    extra = len(profile['skills']) - len(profile['matched'])
+    return max(0, min(100, int(round(10 + 85 * profile['coverage'] + min(5, extra)))))
+
+# Purpose: Produce a complete analysis without calling the LLM ("fast mode")
+# Functionality:
+#   - Uses extract_skill_profile() to find current skills and unmet role requirements
+#   - Missing skills are the unmet requirements, most important first; the top three core ones get priorities
+#   - Roadmap is the first five missing skills with a rough study time by importance
+#   - Score comes from heuristic_readiness_score(); the explanation says it is a local estimate
+#   - Returns an AnalysisResult, so it renders, stores and exports to PDF like an AI analysis
+# Used by: /analyze when fast mode is requested, or as a fallback when Groq is unavailable or rate-limited
+def build_fast_analysis(cv_text, target_role, profile=None):
+    """Returns a heuristic AnalysisResult computed locally from the skill taxonomy."""
+    if profile is None:
+        profile = extract_skill_profile(cv_text, target_role)
+    weights = profile['weights']
+    result = AnalysisResult()
+    for skill in profile['missing'][:8]:
+        weight = weights[skill]
+        priority = len(result.missing_skills) + 1 if weight == 3 and len(result.missing_skills) < 3 else None
+        result.missing_skills.append(MissingSkill(
+            skill, f"{FAST_MODE_WEIGHT_LABELS[weight]} for {target_role}", 'YouTube / Coursera', priority
+        ))
+    result.current_skills = profile['skills'][:LOCAL_SKILLS_IN_PROMPT]
+    for step, skill in enumerate(profile['missing'][:5], start=1):
+        result.roadmap.append(RoadmapStep(
+            step, skill, f"{FAST_MODE_WEIGHT_LABELS[weights[skill]]} for {target_role}, {FAST_MODE_STUDY_TIME[weights[skill]]}"
+        ))
+    result.score = heuristic_readiness_score(profile)
+    explanation = (
+        f"Quick estimate from a local skill scan, without AI review: the CV shows {len(profile['matched'])} of "
+        f"{len(weights)} skills usually expected for {target_role}."
+    )
+    if profile['matched']:
+        explanation += f" Relevant strengths: {', '.join(profile['matched'][:3])}."
+    if profile['missing']:
+        explanation += f" Biggest gaps: {', '.join(profile['missing'][:3])}."
+    result.explanation = explanation
+    return result
+
+ROLE_RANK_MAX_ANALYSES = int(os.getenv('ROLE_RANK_MAX_ANALYSES', '3'))
+# "python" (default) sums in plain Python; "numpy" uses NumPy when it is installed (pip install numpy)
+ROLE_FIT_BACKEND = os.getenv('ROLE_FIT_BACKEND', 'python').strip().lower()
+
+
+_role_fit_index = None
+
+
+def get_role_fit_index():
+    """Returns the shared RoleFitIndex, building it on first use."""
+    global _role_fit_index
+    if _role_fit_index is None:
+        _role_fit_index = RoleFitIndex(SKILLS, ROLE_REQUIREMENTS, ROLE_FIT_BACKEND)
+    return _role_fit_index
+
+BATCH_EXTRACT_WORKERS = int(os.getenv('BATCH_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+BATCH_LLM_CONCURRENCY = int(os.getenv('BATCH_LLM_CONCURRENCY', '8'))
+BATCH_MAX_DOCUMENTS = int(os.getenv('BATCH_MAX_DOCUMENTS', '500'))
+BATCH_MAX_FILE_BYTES = 16 * 1024 * 1024
+
+# Purpose: Gather the CV files of a batch (directory or zip archive) into a working directory
+# Functionality:
+#   - Directory source: lists supported files (pdf, docx, txt) in name order, without copying
+#   - Zip source (path or file object): extracts supported members into work_dir using
+#     secure_filename() on the base name, skipping folders, macOS metadata and oversized members
+#   - Disambiguates duplicate names inside an archive with a numeric suffix
+#   - Stops at BATCH_MAX_DOCUMENTS files
+#   - Returns a list of (file_path, display_name) tuples
+# Used by: /analyze-batch route and the batch_analyze.py command line tool
+def collect_batch_documents(source, work_dir):
+    """Returns (file_path, display_name) pairs for every supported CV in a directory or zip archive."""
+    documents = []
+    if isinstance(source, str) and os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path) and allowed_file(name):
+                documents.append((path, name))
+        return documents[:BATCH_MAX_DOCUMENTS]
+
+    used_names = set()
+    with zipfile.ZipFile(source) as archive:
+        for member in archive.infolist():
+            if len(documents) >= BATCH_MAX_DOCUMENTS:
+                break
+            if member.is_dir() or member.filename.startswith('__MACOSX/'):
+                continue
+            filename = secure_filename(os.path.basename(member.filename))
+            if not filename or not allowed_file(filename) or member.file_size > BATCH_MAX_FILE_BYTES:
+                continue
+            stem, extension = filename.rsplit('.', 1)
+            counter = 1
+            while filename in used_names:
+                counter += 1
+                filename = f"{stem}_{counter}.{extension}"
+            used_names.add(filename)
+            path = os.path.join(work_dir, filename)
+            with archive.open(member) as src, open(path, 'wb') as dst:
+                dst.write(src.read(BATCH_MAX_FILE_BYTES + 1)[:BATCH_MAX_FILE_BYTES])
+            documents.append((path, member.filename))
+    return documents
+
+# Purpose: Extract one batch document's text inside a worker process
+# Functionality:
+#   - Calls extract_text_from_file() and times it
+#   - Returns (text, seconds, error_message) instead of raising, so one bad file never aborts the batch
+# Used by: run_batch_analysis() through cpu_pool
+def extract_batch_document(file_path, filename):
+    """Extracts text from one batch file and returns (text, seconds, error)."""
+    start = time.perf_counter()
+    try:
+        text = extract_text_from_file(file_path, filename)
+        return text, time.perf_counter() - start, None
+    except Exception as e:
+        return "", time.perf_counter() - start, safe_encode(str(e))
+
+# Purpose: Extract text from many documents in parallel
+# Functionality:
+#   - Fans documents out to the shared cpu_pool so PDF/DOCX parsing uses all CPU cores without
+#     starting a pool per batch, keeping at most `workers` documents of this batch in the pool
+#   - A document that overruns CPU_POOL_TASK_TIMEOUT, or cannot be queued because the pool is busy,
+#     is reported as an error instead of stopping the batch; queued documents are cancelled when the
+#     consumer stops early (e.g. the /analyze-batch client disconnects)
+#   - Extracts in-process only inside a worker process or when process pools are unavailable
+#     (e.g. some serverless runtimes)
+#   - Yields (file_path, display_name, text, seconds, error) as each extraction finishes
+# Used by: run_batch_analysis()
+def iter_batch_extractions(documents, workers):
+    """Yields extraction results for (file_path, display_name) pairs as they complete."""
+    if multiprocessing.parent_process() is not None or not cpu_pool.available():
+        for path, name in documents:
+            yield (path, name) + extract_batch_document(path, os.path.basename(path))
+        return
+
+    remaining = iter(documents)
+    pending = {}
+
+    def submit_next():
+        """Queues the next document; returns an error record if the pool had no room for it."""
+        for path, name in remaining:
+            try:
+                future = cpu_pool.submit('batch_extract', extract_batch_document, path, os.path.basename(path))
+            except CPUPoolBusy as busy:
+                return path, name, "", 0.0, safe_encode(str(busy))
+            pending[future] = (path, name, time.monotonic())
+            return None
+        return None
+
+    try:
+        for _ in range(max(1, workers)):
+            skipped = submit_next()
+            if skipped is not None:
+                yield skipped
+        while pending:
+            oldest = min(submitted for _, _, submitted in pending.values())
+            timeout = max(0.0, oldest + cpu_pool.task_timeout - time.monotonic())
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                now = time.monotonic()
+                done = [future for future, (_, _, submitted) in pending.items() if now - submitted >= cpu_pool.task_timeout]
+            for future in done:
+                path, name, submitted = pending.pop(future)
+                if not future.done():
+                    cpu_pool.abandon(future)
+                    yield path, name, "", time.monotonic() - submitted, 'Text extraction timed out.'
+                else:
+                    try:
+                        yield (path, name) + future.result()
+                    except Exception as e:
+                        yield path, name, "", time.monotonic() - submitted, safe_encode(str(e))
+                skipped = submit_next()
+                if skipped is not None:
+                    yield skipped
+    finally:
+        for future in pending:
+            future.cancel()
+
+# Purpose: Run many analyses on the shared event loop with bounded concurrency
+# Functionality:
+#   - Schedules analyze_cv_with_groq_async() on async_runtime's long-lived loop (one AsyncGroq client
+#     and connection pool for the whole process, instead of a new loop and thread per call)
+#   - Keeps at most `concurrency` analyses in flight, so finished results never pile up faster than
+#     the caller consumes them
+#   - Takes an analysis_limiter slot for every call, released when the call finishes or is cancelled;
+#     a call that cannot get a slot reports "Error ... busy" (or raises ServerBusyError with raise_busy)
+#   - Cancels every in-flight call when the caller stops iterating (e.g. a streaming client disconnects)
+#   - Yields each finished (job, analysis, seconds) in completion order
+# Used by: run_batch_analysis() and /rank-roles
+def iter_batch_llm_results(jobs, concurrency, raise_busy=False):
+    """Yields (job, analysis, seconds) for each (cv_text, target_role, ...) job as it completes."""
+    jobs = iter(jobs)
+    pending = {}
+
+    async def run_one(job):
+        start = time.perf_counter()
+        analysis = await analyze_cv_with_groq_async(job[0], job[1])
+        return analysis, time.perf_counter() - start
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max(1, concurrency):
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                    break
+                try:
+                    analysis_limiter.acquire()
+                except ServerBusyError as busy:
+                    if raise_busy:
+                        raise
+                    yield job, f"Error analyzing CV: {busy}", 0.0
+                    continue
+                future = async_runtime.submit(run_one(job))
+                future.add_done_callback(lambda _: analysis_limiter.release())
+                pending[future] = job
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                analysis, seconds = future.result()
+                yield job, analysis, seconds
+    finally:
+        for future in pending:
+            future.cancel()
+
+# Purpose: Analyze a batch of CVs against one or more target roles and report per-item results
+# Functionality:
+#   - Extracts all documents in parallel with iter_batch_extractions()
+#   - Reports extraction failures and too-short CVs as per-item errors (one record per role)
+#   - Runs preprocess_cv_text() on each CV once and reports its before/after token counts
+#   - Dispatches one analysis per (document, role) pair with iter_batch_llm_results()
+#   - Yields one "item" record per pair with status, score, typed result and timings
+#   - Ends with a "summary" record: counts, wall time, extraction time and items per second
+# Used by: /analyze-batch route and the batch_analyze.py command line tool
+def run_batch_analysis(documents, roles, extract_workers=None, llm_concurrency=None):
+    """Generator yielding one JSON-serializable record per (document, role) plus a final summary."""
+    extract_workers = BATCH_EXTRACT_WORKERS if extract_workers is None else extract_workers
+    llm_concurrency = BATCH_LLM_CONCURRENCY if llm_concurrency is None else llm_concurrency
+    started = time.perf_counter()
+    ok_count = 0
+    error_count = 0
+    extract_total = 0.0
+    jobs = []
+
+    for path, name, text, extract_seconds, error in iter_batch_extractions(documents, extract_workers):
+        extract_total += extract_seconds
+        if error is None and len(text.strip()) < 50:
+            error = 'CV text is too short. Please provide a complete CV.'
+        if error is None:
+            text, preprocessing_stats = preprocess_cv_text(text)
+        for role in roles:
+            if error is not None:
+                error_count += 1
+                yield {
+                    'type': 'item', 'file': name, 'target_role': role, 'status': 'error',
+                    'error': error, 'extract_seconds': round(extract_seconds, 4)
+                }
+            else:
+                jobs.append((text, role, name, extract_seconds, preprocessing_stats['tokens_before'], preprocessing_stats['tokens_after']))
+    extract_wall = time.perf_counter() - started
+
+    for (text, role, name, extract_seconds, tokens_before, tokens_after), analysis, llm_seconds in iter_batch_llm_results(jobs, llm_concurrency):
+        record = {
+            'type': 'item', 'file': name, 'target_role': role,
+            'extract_seconds': round(extract_seconds, 4), 'llm_seconds': round(llm_seconds, 4),
+            'tokens_before': tokens_before, 'tokens_after': tokens_after
+        }
+        if analysis.startswith('Error'):
+            error_count += 1
+            record.update(status='error', error=analysis)
+        else:
+            ok_count += 1
+            result = parse_analysis(analysis)
+            record.update(status='ok', score=result.score, result=result.to_dict())
+        yield record
+
+    elapsed = time.perf_counter() - started
+    total = ok_count + error_count
+    yield {
+        'type': 'summary',
+        'documents': len(documents),
+        'roles': len(roles),
+        'items': total,
+        'ok': ok_count,
+        'errors': error_count,
+        'elapsed_seconds': round(elapsed, 4),
+        'extract_wall_seconds': round(extract_wall, 4),
+        'extract_cpu_seconds': round(extract_total, 4),
+        'items_per_second': round(total / elapsed, 3) if elapsed > 0 else 0.0
+    }
+
+# Purpose: Read the list of target roles for a batch request
+# Functionality:
+#   - Accepts repeated "roles" form fields and/or newline/comma separated values
+#   - Drops blanks and duplicates, keeps submission order
+#   - Falls back to "General Professional Role" when none are given
+# Used by: /analyze-batch route
+def parse_batch_roles(values):
+    """Returns a de-duplicated role list from raw form values."""
+    roles = []
+    for value in values:
+        for role in re.split(r'[\n,]', value or ''):
+            role = role.strip()
+            if role and role not in roles:
+                roles.append(role)
+    return roles or ["General Professional Role"]
+
 # Purpose: Serve the main landing page HTML template
 # Functionality:
 #   - Flask route handler for GET requests to '/' (root URL)
@@ -341,17 +2305,199 @@ CV/Resume:
 def index():
     return render_template('index.html')
 
-# Purpose: Process CV file uploads or text input and generate skill gap analysis
+# Purpose: Read and validate the CV and target role submitted to /analyze
 # Functionality:
-#   - Flask route handler for POST requests to '/analyze'
 #   - Extracts target role from form (dropdown or custom text input)
 #   - Validates target role name length (max 100 characters)
-#   - Handles file upload: validates file type, extracts text content
+#   - Handles file upload: validates file type, extracts text content directly from the upload stream
 #   - Alternative: accepts pasted CV text directly from form
 #   - Validates CV text has minimum length (50 characters)
-#   - Calls analyze_cv_with_groq() to get AI-powered analysis
-#   - Stores analysis in cache with session ID for PDF download later
-#   - Returns JSON response with analysis text and session ID
+#   - Cleans the text with preprocess_cv_text() (whitespace, duplicate sections, token budget)
+#   - Records file extraction and preprocessing statistics in the optional details dict
+#   - Returns (cv_text, target_role, None) on success or (None, None, error_response) on invalid input
+# Used by: /analyze route in both normal and streaming mode
+def read_analysis_request(details=None):
+    """Parses the /analyze form into CV text and target role, or returns an error response."""
+    cv_text = ""
+    target_role = request.form.get('target_role', '').strip()
+    custom_role = request.form.get('custom_role', '').strip()
+    
+    # Use custom role if provided, otherwise use dropdown selection
+    if custom_role:
+        target_role = custom_role
+    elif not target_role or target_role == "General Tech Role":
+        target_role = "General Professional Role"
+    
+    # Validate target role
+    if len(target_role) > 100:
+        return None, None, safe_jsonify_error({'error': 'Target role name is too long (max 100 characters).'}, 400)
+    
+    # Check if file was uploaded
+    if 'file' in request.files and request.files['file'].filename != '':
+        file = request.files['file']
+        
+        if file and allowed_file(file.filename):
+            # Check file size (max 16MB already set in app config)
+            filename = secure_filename(file.filename)
+            if not filename:
+                return None, None, safe_jsonify_error({'error': 'Invalid filename.'}, 400)
+            
+            # Extract text straight from the spooled upload stream (no file is written),
+            # or reuse the text of an identical earlier upload
+            try:
+                extraction_stats = {}
+                with timed_stage('extract'):
+                    cv_text = extract_text_cached(file.stream, filename, extraction_stats)
+                if details is not None and extraction_stats:
+                    details['extraction'] = extraction_stats
+            except ServerBusyError:
+                raise
+            except Exception as extract_error:
+                return None, None, safe_jsonify_error({'error': f'Failed to extract text from file: {safe_encode(str(extract_error))}'}, 400)
+        else:
+            return None, None, safe_jsonify_error({'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}, 400)
+    
+    # Check if text was pasted
+    elif 'cv_text' in request.form and request.form['cv_text'].strip():
+        cv_text = request.form['cv_text']
+    
+    else:
+        return None, None, safe_jsonify_error({'error': 'Please provide a CV either by uploading a file or pasting text.'}, 400)
+    
+    # Validate CV text
+    if not cv_text or len(cv_text.strip()) < 50:
+        return None, None, safe_jsonify_error({'error': 'CV text is too short. Please provide a complete CV.'}, 400)
+    
+    # Clean up and token-budget the text before it reaches the prompt
+    with timed_stage('preprocess'):
+        cv_text, preprocessing_stats = preprocess_cv_text(cv_text)
+    if details is not None:
+        details['preprocessing'] = preprocessing_stats
+    
+    return cv_text, target_role, None
+
+# Purpose: Decide whether the client asked for a streamed /analyze response
+# Functionality:
+#   - True when the query string or form has stream=1/true/sse
+#   - True when the Accept header asks for text/event-stream
+# Used by: /analyze route to switch between JSON and Server-Sent Events output
+def wants_event_stream():
+    """Returns True if the /analyze request asked for Server-Sent Events."""
+    flag = (request.args.get('stream') or request.form.get('stream') or '').strip().lower()
+    if flag in ('1', 'true', 'yes', 'sse'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def requested_mode():
+    """Returns the /analyze "mode" parameter ("fast", "job" or '' for a normal AI analysis)."""
+    return (request.args.get('mode') or request.form.get('mode') or '').strip().lower()
+
+# Purpose: Format one Server-Sent Events message
+# Functionality:
+#   - Serializes the payload with encode_json() on a single data: line (JSON never contains a raw newline)
+#   - Prefixes it with the event name and terminates with a blank line
+# Used by: stream_analysis_events() for every event sent to the browser
+def format_sse(event, data):
+    """Returns a Server-Sent Events frame for the given event name and JSON payload."""
+    return f"event: {event}\ndata: {encode_json(data).decode('utf-8')}\n\n"
+
+# Purpose: Produce the Server-Sent Events stream for a streaming /analyze request
+# Functionality:
+#   - Sends a "session" event first so the client knows its session_id (and extraction details) immediately
+#   - Forwards each text chunk from stream_cv_analysis_with_groq() as a "token" event
+#   - In fast mode, or when Groq fails before sending any text and FAST_MODE_FALLBACK is on, sends
+#     the local build_fast_analysis() result instead (preceded by a "notice" event on fallback)
+#   - Feeds chunks to AnalysisSectionParser and sends a "section" event as each section completes
+#   - Parses the assembled analysis once and saves the typed result in the session store so
+#     /download-pdf keeps working
+#   - Ends with a "done" event carrying the typed result, mode ("ai" or "fast") and which cache answered,
+#     or an "error" event if the analysis failed
+# Used by: /analyze route in streaming mode
+def stream_analysis_events(cv_text, target_role, session_id, details=None, profile=None, fast=False):
+    """Generator yielding SSE frames for a streamed analysis."""
+    yield format_sse('session', dict(details or {}, session_id=session_id, target_role=target_role))
+    
+    parser = AnalysisSectionParser()
+    parts = []
+    notice = None
+    cache_details = {}
+    chunks = () if fast else stream_cv_analysis_with_groq(cv_text, target_role, profile, cache_details)
+    for chunk in chunks:
+        if not parts and chunk.startswith('Error') and FAST_MODE_FALLBACK:
+            # Groq is unavailable or rate-limited: answer from the local skill scan instead
+            notice = chunk
+            break
+        parts.append(chunk)
+        yield format_sse('token', {'text': chunk})
+        for section in parser.feed(chunk):
+            yield format_sse('section', section)
+    if fast or notice:
+        if notice:
+            yield format_sse('notice', {'notice': notice})
+        chunk = render_analysis_markdown(build_fast_analysis(cv_text, target_role, profile))
+        parts = [chunk]
+        yield format_sse('token', {'text': chunk})
+        for section in parser.feed(chunk):
+            yield format_sse('section', section)
+    for section in parser.finish():
+        yield format_sse('section', section)
+    
+    analysis = ''.join(parts)
+    if not analysis or analysis.startswith('Error'):
+        yield format_sse('error', {'error': analysis or 'The analysis returned no content.'})
+        return
+    
+    result = parse_analysis(analysis).to_dict()
+    session_data = {
+        'result': result,
+        'target_role': target_role,
+        'timestamp': datetime.now().isoformat()
+    }
+    session_store.put(session_id, session_data)
+    schedule_report_render(session_id, session_data)
+    done = dict(cache_details, session_id=session_id, result=result, mode='fast' if fast or notice else 'ai')
+    if notice:
+        done['notice'] = notice
+    yield format_sse('done', done)
+
+# Purpose: Keep a finished analysis for its PDF download
+# Functionality:
+#   - Parses the analysis once into a typed result (parse_analysis())
+#   - Stores the result and target role in the session store under session_id
+#   - Optionally pre-renders the PDF report in the background (PDF_EAGER_RENDER); errors are not rendered
+#   - Returns the typed result as a dict for the JSON response
+# Used by: /analyze and /rank-roles
+def save_analysis_session(session_id, analysis, target_role):
+    """Parses and stores an analysis in the session store; returns the typed result dict."""
+    result = parse_analysis(analysis).to_dict()
+    session_data = {
+        'result': result,
+        'target_role': target_role,
+        'timestamp': datetime.now().isoformat()
+    }
+    session_store.put(session_id, session_data)
+    if not analysis.startswith('Error'):
+        schedule_report_render(session_id, session_data)
+    return result
+
+# Purpose: Process CV file uploads or text input and generate skill gap analysis
+# Functionality:
+#   - Flask route handler for POST requests to '/analyze'
+#   - Reads and validates the CV and target role with read_analysis_request()
+#   - Job mode (mode=job): queues the analysis on the durable job queue and returns 202 with a job id
+#     right away (enqueue_analysis_job()); results are polled from /jobs/<job_id>
+#   - Otherwise scans the CV for known skills once (extract_skill_profile()) and returns the profile as
+#     "skill_profile"
+#   - Fast mode (mode=fast): returns build_fast_analysis() without calling Groq or waiting for a slot
+#   - Waits for a slot in analysis_limiter; returns 503 with Retry-After when the server is saturated
+#   - Streaming mode (?stream=1 or Accept: text/event-stream): returns Server-Sent Events with
+#     tokens as they arrive from Groq and one structured event per completed section
+#   - Default mode: calls analyze_cv_with_groq() to get AI-powered analysis, falling back to fast mode
+#     (with the error as "notice") when Groq is unavailable or rate-limited and FAST_MODE_FALLBACK is on
+#   - Parses the analysis once and stores the typed result with a random session ID for PDF
+#     download later (save_analysis_session())
+#   - Returns JSON response with analysis text, typed result, mode, cache layer ("exact", "semantic" or
+#     "miss"), session ID and file extraction statistics
 #   - Returns error responses for invalid inputs or processing failures
 # Used by: Frontend form submission when user clicks "Analyze My Skills"
 
@@ -359,79 +2505,331 @@ def index():
 def analyze():
     """Processes CV upload/text input and returns AI-powered skill gap analysis with job readiness score."""
     try:
-        cv_text = ""
-        target_role = request.form.get('target_role', '').strip()
-        custom_role = request.form.get('custom_role', '').strip()
+        details = {}
+        cv_text, target_role, error_response = read_analysis_request(details)
+        if error_response is not None:
+            return error_response
         
-        # Use custom role if provided, otherwise use dropdown selection
-        if custom_role:
-            target_role = custom_role
-        elif not target_role or target_role == "General Tech Role":
-            target_role = "General Professional Role"
-        
-        # Validate target role
-        if len(target_role) > 100:
-            return safe_jsonify_error({'error': 'Target role name is too long (max 100 characters).'}, 400)
+        mode = requested_mode()
+        if mode == 'job':
+            # run_analysis_job() scans the skills itself; the stored payload stays small
+            return enqueue_analysis_job(cv_text, target_role, details)
         
-        # Check if file was uploaded
-        if 'file' in request.files and request.files['file'].filename != '':
-            file = request.files['file']
-            
-            if file and allowed_file(file.filename):
-                # Check file size (max 16MB already set in app config)
-                filename = secure_filename(file.filename)
-                if not filename:
-                    return safe_jsonify_error({'error': 'Invalid filename.'}, 400)
-                    
-                ensure_upload_folder()
-                file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(file_path)
-                
-                # Extract text from file
-                try:
-                    cv_text = extract_text_from_file(file_path, filename)
-                except Exception as extract_error:
-                    # Clean up file even if extraction fails
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    return safe_jsonify_error({'error': f'Failed to extract text from file: {safe_encode(str(extract_error))}'}, 400)
-                
-                # Clean up uploaded file
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                except Exception as cleanup_error:
-                    print(f"Warning: Failed to clean up file {file_path}: {cleanup_error}")
-            else:
-                return safe_jsonify_error({'error': 'Invalid file type. Please upload PDF, DOCX, or TXT files.'}, 400)
+        session_id = uuid.uuid4().hex
+        with timed_stage('skills'):
+            profile = extract_skill_profile(cv_text, target_role)
+        details['skill_profile'] = profile
+        fast = mode == 'fast'
         
-        # Check if text was pasted
-        elif 'cv_text' in request.form and request.form['cv_text'].strip():
-            cv_text = request.form['cv_text']
+        if wants_event_stream():
+            events = stream_analysis_events(cv_text, target_role, session_id, details, profile, fast)
+            response = Response(stream_with_context(events), mimetype='text/event-stream')
+            if not fast:
+                # The slot is held until the server closes the streamed response (finished or disconnected)
+                analysis_limiter.acquire()
+                response.call_on_close(analysis_limiter.release)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
         
+        notice = None
+        if fast:
+            analysis = render_analysis_markdown(build_fast_analysis(cv_text, target_role, profile))
         else:
-            return safe_jsonify_error({'error': 'Please provide a CV either by uploading a file or pasting text.'}, 400)
+            # Analyze with Groq, passing target role
+            with analysis_limiter:
+                analysis = analyze_cv_with_groq(cv_text, target_role, profile, details)
+            if analysis.startswith('Error') and FAST_MODE_FALLBACK:
+                notice = analysis
+                analysis = render_analysis_markdown(build_fast_analysis(cv_text, target_role, profile))
+        details['mode'] = 'fast' if fast or notice else 'ai'
+        if notice:
+            details['notice'] = notice
         
-        # Validate CV text
-        if not cv_text or len(cv_text.strip()) < 50:
-            return safe_jsonify_error({'error': 'CV text is too short. Please provide a complete CV.'}, 400)
+        # Parse once and store the typed result in the session store for PDF download
+        with timed_stage('store'):
+            result = save_analysis_session(session_id, analysis, target_role)
         
-        # Analyze with Groq, passing target role
-        analysis = analyze_cv_with_groq(cv_text, target_role)
+        with timed_stage('serialize'):
+            return safe_jsonify(dict(details, analysis=analysis, result=result, session_id=session_id))
+    except ServerBusyError as busy:
+        response = safe_jsonify_error({'error': safe_encode(str(busy))}, 503)
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response
+    except Exception as e:
+        error_msg = safe_encode(str(e))
+        return safe_jsonify_error({'error': f'An error occurred: {error_msg}'}, 500)
+
+# Purpose: Run one queued analysis job
+# Functionality:
+#   - Same steps as a normal /analyze request: analyze_cv_with_groq() with cache details, fast-mode
+#     fallback when Groq is unavailable, then save_analysis_session() under the job id so the usual
+#     /download-pdf/<job_id> works too
+#   - Raises RuntimeError with the error text when the analysis failed and no fallback applies
+#   - Returns the JSON result stored on the job (same fields as the /analyze response)
+# Used by: get_job_workers()
+def run_analysis_job(job_id, payload):
+    """Analyzes a queued CV and returns the /analyze-style result for the job."""
+    cv_text, target_role = payload['cv_text'], payload['target_role']
+    details = dict(payload.get('details') or {})
+    profile = extract_skill_profile(cv_text, target_role)
+    details['skill_profile'] = profile
+    analysis = analyze_cv_with_groq(cv_text, target_role, profile, details)
+    notice = None
+    if analysis.startswith('Error'):
+        if not FAST_MODE_FALLBACK:
+            raise RuntimeError(analysis)
+        notice = analysis
+        analysis = render_analysis_markdown(build_fast_analysis(cv_text, target_role, profile))
+    details['mode'] = 'fast' if notice else 'ai'
+    if notice:
+        details['notice'] = notice
+    result = save_analysis_session(job_id, analysis, target_role)
+    return dict(details, analysis=analysis, result=result, session_id=job_id, target_role=target_role)
+
+
+_job_workers = None
+
+# Purpose: Build the background job workers together with the job queue they drain
+# Functionality:
+#   - Creates the JobWorkerPool on first use (after get_job_queue()); its threads only start on start()
+#   - Returns None when job mode is unavailable
+# Used by: /analyze job mode
+def get_job_workers():
+    """Returns the JobWorkerPool draining the job queue (threads start on start()); None without a queue."""
+    global _job_workers
+    job_queue = get_job_queue()
+    if job_queue is None:
+        return None
+    with _job_queue_lock:
+        if _job_workers is None:
+            _job_workers = JobWorkerPool(job_queue, run_analysis_job, JOB_WORKERS, JOB_POLL_INTERVAL)
+    return _job_workers
+
+# Purpose: Answer a job-mode /analyze request
+# Functionality:
+#   - Validates the optional "priority" field (high, normal or low)
+#   - Enqueues the preprocessed CV text, role and extraction details on the durable job queue; an
+#     identical job that is still queued or running is reused instead (deduplicated=true)
+#   - Starts the worker threads if needed and wakes them
+#   - Returns 202 Accepted with the job id, a Location header and the URLs to poll
+# Used by: /analyze with mode=job
+def enqueue_analysis_job(cv_text, target_role, details):
+    """Queues an analysis job and returns the 202 response describing it."""
+    job_queue = get_job_queue()
+    if job_queue is None:
+        return safe_jsonify_error({'error': 'Background jobs are not available on this server.'}, 503)
+    priority_name = (request.args.get('priority') or request.form.get('priority') or 'normal').strip().lower()
+    if priority_name not in JOB_PRIORITIES:
+        return safe_jsonify_error({'error': 'Priority must be one of: high, normal, low.'}, 400)
+    
+    job_id, deduplicated = job_queue.enqueue(
+        uuid.uuid4().hex,
+        make_analysis_cache_key(cv_text, target_role),
+        {'cv_text': cv_text, 'target_role': target_role, 'details': details},
+        JOB_PRIORITIES[priority_name]
+    )
+    job_workers = get_job_workers()
+    job_workers.start()
+    job_workers.notify()
+    
+    response = safe_jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'deduplicated': deduplicated,
+        'status_url': f'/jobs/{job_id}',
+        'result_url': f'/jobs/{job_id}/result',
+        'pdf_url': f'/jobs/{job_id}/pdf'
+    })
+    response.status_code = 202
+    response.headers['Location'] = f'/jobs/{job_id}'
+    return response
+
+# Purpose: Report the state of a background analysis job
+# Functionality:
+#   - Flask route handler for GET requests to '/jobs/<job_id>'
+#   - Returns status (queued, running, done or error), timestamps, attempts and queue position;
+#     the result itself is left to /jobs/<job_id>/result
+#   - Returns 404 for unknown or purged jobs
+# Used by: Clients polling a job created with /analyze mode=job
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Returns the status of an analysis job."""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        return safe_jsonify_error({'error': 'Job not found. It may have expired.'}, 404)
+    job.pop('result', None)
+    return safe_jsonify(job)
+
+# Purpose: Return the finished analysis of a background job
+# Functionality:
+#   - Flask route handler for GET requests to '/jobs/<job_id>/result'
+#   - 200 with the same fields as a normal /analyze response once the job is done
+#   - 202 with the current status (and a Retry-After hint) while it is queued or running
+#   - 500 with the error message if the job failed; 404 for unknown or purged jobs
+# Used by: Clients polling a job created with /analyze mode=job
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Returns the analysis of a finished job, or its status while it is still pending."""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        return safe_jsonify_error({'error': 'Job not found. It may have expired.'}, 404)
+    if job['status'] == 'done':
+        return safe_jsonify(dict(job['result'], job_id=job_id, status='done'))
+    if job['status'] == 'error':
+        return safe_jsonify_error({'error': job.get('error') or 'The analysis failed.', 'job_id': job_id, 'status': 'error'}, 500)
+    response = safe_jsonify(job)
+    response.status_code = 202
+    response.headers['Retry-After'] = '2'
+    return response
+
+# Purpose: Download the PDF report of a finished background job
+# Functionality:
+#   - Flask route handler for GET requests to '/jobs/<job_id>/pdf'
+#   - 409 while the job is not finished, 404 for unknown jobs
+#   - Restores the session from the stored job result if the session store has already evicted it,
+#     then serves the report through download_pdf()
+# Used by: Clients that ran an analysis in job mode
+@app.route('/jobs/<job_id>/pdf')
+def job_pdf(job_id):
+    """Returns the PDF report for a finished analysis job."""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id) if job_queue is not None else None
+    if job is None:
+        return safe_jsonify_error({'error': 'Job not found. It may have expired.'}, 404)
+    if job['status'] != 'done':
+        return safe_jsonify_error({'error': f"The job is {job['status']}; the report is not available.", 'status': job['status']}, 409)
+    session_id = job['result']['session_id']
+    if session_store.get(session_id) is None:
+        session_store.put(session_id, {
+            'result': job['result']['result'],
+            'target_role': job['result']['target_role'],
+            'timestamp': datetime.fromtimestamp(job['finished_at']).isoformat()
+        })
+    return download_pdf(session_id)
+
+# Purpose: Show which of the known roles a CV fits best, and analyze only the chosen few with AI
+# Functionality:
+#   - Flask route handler for POST requests to '/rank-roles' with the same CV fields as /analyze
+#   - Scans the CV for skills once and ranks every known role against it with get_role_fit_index()
+#   - Each ranking entry has coverage, heuristic score and the matched/missing requirement skills
+#   - Optionally runs full AI analyses concurrently, one analysis_limiter slot each (503 when saturated), for the roles
+#     in "analyze_roles" or for the best "top_k" roles (at most ROLE_RANK_MAX_ANALYSES)
+#   - Analyses that fail fall back to fast mode like /analyze; each gets its own session ID for PDF download
+# Used by: Frontend "Find My Best-Fit Roles" button and API clients comparing roles
+@app.route('/rank-roles', methods=['POST'])
+def rank_roles():
+    """Ranks all known roles for a CV and optionally analyzes the top or selected ones."""
+    try:
+        details = {}
+        cv_text, _, error_response = read_analysis_request(details)
+        if error_response is not None:
+            return error_response
         
-        # Store analysis in cache for PDF download
-        session_id = str(datetime.now().timestamp())
-        analysis_cache[session_id] = {
-            'analysis': analysis,
-            'target_role': target_role,
-            'timestamp': datetime.now()
-        }
+        started = time.perf_counter()
+        found = get_skill_matcher().find(cv_text)
+        ranking = []
+        role_fit_index = get_role_fit_index()
+        for role, coverage, score in role_fit_index.rank(found):
+            requirements = role_fit_index.requirements[role]
+            ranked_skills = sorted(requirements, key=lambda skill: (-requirements[skill], skill))
+            ranking.append({
+                'role': role,
+                'coverage': coverage,
+                'score': score,
+                'matched': [skill for skill in ranked_skills if skill in found],
+                'missing': [skill for skill in ranked_skills if skill not in found]
+            })
+        rank_ms = round((time.perf_counter() - started) * 1000, 3)
+        
+        roles = parse_batch_roles(request.form.getlist('analyze_roles')) if request.form.get('analyze_roles') else []
+        if not roles:
+            try:
+                top_k = int(request.form.get('top_k') or 0)
+            except ValueError:
+                return safe_jsonify_error({'error': 'top_k must be a whole number.'}, 400)
+            roles = [entry['role'] for entry in ranking[:max(0, top_k)]]
+        if any(len(role) > 100 for role in roles):
+            return safe_jsonify_error({'error': 'Target role name is too long (max 100 characters).'}, 400)
+        roles = roles[:ROLE_RANK_MAX_ANALYSES]
         
-        return safe_jsonify({'analysis': analysis, 'session_id': session_id})
+        analyses = []
+        if roles:
+            completed = {job[1]: analysis for job, analysis, _ in iter_batch_llm_results([(cv_text, role) for role in roles], len(roles), raise_busy=True)}
+            for role in roles:
+                analysis, notice = completed[role], None
+                if analysis.startswith('Error') and FAST_MODE_FALLBACK:
+                    notice = analysis
+                    analysis = render_analysis_markdown(build_fast_analysis(cv_text, role))
+                session_id = uuid.uuid4().hex
+                entry = {
+                    'target_role': role,
+                    'analysis': analysis,
+                    'result': save_analysis_session(session_id, analysis, role),
+                    'session_id': session_id,
+                    'mode': 'fast' if notice else 'ai'
+                }
+                if notice:
+                    entry['notice'] = notice
+                analyses.append(entry)
+        
+        return safe_jsonify(dict(details, skills=sorted(found, key=lambda skill: (-found[skill], skill)),
+                                 ranking=ranking, rank_ms=rank_ms, analyses=analyses))
+    except ServerBusyError as busy:
+        response = safe_jsonify_error({'error': safe_encode(str(busy))}, 503)
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response
     except Exception as e:
         error_msg = safe_encode(str(e))
         return safe_jsonify_error({'error': f'An error occurred: {error_msg}'}, 500)
 
+# Purpose: Analyze many CVs against one or more roles in a single request
+# Functionality:
+#   - Flask route handler for POST requests to '/analyze-batch'
+#   - Accepts a zip archive ("archive" field) and/or several files ("files" field) plus a role list
+#   - Validates role names (max 100 characters each) and that at least one supported CV was sent
+#   - Saves uploads into a private temporary directory and runs run_batch_analysis() over them
+#   - Streams results back as JSON Lines (one item record per CV/role, then a summary record),
+#     encoding each record as it is produced (iter_json_lines())
+#   - Removes the temporary directory once the stream has been fully sent
+# Used by: Recruiting tools and scripts screening CVs in bulk
+@app.route('/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """Runs a bulk CV analysis and streams per-item results as JSON Lines."""
+    roles = parse_batch_roles(request.form.getlist('roles'))
+    if any(len(role) > 100 for role in roles):
+        return safe_jsonify_error({'error': 'Target role name is too long (max 100 characters).'}, 400)
+    
+    work_dir = tempfile.mkdtemp(prefix='skillgap_batch_')
+    try:
+        documents = []
+        archive = request.files.get('archive')
+        if archive and archive.filename:
+            try:
+                documents.extend(collect_batch_documents(archive.stream, work_dir))
+            except zipfile.BadZipFile:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                return safe_jsonify_error({'error': 'The uploaded archive is not a valid zip file.'}, 400)
+        for upload in request.files.getlist('files'):
+            filename = secure_filename(upload.filename or '')
+            if filename and allowed_file(filename) and len(documents) < BATCH_MAX_DOCUMENTS:
+                path = os.path.join(work_dir, f"{len(documents)}_{filename}")
+                upload.save(path)
+                documents.append((path, upload.filename))
+        if not documents:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return safe_jsonify_error({'error': 'Please upload a zip archive or files in PDF, DOCX, or TXT format.'}, 400)
+    except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return safe_jsonify_error({'error': f'An error occurred: {safe_encode(str(e))}'}, 500)
+    
+    response = Response(stream_with_context(iter_json_lines(run_batch_analysis(documents, roles))),
+                        mimetype='application/x-ndjson')
+    response.call_on_close(lambda: shutil.rmtree(work_dir, ignore_errors=True))
+    return response
+
 # Purpose: Provide health check endpoint for monitoring application status
 # Functionality:
 #   - Flask route handler for GET requests to '/health'
@@ -443,25 +2841,234 @@ def analyze():
 def health():
     return safe_jsonify({'status': 'ok', 'message': 'SkillGap AI is running!'})
 
+# Purpose: Expose runtime cache statistics for monitoring
+# Functionality:
+#   - Flask route handler for GET requests to '/stats'
+#   - Returns hit/miss counters and sizes of the analysis result cache and the session store
+#   - Returns in-flight, queued and rejected counts of the /analyze concurrency limiter
+#   - Returns size and hit counters of the rendered PDF report cache and the extracted text cache
+#   - Returns Groq call, retry, hedging, latency and circuit breaker statistics
+#   - Returns the startup profile: module import time, RSS and the cost of each lazy import so far
+#   - Returns job queue and worker counts once this process has opened the job queue (null before)
+# Used by: Operators checking how many Groq calls the caches are saving and how much memory sessions use
+@app.route('/stats')
+def stats():
+    # Only a job queue this process already opened: /stats must not create the database
+    job_queue, job_workers = _job_queue, _job_workers
+    return safe_jsonify({
+        'analysis_cache': analysis_result_cache.stats(),
+        'semantic_cache': semantic_analysis_cache.stats() if semantic_analysis_cache is not None else None,
+        'coalescing': analysis_flights.stats(),
+        'sessions': session_store.stats(),
+        'concurrency': analysis_limiter.stats(),
+        'pdf_reports': rendered_report_cache.stats(),
+        'extracted_text': extracted_text_cache.stats() if extracted_text_cache is not None else None,
+        'groq': groq_gateway.stats(),
+        'groq_fast_model': fast_groq_gateway.stats(),
+        'model_routing': model_router.stats(),
+        'jobs': dict(job_queue.stats(), workers=job_workers.stats() if job_workers is not None else None)
+                if job_queue is not None else None,
+        'startup': dict(startup_profile, lazy_imports=dict(startup_profile['lazy_imports'])),
+        'json_backend': 'orjson' if get_orjson() is not None else 'json',
+        'cpu_pool': cpu_pool.stats()
+    })
+
+# Purpose: Expose the counters behind /stats as Prometheus metrics at scrape time
+# Functionality:
+#   - Reads each component's stats() (caches, coalescing, limiter, Groq client, jobs) once per scrape
+#   - Reports lookups and calls as counters, sizes and in-flight work as gauges, and hit ratios
+#   - Nothing is double counted: the components stay the single source of truth
+# Used by: metrics.render() for the /metrics route
+def collect_component_metrics():
+    """Yields (name, type, help, labels, value) samples for the app's cache, queue and client counters."""
+    cache = analysis_result_cache.stats()
+    for result, key in (('hit', 'hits'), ('backend_hit', 'backend_hits'), ('miss', 'misses')):
+        yield 'skillgap_analysis_cache_lookups_total', 'counter', 'Analysis result cache lookups.', {'result': result}, cache[key]
+    yield 'skillgap_analysis_cache_hit_ratio', 'gauge', 'Share of analysis cache lookups served from cache.', {}, cache['hit_ratio']
+    yield 'skillgap_analysis_cache_entries', 'gauge', 'Entries in the local analysis cache.', {}, cache['entries']
+
+    if semantic_analysis_cache is not None:
+        semantic = semantic_analysis_cache.stats()
+        for result, key in (('hit', 'hits'), ('miss', 'misses')):
+            yield 'skillgap_semantic_cache_lookups_total', 'counter', 'Near-duplicate CV cache lookups.', {'result': result}, semantic[key]
+        yield 'skillgap_semantic_cache_hit_ratio', 'gauge', 'Share of semantic cache lookups that matched.', {}, semantic['hit_ratio']
+        yield 'skillgap_semantic_cache_entries', 'gauge', 'Entries in the semantic cache.', {}, semantic['entries']
+
+    flights = analysis_flights.stats()
+    yield 'skillgap_coalescing_in_flight', 'gauge', 'Distinct analyses currently running.', {}, flights['in_flight']
+    yield 'skillgap_coalescing_leaders_total', 'counter', 'Analyses that ran a Groq call themselves.', {}, flights['leaders']
+    yield 'skillgap_coalescing_followers_total', 'counter', 'Analyses that shared another request\'s result.', {}, flights['coalesced']
+
+    limiter = analysis_limiter.stats()
+    yield 'skillgap_analyses_in_flight', 'gauge', 'Analyses holding a concurrency slot.', {}, limiter['in_flight']
+    yield 'skillgap_analyses_waiting', 'gauge', 'Analyses queued for a concurrency slot.', {}, limiter['waiting']
+    yield 'skillgap_analyses_admitted_total', 'counter', 'Analyses admitted by the concurrency limiter.', {}, limiter['admitted']
+    yield 'skillgap_analyses_rejected_total', 'counter', 'Analyses rejected with 503 by the concurrency limiter.', {}, limiter['rejected']
+
+    sessions = session_store.stats()
+    yield 'skillgap_sessions_entries', 'gauge', 'Sessions held in memory.', {}, sessions['entries']
+    yield 'skillgap_sessions_bytes', 'gauge', 'Approximate size of the in-memory sessions.', {}, sessions['bytes']
+
+    reports = rendered_report_cache.stats()
+    for result, key in (('hit', 'hits'), ('miss', 'misses')):
+        yield 'skillgap_pdf_cache_lookups_total', 'counter', 'Rendered PDF cache lookups.', {'result': result}, reports[key]
+    yield 'skillgap_pdf_cache_bytes', 'gauge', 'Size of the rendered PDF cache.', {}, reports['bytes']
+
+    if extracted_text_cache is not None:
+        extracted = extracted_text_cache.stats()
+        for result, key in (('hit', 'hits'), ('backend_hit', 'backend_hits'), ('miss', 'misses')):
+            yield 'skillgap_extraction_cache_lookups_total', 'counter', 'Extracted text cache lookups.', {'result': result}, extracted[key]
+        yield 'skillgap_extraction_cache_bytes', 'gauge', 'Size of the in-memory extracted text cache.', {}, extracted['bytes']
+
+    groq = groq_gateway.stats()
+    for key in ('calls', 'retries', 'failures', 'hedged'):
+        yield f'skillgap_groq_{key}_total', 'counter', f'Groq client {key}.', {}, groq[key]
+    yield 'skillgap_groq_circuit_open', 'gauge', '1 while the Groq circuit breaker is open.', {}, int(groq['circuit_breaker']['state'] == 'open')
+
+    # Like /stats, never opens the job database just to report on it
+    job_queue, job_workers = _job_queue, _job_workers
+    if job_queue is not None:
+        jobs = job_queue.stats()
+        for status in ('queued', 'running', 'done', 'error'):
+            yield 'skillgap_jobs', 'gauge', 'Background analysis jobs by status.', {'status': status}, jobs.get(status)
+    if job_workers is not None:
+        yield 'skillgap_job_workers_busy', 'gauge', 'Job workers currently running an analysis.', {}, job_workers.stats()['busy']
+
+    pool = cpu_pool.stats()
+    yield 'skillgap_cpu_pool_pending', 'gauge', 'CPU pool tasks running or waiting for a worker.', {}, pool['pending']
+    yield 'skillgap_cpu_pool_queue_depth', 'gauge', 'CPU pool tasks waiting for a worker.', {}, pool['queue_depth']
+    yield 'skillgap_cpu_pool_workers', 'gauge', 'CPU pool worker processes.', {}, pool['workers']
+    for key in ('rejected', 'timeouts', 'terminated'):
+        yield f'skillgap_cpu_pool_{key}_total', 'counter', f'CPU pool {key} events.', {}, pool[key]
+
+    yield 'skillgap_startup_import_seconds', 'gauge', 'Time taken to import app.py.', {}, startup_profile['module_import_ms'] / 1000
+    for module, cost in list(startup_profile['lazy_imports'].items()):
+        yield 'skillgap_lazy_import_seconds', 'gauge', 'Time taken by each lazily imported dependency.', {'module': module}, cost['ms'] / 1000
+
+
+metrics.add_collector(collect_component_metrics)
+
+# Purpose: Prometheus scrape endpoint
+# Functionality:
+#   - Renders stage and request latency histograms, status and token counters, and the component
+#     counters from collect_component_metrics() in the text exposition format (version 0.0.4)
+# Used by: Prometheus or any compatible scraper
+@app.route('/metrics')
+def prometheus_metrics():
+    """Returns all metrics in the Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+PDF_EAGER_RENDER = os.getenv('PDF_EAGER_RENDER', '').strip().lower() in ('1', 'true', 'yes')
+
+# Purpose: Build every ReportLab paragraph style used by the PDF report exactly once
+# Functionality:
+#   - Imports ReportLab (lazily, on the first report) and loads the sample style sheet a single time
+#   - Defines title, heading, normal, roadmap step, score and footer styles and the divider table style
+#   - Returns them in a dict so generate_pdf_report() never creates styles per call or per line
+# Used by: get_pdf_styles()
+def build_pdf_styles():
+    """Returns the precompiled ReportLab paragraph styles for the PDF report."""
+    lazy_import('reportlab.platypus')
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+    styles = getSampleStyleSheet()
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=12
+    )
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#667eea'),
+            spaceAfter=10,
+            alignment=1
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#764ba2'),
+            spaceAfter=8,
+            spaceBefore=8
+        ),
+        'normal': normal_style,
+        'step': ParagraphStyle(
+            'StepStyle',
+            parent=normal_style,
+            leftIndent=0.2*inch,
+            backgroundColor=colors.HexColor('#f3f0ff'),
+            borderPadding=5
+        ),
+        'score': ParagraphStyle(
+            'ScoreStyle',
+            parent=normal_style,
+            fontSize=12,
+            textColor=colors.HexColor('#764ba2')
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.grey,
+            alignment=1
+        ),
+        'divider': TableStyle([
+            ('LINEABOVE', (0, 0), (-1, -1), 2, colors.HexColor('#667eea')),
+        ])
+    }
+
+_pdf_styles = None
+_pdf_styles_lock = threading.Lock()
+
+
+def get_pdf_styles():
+    """Returns the shared PDF styles, importing ReportLab and building them on first use."""
+    global _pdf_styles
+    if _pdf_styles is None:
+        with _pdf_styles_lock:
+            if _pdf_styles is None:
+                _pdf_styles = build_pdf_styles()
+    return _pdf_styles
+
 # Purpose: Generate a formatted, professional PDF document from skill gap analysis results
 # Functionality:
-#   - Encodes all text input (analysis and target role) to UTF-8 format
+#   - Accepts a typed AnalysisResult (or its dict form); raw analysis text is parsed first
 #   - Creates BytesIO buffer to hold PDF data in memory
 #   - Initializes ReportLab PDF document with letter size page and margins
-#   - Defines custom paragraph styles for title, headings, normal text, steps, and scores
+#   - Uses the precompiled paragraph styles from get_pdf_styles()
 #   - Adds PDF elements: title, target role, generation timestamp, horizontal divider
-#   - Parses analysis text line-by-line and formats appropriately:
-#     * Markdown-style headings (**text**) become section headers
-#     * Bullet points (-) become formatted bullet lists
-#     * Lines starting with 'Step' become highlighted roadmap items
-#     * Score lines become bold and colored
+#   - Lays out each section straight from the result fields:
+#     * Section titles become headers
+#     * Priority skills are highlighted, other missing and current skills become bullet lists
+#     * Roadmap steps become highlighted roadmap items
+#     * The score is bold and colored
+#   - Escapes all model-provided text so ReportLab markup cannot break the layout
 #   - Adds footer with application branding
 #   - Builds final PDF document and returns buffer positioned at start
-# Used by: /download-pdf route to create downloadable PDF reports
-def generate_pdf_report(analysis_text, target_role):
-    """Generates a formatted PDF report from skill gap analysis with styling and layout."""
-    analysis_text = safe_encode(analysis_text)
-    target_role = safe_encode(target_role)
+# Used by: render_session_report() to create downloadable PDF reports
+def generate_pdf_report(result, target_role, generated_at=None):
+    """Generates a formatted PDF report from a skill gap analysis result with styling and layout."""
+    if isinstance(result, str):
+        result = parse_analysis(result)
+    elif isinstance(result, dict):
+        result = AnalysisResult.from_dict(result)
+    target_role = html.escape(safe_encode(target_role), quote=False)
+    generated_at = generated_at or datetime.now()
+    
+    def esc(text):
+        return html.escape(safe_encode(text), quote=False)
+    
+    pdf_styles = get_pdf_styles()
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
     
     buffer = BytesIO()
     
@@ -471,96 +3078,122 @@ def generate_pdf_report(analysis_text, target_role):
     
     elements = []
     
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#667eea'),
-        spaceAfter=10,
-        alignment=1
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#764ba2'),
-        spaceAfter=8,
-        spaceBefore=8
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        leading=12
-    )
+    title_style = pdf_styles['title']
+    heading_style = pdf_styles['heading']
+    normal_style = pdf_styles['normal']
+    step_style = pdf_styles['step']
+    score_style = pdf_styles['score']
     
     elements.append(Paragraph("SkillGap AI - Skill Gap Analysis Report", title_style))
     elements.append(Paragraph(f"Target Role: <b>{target_role}</b>", heading_style))
-    elements.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", normal_style))
+    elements.append(Paragraph(f"Generated: {generated_at.strftime('%B %d, %Y at %I:%M %p')}", normal_style))
     elements.append(Spacer(1, 0.3*inch))
     
-    divider_data = [['']]
-    divider_table = Table(divider_data, colWidths=[7.5*inch])
-    divider_table.setStyle(TableStyle([
-        ('LINEABOVE', (0, 0), (-1, -1), 2, colors.HexColor('#667eea')),
-    ]))
+    divider_table = Table([['']], colWidths=[7.5*inch])
+    divider_table.setStyle(pdf_styles['divider'])
     elements.append(divider_table)
     elements.append(Spacer(1, 0.2*inch))
     
-    lines = analysis_text.split('\n')
+    if result.missing_skills:
+        elements.append(Paragraph("MISSING SKILLS:", heading_style))
+        for skill in result.missing_skills:
+            text = f"<b>{esc(skill.name)}</b>" + (f" - {esc(skill.description)}" if skill.description else '')
+            if skill.resource:
+                text += f" | Learn: {esc(skill.resource)}"
+            if skill.priority:
+                elements.append(Paragraph(f"<b>PRIORITY {skill.priority}:</b> {text}", step_style))
+                elements.append(Spacer(1, 0.05*inch))
+            else:
+                elements.append(Paragraph(f"• {text}", normal_style))
+        elements.append(Spacer(1, 0.1*inch))
+    
+    if result.current_skills:
+        elements.append(Paragraph("CURRENT SKILLS IDENTIFIED:", heading_style))
+        for skill in result.current_skills:
+            elements.append(Paragraph(f"• {esc(skill)}", normal_style))
+        elements.append(Spacer(1, 0.1*inch))
     
-    for line in lines:
-        line = safe_encode(line)
-        if line.strip() == '':
+    if result.roadmap:
+        elements.append(Paragraph("LEARNING ROADMAP:", heading_style))
+        for step in result.roadmap:
+            text = f"Step {step.step}: {esc(step.skill)}" + (f" - {esc(step.detail)}" if step.detail else '')
+            elements.append(Paragraph(text, step_style))
             elements.append(Spacer(1, 0.05*inch))
-        elif line.strip().startswith('**') and line.strip().endswith('**'):
-            heading_text = line.strip().replace('**', '')
-            elements.append(Paragraph(heading_text, heading_style))
-        elif line.strip().startswith('-') or line.strip().startswith('•'):
-            bullet_text = line.strip().lstrip('-•').strip()
-            elements.append(Paragraph(f"• {bullet_text}", normal_style))
-        elif line.strip().startswith('Step'):
-            elements.append(Paragraph(line.strip(), ParagraphStyle(
-                'StepStyle',
-                parent=normal_style,
-                leftIndent=0.2*inch,
-                backgroundColor=colors.HexColor('#f3f0ff'),
-                borderPadding=5
-            )))
-        elif line.strip().startswith('Score:'):
-            elements.append(Paragraph(f"<b>{line.strip()}</b>", ParagraphStyle(
-                'ScoreStyle',
-                parent=normal_style,
-                fontSize=12,
-                textColor=colors.HexColor('#764ba2')
-            )))
-        else:
-            elements.append(Paragraph(line.strip(), normal_style))
+        elements.append(Spacer(1, 0.1*inch))
+    
+    if result.score is not None:
+        elements.append(Paragraph("JOB READINESS SCORE:", heading_style))
+        elements.append(Paragraph(f"<b>Score: {result.score}/100</b>", score_style))
+        elements.append(Spacer(1, 0.1*inch))
+    
+    if result.explanation:
+        elements.append(Paragraph("EXPLANATION:", heading_style))
+        elements.append(Paragraph(esc(result.explanation), normal_style))
+    
+    for note in result.notes:
+        elements.append(Paragraph(esc(note), normal_style))
     
     elements.append(Spacer(1, 0.3*inch))
-    elements.append(Paragraph("Made with SkillGap AI - From Resume to Roadmap in Seconds", 
-                            ParagraphStyle(
-                                'Footer',
-                                parent=styles['Normal'],
-                                fontSize=9,
-                                textColor=colors.grey,
-                                alignment=1
-                            )))
+    elements.append(Paragraph("Made with SkillGap AI - From Resume to Roadmap in Seconds", pdf_styles['footer']))
     
     doc.build(elements)
     buffer.seek(0)
     return buffer
 
+def render_pdf_report_bytes(result, target_role, generated_at=None):
+    """Pool task: returns the bytes of generate_pdf_report()."""
+    return generate_pdf_report(result, target_role, generated_at).getvalue()
+
+rendered_report_cache = ByteBoundedLRUCache(PDF_CACHE_MAX_BYTES)
+
+# Purpose: Return the rendered PDF for a session, rendering it only the first time
+# Functionality:
+#   - Serves the PDF bytes from rendered_report_cache when present
+#   - Otherwise renders with generate_pdf_report() in cpu_pool, stamping the session's own timestamp so
+#     every render of the same session is identical, and caches the bytes
+#   - Raises CPUTaskTimeout when the render does not finish within CPU_POOL_TASK_TIMEOUT
+#   - Returns (pdf_bytes, etag) where the ETag is a hash of the bytes
+# Used by: /download-pdf route and eager background rendering after /analyze
+def render_session_report(session_id, session_data):
+    """Returns (pdf_bytes, etag) for a session, using the rendered report cache."""
+    pdf_bytes = rendered_report_cache.get(session_id)
+    if pdf_bytes is None:
+        try:
+            generated_at = datetime.fromisoformat(session_data.get('timestamp', ''))
+        except (TypeError, ValueError):
+            generated_at = None
+        # Sessions hold the typed result; very old entries may still hold raw analysis text
+        result = session_data.get('result') or session_data.get('analysis', '')
+        # Timed here rather than inside the worker, whose metrics are never scraped
+        with timed_stage('pdf_build'):
+            pdf_bytes = cpu_pool.run('pdf_render', render_pdf_report_bytes, result, session_data['target_role'], generated_at)
+        rendered_report_cache.set(session_id, pdf_bytes)
+    return pdf_bytes, hashlib.sha256(pdf_bytes).hexdigest()[:32]
+
+# Purpose: Pre-render a session's PDF in the background so the first download is instant
+# Functionality:
+#   - No-op unless PDF_EAGER_RENDER is enabled
+#   - Starts a daemon thread that calls render_session_report(); errors are only logged
+# Used by: /analyze route after a successful analysis is stored
+def schedule_report_render(session_id, session_data):
+    """Renders and caches the session's PDF on a background thread when eager rendering is enabled."""
+    if not PDF_EAGER_RENDER:
+        return
+    def render():
+        try:
+            render_session_report(session_id, session_data)
+        except Exception as e:
+            print(f"Warning: background PDF render failed for {session_id}: {e}")
+    threading.Thread(target=render, daemon=True).start()
+
 # Purpose: Retrieve cached analysis and return it as downloadable PDF file
 # Functionality:
 #   - Flask route handler for GET requests to '/download-pdf/<session_id>'
-#   - Looks up session_id in analysis_cache dictionary
-#   - Returns 404 error if session not found in cache
-#   - Retrieves cached analysis text and target role from session data
-#   - Calls generate_pdf_report() to create formatted PDF document
+#   - Looks up session_id in the session store (local memory, then shared backend if configured)
+#   - Returns 404 error if session not found or expired
+#   - Gets the PDF from render_session_report() (rendered once per session in cpu_pool, then served
+#     from memory); answers 503 with Retry-After when the render times out or the pool is busy
+#   - Sends an ETag and answers If-None-Match with 304 Not Modified
 #   - Generates descriptive filename including target role and timestamp
 #   - Returns PDF file with:
 #     * Proper MIME type (application/pdf)
@@ -570,32 +3203,86 @@ def generate_pdf_report(analysis_text, target_role):
 @app.route('/download-pdf/<session_id>')
 def download_pdf(session_id):
     """Retrieves cached analysis and returns it as a downloadable PDF file."""
-    if session_id not in analysis_cache:
+    with timed_stage('session_lookup'):
+        cached_data = session_store.get(session_id)
+    if cached_data is None:
         return safe_jsonify_error({'error': 'Report not found. Please analyze a CV first.'}, 404)
     
-    cached_data = analysis_cache[session_id]
-    analysis_text = cached_data['analysis']
     target_role = cached_data['target_role']
-    
-    pdf_buffer = generate_pdf_report(analysis_text, target_role)
+    try:
+        with timed_stage('pdf_render'):
+            pdf_bytes, etag = render_session_report(session_id, cached_data)
+    except CPUTaskTimeout:
+        response = safe_jsonify_error({'error': 'The report is taking too long to render. Please try again shortly.'}, 503)
+        response.headers['Retry-After'] = str(ANALYZE_RETRY_AFTER)
+        return response
+    except ServerBusyError as busy:
+        response = safe_jsonify_error({'error': safe_encode(str(busy))}, 503)
+        response.headers['Retry-After'] = str(busy.retry_after)
+        return response
     
     filename = f"SkillGap_Analysis_{target_role.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
     
-    return send_file(
-        pdf_buffer,
-        mimetype='application/pdf',
-        as_attachment=True,
-        download_name=filename
+    with timed_stage('send'):
+        return send_file(
+            BytesIO(pdf_bytes),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=filename,
+            etag=etag,
+            conditional=True
+        )
+
+# Purpose: Optionally pay the lazy-import and client-creation costs before the first real request
+# Functionality:
+#   - Imports the Groq SDK, PyPDF2, python-docx and ReportLab, creates the Groq client, builds the
+#     PDF styles, skill matcher and role index and starts the CPU pool workers; a failing step is only logged
+#   - Records the total time in startup_profile['warmup_ms']
+#   - Runs on a background thread at import when STARTUP_WARMUP is enabled (long-lived servers);
+#     serverless deployments leave it off so cold starts only load what each request needs
+# Used by: Module import (STARTUP_WARMUP) and `python app.py --startup-profile`
+def warm_up():
+    """Loads the lazily imported dependencies and shared objects ahead of the first request."""
+    started = time.perf_counter()
+    steps = (
+        lambda: lazy_import('groq'),
+        get_groq_client,
+        lambda: lazy_import('PyPDF2'),
+        lambda: lazy_import('docx'),
+        get_pdf_styles,
+        get_skill_matcher,
+        get_role_fit_index,
+        cpu_pool.warm
     )
+    for step in steps:
+        try:
+            step()
+        except Exception as e:
+            print(f"Warning: warm-up step failed: {e}")
+    startup_profile['warmup_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+
+startup_profile['module_import_ms'] = round((time.perf_counter() - STARTUP_STARTED) * 1000, 1)
+startup_profile['rss_mb_after_import'] = current_rss_mb()
+# Not in CPU pool workers, which import this module to run their tasks
+if STARTUP_WARMUP and multiprocessing.current_process().name == 'MainProcess':
+    threading.Thread(target=warm_up, daemon=True).start()
 
 # Application entry point
 # Purpose: Start the Flask development/production server
 # Functionality:
+#   - `python app.py --startup-profile` prints the import time and memory of the module and of every
+#     lazily imported dependency (after a warm-up) as JSON and exits, to track cold starts over releases
 #   - Reads PORT environment variable (set by Railway/deployment platforms, defaults to 5000)
 #   - Reads FLASK_ENV to determine debug mode (development=True, production=False)
 #   - Starts Flask application server listening on all interfaces (0.0.0.0)
 #   - Makes app accessible from any network address, not just localhost
 if __name__ == '__main__':
+    if '--startup-profile' in sys.argv[1:]:
+        warm_up()
+        print(json.dumps(dict(startup_profile, rss_mb_after_warmup=current_rss_mb()), indent=2))
+        sys.exit(0)
+
     # Use environment variable for port (Railway sets PORT env var)
     port = int(os.environ.get('PORT', 5000))
     debug_mode = os.environ.get('FLASK_ENV', 'development') == 'development'
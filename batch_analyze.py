@@ -0,0 +1,65 @@
+"""Command line bulk CV screening for SkillGap AI.
+
+Usage:
+    python batch_analyze.py CVS_DIR_OR_ZIP --role "Data Scientist" --role "Data Analyst" [-o results.jsonl]
+
+Writes one JSON line per (CV, role) with its status and analysis, then a summary line
+with total throughput and timing stats.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+from app import (
+    BATCH_EXTRACT_WORKERS,
+    BATCH_LLM_CONCURRENCY,
+    collect_batch_documents,
+    parse_batch_roles,
+    run_batch_analysis,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze many CVs against one or more target roles.")
+    parser.add_argument('source', help="Directory or .zip archive containing PDF, DOCX or TXT CVs")
+    parser.add_argument('-r', '--role', action='append', default=[],
+                        help="Target role (repeat for several roles, or pass a comma separated list)")
+    parser.add_argument('-o', '--output', help="Write JSON Lines here instead of stdout")
+    parser.add_argument('--workers', type=int, default=BATCH_EXTRACT_WORKERS,
+                        help="Documents extracted at once in the CPU pool (default: %(default)s)")
+    parser.add_argument('--concurrency', type=int, default=BATCH_LLM_CONCURRENCY,
+                        help="Maximum simultaneous Groq calls (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source) and not zipfile.is_zipfile(args.source):
+        parser.error(f"{args.source} is neither a directory nor a zip archive")
+
+    roles = parse_batch_roles(args.role)
+    work_dir = tempfile.mkdtemp(prefix='skillgap_batch_')
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        documents = collect_batch_documents(args.source, work_dir)
+        if not documents:
+            parser.error(f"no PDF, DOCX or TXT files found in {args.source}")
+        for record in run_batch_analysis(documents, roles, args.workers, args.concurrency):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            if record['type'] == 'summary':
+                print(
+                    f"{record['items']} analyses ({record['ok']} ok, {record['errors']} errors) "
+                    f"in {record['elapsed_seconds']:.1f}s - {record['items_per_second']:.2f}/s",
+                    file=sys.stderr
+                )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
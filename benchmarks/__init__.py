@@ -0,0 +1 @@
+"""Load and micro-benchmarks for SkillGap AI (see benchmarks/load.py and benchmarks/micro.py)."""
@@ -0,0 +1,60 @@
+"""Helpers shared by the benchmark scripts: latency summaries and JSON result files."""
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (fraction between 0 and 1)."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_seconds(samples):
+    """Returns mean/p50/p95/p99/max of a list of durations, in milliseconds."""
+    values = sorted(samples)
+    if not values:
+        return {'mean': None, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+    return {
+        'mean': round(sum(values) / len(values) * 1000, 3),
+        'p50': round(percentile(values, 0.50) * 1000, 3),
+        'p95': round(percentile(values, 0.95) * 1000, 3),
+        'p99': round(percentile(values, 0.99) * 1000, 3),
+        'max': round(values[-1] * 1000, 3)
+    }
+
+
+def git_commit():
+    """Short hash of the checked out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path, benchmark, config, results):
+    """Writes a run (metadata, config and results) as JSON to path, or stdout when path is None or '-'."""
+    report = {
+        'benchmark': benchmark,
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'results': results
+    }
+    text = json.dumps(report, indent=2)
+    if path and path != '-':
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return report
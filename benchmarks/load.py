@@ -0,0 +1,253 @@
+"""Load benchmark: drives a running SkillGap AI server backed by the fake Groq API.
+
+Usage (from the repository root):
+    python -m benchmarks.load --concurrency 1,8,32 --requests 64 --latency 0.5 -o load.json
+
+Starts fake_groq_server.py in-process and app.py as a subprocess pointed at it, then for
+every scenario (text, pdf and docx uploads to /analyze, /download-pdf) and CV size runs a
+fixed number of requests at each concurrency level. Reports p50/p95/p99 latency, requests
+per second and the server's peak RSS, and writes the run as JSON for comparison.
+"""
+import argparse
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+import httpx
+
+from benchmarks.common import summarize_seconds, write_results
+from benchmarks.samples import CV_SIZES, make_cv_text, make_upload
+from fake_groq_server import start_fake_groq_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ('text', 'pdf', 'docx', 'download-pdf')
+UPLOAD_MIMETYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'txt': 'text/plain'
+}
+TARGET_ROLE = 'Backend Developer'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid):
+    """Returns pid and all of its live descendants (Linux /proc only)."""
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f'/proc/{current}/task'):
+                with open(f'/proc/{current}/task/{task}/children') as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def peak_rss_mb(pid):
+    """Sum of the peak resident set size (VmHWM) of the server and its worker processes, in MB.
+
+    Returns None where /proc is not available. Workers that already exited are not counted.
+    """
+    total = 0
+    found = False
+    for process in process_tree(pid):
+        try:
+            with open(f'/proc/{process}/status') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        total += int(line.split()[1])
+                        found = True
+        except OSError:
+            continue
+    return round(total / 1024, 1) if found else None
+
+
+def start_app(args, groq_base_url):
+    """Starts the app server as a subprocess and waits until /health answers."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        FLASK_ENV='production',
+        GROQ_API_KEY='benchmark',
+        GROQ_BASE_URL=groq_base_url,
+        JOB_QUEUE_PATH=os.path.join(tempfile.mkdtemp(prefix='skillgap_bench_'), 'jobs.sqlite3'),
+    )
+    if not args.cache:
+        # Every request carries a distinct CV, so only near-duplicate matching could still hit
+        env['SEMANTIC_CACHE_ENABLED'] = '0'
+    if args.server_cmd:
+        command = shlex.split(args.server_cmd.format(port=port))
+    else:
+        command = [sys.executable, 'app.py']
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"server exited during startup with code {process.returncode}")
+        try:
+            if httpx.get(f'{base_url}/health', timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise SystemExit(f"server did not answer /health within {args.startup_timeout}s")
+
+
+def run_level(base_url, requests, concurrency, timeout):
+    """Sends prepared requests with a fixed number of concurrent clients.
+
+    Each request is a (method, path, kwargs) tuple. Returns latencies, status counts and wall time.
+    """
+    local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+
+    def send(request):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = httpx.Client(base_url=base_url, timeout=timeout)
+            with clients_lock:
+                clients.append(client)
+        method, path, kwargs = request
+        started = time.perf_counter()
+        try:
+            response = client.request(method, path, **kwargs)
+            response.read()
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(send, requests))
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.close()
+
+    statuses = {}
+    for _, status in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok_latencies = [latency for latency, status in outcomes if status == 200]
+    return {
+        'requests': len(outcomes),
+        'ok': len(ok_latencies),
+        'errors': len(outcomes) - len(ok_latencies),
+        'status_counts': statuses,
+        'seconds': round(elapsed, 3),
+        'rps': round(len(outcomes) / elapsed, 2) if elapsed else None,
+        'latency_ms': summarize_seconds(ok_latencies)
+    }
+
+
+def analyze_requests(scenario, size, number, seeds):
+    """Builds /analyze requests with a distinct CV each, so the result caches never answer."""
+    requests = []
+    for _ in range(number):
+        seed = next(seeds)
+        if scenario == 'text':
+            data = {'cv_text': make_cv_text(size, seed), 'target_role': TARGET_ROLE}
+            requests.append(('POST', '/analyze', {'data': data}))
+        else:
+            filename, content = make_upload(scenario, size, seed)
+            files = {'file': (filename, content, UPLOAD_MIMETYPES[scenario])}
+            requests.append(('POST', '/analyze', {'data': {'target_role': TARGET_ROLE}, 'files': files}))
+    return requests
+
+
+def create_sessions(base_url, size, number, seeds, timeout):
+    """Runs text analyses to get session ids for /download-pdf."""
+    session_ids = []
+    with httpx.Client(base_url=base_url, timeout=timeout) as client:
+        for _ in range(number):
+            response = client.post('/analyze', data={'cv_text': make_cv_text(size, next(seeds)), 'target_role': TARGET_ROLE})
+            if response.status_code == 200:
+                session_ids.append(response.json()['session_id'])
+    return session_ids
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark /analyze and /download-pdf against a fake Groq API.")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help="Comma separated subset of: %(default)s")
+    parser.add_argument('--sizes', default='small,large', help=f"CV sizes to test: {', '.join(CV_SIZES)}")
+    parser.add_argument('--concurrency', default='1,8,32', help="Comma separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=64, help="Requests per scenario, size and level")
+    parser.add_argument('--latency', type=float, default=0.5, help="Fake Groq seconds before the first byte")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Fake Groq latency jitter, in seconds")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0,
+                        help="Fake Groq generation speed (0 = instant)")
+    parser.add_argument('--cache', action='store_true', help="Leave the semantic cache enabled")
+    parser.add_argument('--server-cmd',
+                        help="Command that serves the app on {port}, e.g. \"gunicorn -w 4 -b 127.0.0.1:{port} app:app\"")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per-request client timeout")
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    parser.add_argument('-o', '--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Show the server's log output")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    sizes = [name.strip() for name in args.sizes.split(',') if name.strip()]
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS] + [name for name in sizes if name not in CV_SIZES]
+    if unknown:
+        parser.error(f"unknown scenario or size: {', '.join(unknown)}")
+
+    groq_server, groq_base_url, groq_config = start_fake_groq_server(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second)
+    process, base_url = start_app(args, groq_base_url)
+    seeds = count()
+    results = []
+    try:
+        for scenario in scenarios:
+            for size in sizes:
+                for level in levels:
+                    if scenario == 'download-pdf':
+                        # A fresh session per request, so every download renders once (cold)
+                        session_ids = create_sessions(base_url, size, args.requests, seeds, args.timeout)
+                        requests = [('GET', f'/download-pdf/{session_id}', {}) for session_id in session_ids]
+                    else:
+                        requests = analyze_requests(scenario, size, args.requests, seeds)
+                    result = run_level(base_url, requests, level, args.timeout)
+                    result.update(scenario=scenario, size=size, concurrency=level, peak_rss_mb=peak_rss_mb(process.pid))
+                    results.append(result)
+                    latency = result['latency_ms']
+                    print(
+                        f"{scenario:>12} {size:>6} c={level:<3} {result['rps']:>8} rps  "
+                        f"p50={latency['p50']}ms p95={latency['p95']}ms p99={latency['p99']}ms  "
+                        f"errors={result['errors']} rss={result['peak_rss_mb']}MB",
+                        file=sys.stderr
+                    )
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        groq_server.shutdown()
+
+    config = dict(vars(args), scenarios=scenarios, sizes=sizes, concurrency=levels, groq_requests=groq_config.requests)
+    write_results(args.output, 'load', config, results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
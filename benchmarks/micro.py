@@ -0,0 +1,138 @@
+"""Micro-benchmarks for the hot in-process functions of app.py.
+
+Usage (from the repository root):
+    python -m benchmarks.micro --iterations 50 -o micro.json
+
+Times extract_text_from_pdf, extract_text_from_docx (and its python-docx fallback as a baseline),
+safe_jsonify and the /analyze-batch JSON Lines encoder (each against the previous recursive
+safe_encode + json.dumps path as a baseline) and generate_pdf_report on the synthetic CVs in
+benchmarks/samples.py, for each CV size. No Groq key is needed.
+
+JSON encoding uses orjson when it is installed; run with JSON_BACKEND=json to time the
+standard library backend.
+"""
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.common import summarize_seconds, write_results
+from benchmarks.samples import CV_SIZES, make_cv_text, make_docx, make_pdf
+from fake_groq_server import SAMPLE_ANALYSIS
+
+import app as skillgap
+
+
+def measure(function, iterations, warmup):
+    """Calls function warmup + iterations times and summarizes the timed iterations."""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return dict(summarize_seconds(samples), iterations=iterations,
+                ops_per_second=round(len(samples) / sum(samples), 2) if sum(samples) else None)
+
+
+def legacy_encode(data):
+    """The previous JSON path: rebuild the payload through safe_encode, then json.dumps and encode."""
+    def encode_value(value):
+        if isinstance(value, dict):
+            return {key: encode_value(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [encode_value(item) for item in value]
+        if isinstance(value, str):
+            return skillgap.safe_encode(value)
+        return value
+    return json.dumps(encode_value(data), ensure_ascii=False)
+
+
+def legacy_safe_jsonify(data):
+    return skillgap.app.response_class(response=legacy_encode(data), status=200,
+                                       mimetype='application/json; charset=utf-8')
+
+
+def batch_records(result, count):
+    """/analyze-batch item records as run_batch_analysis() yields them."""
+    return [
+        {'type': 'item', 'document': f'cv_{index}.pdf', 'role': 'Backend Developer', 'status': 'ok',
+         'analysis': SAMPLE_ANALYSIS, 'result': result.to_dict(), 'extract_seconds': 0.01, 'llm_seconds': 0.5}
+        for index in range(count)
+    ]
+
+
+def benchmark_cases(sizes):
+    """Yields (name, size, input bytes, callable) for every micro-benchmark."""
+    result = skillgap.parse_analysis(SAMPLE_ANALYSIS)
+    for size in sizes:
+        text = make_cv_text(size)
+        pdf_bytes = make_pdf(text)
+        docx_bytes = make_docx(text)
+        payload = {
+            'analysis': SAMPLE_ANALYSIS,
+            'result': result.to_dict(),
+            'session_id': 'benchmark',
+            'preprocessing': {'cv_text': text}
+        }
+
+        yield 'extract_text_from_pdf', size, len(pdf_bytes), lambda data=pdf_bytes: skillgap.extract_text_from_pdf(data)
+        yield 'extract_text_from_docx', size, len(docx_bytes), lambda data=docx_bytes: skillgap.extract_text_from_docx(data)
+        # The python-docx engine (the original path, now the fallback) as the baseline for the XML engine
+        yield 'extract_docx_paragraph_text', size, len(docx_bytes), \
+            lambda data=docx_bytes: skillgap.extract_docx_paragraph_text(data)
+
+        def jsonify_payload(payload=payload, function=skillgap.safe_jsonify):
+            with skillgap.app.app_context():
+                function(payload)
+        yield 'safe_jsonify', size, len(text.encode('utf-8')), jsonify_payload
+        yield 'legacy_safe_jsonify', size, len(text.encode('utf-8')), \
+            lambda payload=payload: jsonify_payload(payload, legacy_safe_jsonify)
+
+    # A 50-CV batch stream, new encoder against the previous per-record json.dumps
+    records = batch_records(result, 50)
+    record_bytes = sum(len(json.dumps(record, ensure_ascii=False).encode('utf-8')) for record in records)
+    yield 'iter_json_lines', None, record_bytes, lambda: b''.join(skillgap.iter_json_lines(records))
+    yield 'legacy_json_lines', None, record_bytes, \
+        lambda: ''.join(legacy_encode(record) + "\n" for record in records).encode('utf-8')
+
+    # The report only depends on the analysis, not on the CV, so it is measured once
+    yield 'generate_pdf_report', None, len(SAMPLE_ANALYSIS.encode('utf-8')), \
+        lambda: skillgap.generate_pdf_report(result, 'Backend Developer')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark extraction, JSON encoding and PDF rendering.")
+    parser.add_argument('--sizes', default=','.join(CV_SIZES), help="CV sizes to test: %(default)s")
+    parser.add_argument('--iterations', type=int, default=50, help="Timed calls per benchmark")
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed calls before measuring")
+    parser.add_argument('--only', help="Comma separated benchmark names to run")
+    parser.add_argument('-o', '--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [name.strip() for name in args.sizes.split(',') if name.strip()]
+    unknown = [name for name in sizes if name not in CV_SIZES]
+    if unknown:
+        parser.error(f"unknown size: {', '.join(unknown)}")
+    only = {name.strip() for name in args.only.split(',')} if args.only else None
+
+    results = []
+    for name, size, input_bytes, function in benchmark_cases(sizes):
+        if only and name not in only:
+            continue
+        result = dict(measure(function, args.iterations, args.warmup), name=name, size=size, input_bytes=input_bytes)
+        results.append(result)
+        print(
+            f"{name:>24} {size or '-':>6} {input_bytes:>9}B  mean={result['mean']}ms "
+            f"p50={result['p50']}ms p95={result['p95']}ms p99={result['p99']}ms",
+            file=sys.stderr
+        )
+
+    json_backend = 'orjson' if skillgap.get_orjson() is not None else 'json'
+    write_results(args.output, 'micro', dict(vars(args), sizes=sizes, json_backend=json_backend), results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Synthetic CVs of several sizes as plain text, PDF and DOCX, for the benchmarks."""
+import random
+from io import BytesIO
+
+import docx
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+# Number of job entries per size; each entry is roughly 120 words
+CV_SIZES = {'small': 2, 'medium': 8, 'large': 30}
+
+SKILL_POOL = [
+    'Python', 'SQL', 'Git', 'Flask', 'Django', 'JavaScript', 'React', 'Docker', 'Kubernetes', 'AWS',
+    'PostgreSQL', 'Redis', 'Linux', 'Pandas', 'TensorFlow', 'CI/CD', 'Terraform', 'GraphQL', 'Java', 'Go'
+]
+
+DUTIES = [
+    'Designed and maintained {a} services used by {n} internal teams',
+    'Migrated the reporting pipeline from {a} to {b}, cutting run time by {n}%',
+    'Mentored {n} junior engineers on {a} and code review practices',
+    'Built dashboards on top of {a} and {b} for the operations group',
+    'Automated deployments with {a}, reducing release effort by {n} hours a week',
+    'Investigated production incidents across {a} and {b} services',
+]
+
+
+def make_cv_text(size='medium', seed=0):
+    """Returns a deterministic CV of the given size ('small', 'medium' or 'large')."""
+    rng = random.Random(f"{size}-{seed}")
+    lines = [
+        f"Candidate {seed}",
+        "Software engineer with a focus on backend systems and data tooling.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILL_POOL, 8)),
+        "",
+        "EXPERIENCE",
+    ]
+    for index in range(CV_SIZES[size]):
+        lines.append(f"Engineer at Company {index} ({2010 + index % 14} - {2011 + index % 14})")
+        for duty in rng.sample(DUTIES, 4):
+            a, b = rng.sample(SKILL_POOL, 2)
+            lines.append("- " + duty.format(a=a, b=b, n=rng.randint(2, 40)) + ".")
+        lines.append("")
+    lines += ["EDUCATION", "BSc Computer Science, Example University"]
+    return "\n".join(lines)
+
+
+def make_pdf(text):
+    """Renders the text as a simple PDF and returns its bytes."""
+    buffer = BytesIO()
+    style = getSampleStyleSheet()['Normal']
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build([Paragraph(line or '&nbsp;', style) for line in text.splitlines()])
+    return buffer.getvalue()
+
+
+def make_docx(text):
+    """Writes the text into a DOCX and returns its bytes.
+
+    Like many CV templates, the first line goes in the page header and the line after the
+    SKILLS heading becomes a table grid; everything else is one paragraph per line.
+    """
+    document = docx.Document()
+    lines = text.splitlines()
+    document.sections[0].header.paragraphs[0].text = lines[0]
+    previous = None
+    for line in lines[1:]:
+        if previous == 'SKILLS':
+            skills = [skill.strip() for skill in line.split(',')]
+            table = document.add_table(rows=0, cols=4)
+            for start in range(0, len(skills), 4):
+                row = table.add_row().cells
+                for cell, skill in zip(row, skills[start:start + 4]):
+                    cell.text = skill
+        else:
+            document.add_paragraph(line)
+        previous = line
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_upload(kind, size='medium', seed=0):
+    """Returns (filename, bytes) for a 'txt', 'pdf' or 'docx' CV upload."""
+    text = make_cv_text(size, seed)
+    if kind == 'pdf':
+        return f'cv_{size}_{seed}.pdf', make_pdf(text)
+    if kind == 'docx':
+        return f'cv_{size}_{seed}.docx', make_docx(text)
+    return f'cv_{size}_{seed}.txt', text.encode('utf-8')
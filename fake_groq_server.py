@@ -0,0 +1,213 @@
+"""Local stand-in for the Groq chat completions API.
+
+Point the app at it with GROQ_BASE_URL to test retries, timeouts, hedging and the
+circuit breaker (or to benchmark) without a real API key or network access:
+
+    python fake_groq_server.py --port 8787 --latency 0.5 --fail-rate 0.2 --fail-status 429
+    GROQ_API_KEY=fake GROQ_BASE_URL=http://127.0.0.1:8787 python app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_ANALYSIS = """**MISSING SKILLS:**
+🔴 PRIORITY 1: Docker - Containerizing and shipping services | Learn: YouTube
+🔴 PRIORITY 2: System Design - Designing scalable backends | Learn: Coursera
+🟡 PRIORITY 3: Kubernetes - Orchestrating containers in production | Learn: Udemy
+- CI/CD - Automating builds and deployments | Learn: FreeCodeCamp
+- Cloud Platforms - Deploying to AWS or GCP | Learn: Coursera
+- Testing - Writing reliable unit and integration tests | Learn: Codecademy
+- Observability - Logging, metrics and tracing | Learn: YouTube
+
+**CURRENT SKILLS IDENTIFIED:**
+- Python
+- SQL
+- Git
+- REST APIs
+
+**LEARNING ROADMAP:**
+Step 1: Docker - Every modern deployment starts with containers, about 2 weeks
+Step 2: CI/CD - Teams expect automated pipelines, about 1 week
+Step 3: Testing - Reliable code is a hiring signal, about 2 weeks
+Step 4: Cloud Platforms - Most roles deploy to the cloud, about 3 weeks
+Step 5: System Design - Needed for mid-level interviews, about 4 weeks
+
+**JOB READINESS SCORE:**
+Score: 68/100
+
+**EXPLANATION:**
+The candidate has a solid programming foundation with Python, SQL and APIs. The critical gaps are containerization and deployment, which most teams expect from day one. Closing the first two roadmap steps would make the profile competitive.
+"""
+
+
+class FakeGroqConfig:
+    """Behaviour knobs shared by all request handler threads."""
+
+    def __init__(self, latency=0.0, jitter=0.0, tokens_per_second=0.0, fail_rate=0.0,
+                 fail_status=503, retry_after=None, content=SAMPLE_ANALYSIS):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.content = content
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+
+def estimate_completion_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def make_handler(config):
+    class FakeGroqHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                with config.lock:
+                    self._send_json(200, {'requests': config.requests, 'failures': config.failures})
+            else:
+                self._send_json(404, {'error': {'message': 'Not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not self.path.endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': 'Not found'}})
+                return
+
+            with config.lock:
+                config.requests += 1
+                failing = random.random() < config.fail_rate
+                if failing:
+                    config.failures += 1
+
+            time.sleep(max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)))
+            if failing:
+                headers = {'Retry-After': str(config.retry_after)} if config.retry_after is not None else None
+                self._send_json(config.fail_status, {
+                    'error': {'message': f'Simulated upstream error {config.fail_status}', 'type': 'fake_error'}
+                }, headers)
+                return
+
+            model = request.get('model', 'fake-model')
+            content = config.content
+            max_tokens = request.get('max_tokens')
+            if max_tokens:
+                content = content[:max_tokens * 4]
+            prompt_tokens = sum(estimate_completion_tokens(m.get('content', '')) for m in request.get('messages', []))
+            completion_tokens = estimate_completion_tokens(content)
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            created = int(time.time())
+
+            if request.get('stream'):
+                self._stream(completion_id, created, model, content)
+                return
+
+            if config.tokens_per_second:
+                time.sleep(completion_tokens / config.tokens_per_second)
+            self._send_json(200, {
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content},
+                    'finish_reason': 'stop',
+                    'logprobs': None
+                }],
+                'usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                }
+            })
+
+        def _stream(self, completion_id, created, model, content):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            chunk_size = 16
+            delay = (chunk_size / 4) / config.tokens_per_second if config.tokens_per_second else 0.0
+            for start in range(0, len(content), chunk_size):
+                chunk = {
+                    'id': completion_id,
+                    'object': 'chat.completion.chunk',
+                    'created': created,
+                    'model': model,
+                    'choices': [{'index': 0, 'delta': {'content': content[start:start + chunk_size]}, 'finish_reason': None}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if delay:
+                    time.sleep(delay)
+            final = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]
+            }
+            self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode('utf-8'))
+            self.wfile.flush()
+            self.close_connection = True
+
+    return FakeGroqHandler
+
+
+def start_fake_groq_server(host='127.0.0.1', port=0, **options):
+    """Starts the fake server on a background thread; returns (server, base_url, config)."""
+    config = FakeGroqConfig(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}", config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Groq chat completions API.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds before the first byte")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Uniform +/- jitter on latency, in seconds")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0, help="Simulated generation speed (0 = instant)")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fraction of requests answered with --fail-status")
+    parser.add_argument('--fail-status', type=int, default=503)
+    parser.add_argument('--retry-after', type=float, help="Retry-After header sent with failures")
+    args = parser.parse_args()
+
+    config = FakeGroqConfig(args.latency, args.jitter, args.tokens_per_second,
+                            args.fail_rate, args.fail_status, args.retry_after)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"Fake Groq API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
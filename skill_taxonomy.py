@@ -0,0 +1,350 @@
+"""Skill taxonomy used for local (no-LLM) skill extraction and role matching.
+
+SKILLS maps each canonical skill name to the aliases that identify it in CV text
+(matching is case-insensitive and on word boundaries). Avoid aliases that are common
+English words ("go", "r", "rest", "express"): they would match ordinary prose.
+Only the aliases are matched, so list the canonical name as an alias when it is safe to match.
+
+ROLE_REQUIREMENTS maps each role from the target role dropdown to the skills it needs,
+with a weight: 3 = core, 2 = important, 1 = nice to have.
+"""
+
+SKILLS = {
+    # Programming languages
+    'Python': ['python', 'python3'],
+    'JavaScript': ['javascript', 'js', 'ecmascript', 'es6'],
+    'TypeScript': ['typescript'],
+    'Java': ['java', 'java se', 'java ee', 'j2ee'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    'C': ['c programming', 'ansi c', 'embedded c'],
+    'Go': ['golang', 'go lang', 'go programming'],
+    'Rust': ['rust', 'rustlang'],
+    'Ruby': ['ruby'],
+    'PHP': ['php'],
+    'Kotlin': ['kotlin'],
+    'Swift': ['swift', 'swiftui'],
+    'Dart': ['dart'],
+    'R': ['r programming', 'rstudio', 'r language', 'tidyverse'],
+    'Scala': ['scala'],
+    'MATLAB': ['matlab'],
+    'Bash': ['bash', 'shell scripting', 'shell script', 'zsh'],
+    'SQL': ['sql', 'mysql', 'postgresql', 'postgres', 'sqlite', 't-sql', 'pl/sql', 'sql server', 'mssql'],
+
+    # Web frontend
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3', 'sass', 'scss'],
+    'React': ['react', 'react.js', 'reactjs'],
+    'Angular': ['angular', 'angularjs'],
+    'Vue.js': ['vue', 'vue.js', 'vuejs', 'nuxt'],
+    'Next.js': ['next.js', 'nextjs'],
+    'Redux': ['redux'],
+    'Tailwind CSS': ['tailwind', 'tailwindcss', 'tailwind css'],
+    'Bootstrap': ['bootstrap'],
+    'Responsive Design': ['responsive design', 'responsive web design', 'mobile-first'],
+    'Web Accessibility': ['accessibility', 'wcag', 'a11y', 'aria'],
+    'Webpack': ['webpack', 'vite', 'babel'],
+
+    # Web backend
+    'Node.js': ['node.js', 'nodejs', 'node js'],
+    'Express.js': ['express.js', 'expressjs'],
+    'Django': ['django'],
+    'Flask': ['flask'],
+    'FastAPI': ['fastapi'],
+    'Spring Boot': ['spring boot', 'spring framework', 'spring mvc'],
+    '.NET': ['.net', 'asp.net', 'dotnet', '.net core'],
+    'Ruby on Rails': ['rails', 'ruby on rails'],
+    'Laravel': ['laravel'],
+    'REST APIs': ['restful', 'rest api', 'rest apis', 'restful api', 'restful apis'],
+    'GraphQL': ['graphql'],
+    'Microservices': ['microservices', 'microservice', 'service-oriented architecture', 'soa'],
+    'System Design': ['system design', 'distributed systems', 'scalability', 'software architecture'],
+    'Authentication': ['oauth', 'oauth2', 'jwt', 'authentication', 'sso', 'openid connect'],
+
+    # Databases and data
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'NoSQL': ['nosql', 'cassandra', 'dynamodb', 'couchdb'],
+    'Database Design': ['database design', 'data modeling', 'data modelling', 'normalization', 'schema design'],
+    'Database Administration': ['database administration', 'dba', 'backup and recovery', 'replication', 'query tuning', 'query optimization'],
+    'Oracle Database': ['oracle', 'oracle database', 'oracle db'],
+    'Elasticsearch': ['elasticsearch', 'elastic search', 'opensearch'],
+    'Excel': ['excel', 'microsoft excel', 'ms excel', 'spreadsheets', 'vlookup', 'pivot tables', 'pivot table'],
+    'Power BI': ['power bi', 'powerbi'],
+    'Tableau': ['tableau'],
+    'Data Visualization': ['data visualization', 'data visualisation', 'matplotlib', 'seaborn', 'plotly', 'dashboards', 'dashboarding'],
+    'Statistics': ['statistics', 'statistical analysis', 'hypothesis testing', 'regression analysis', 'a/b testing', 'ab testing'],
+    'Pandas': ['pandas'],
+    'NumPy': ['numpy'],
+    'Data Cleaning': ['data cleaning', 'data wrangling', 'data preprocessing', 'data preparation'],
+    'ETL': ['etl', 'elt', 'data pipelines', 'data pipeline', 'airflow', 'dbt'],
+    'Big Data': ['big data', 'hadoop', 'spark', 'pyspark', 'apache spark', 'hive', 'kafka'],
+    'Data Warehousing': ['data warehouse', 'data warehousing', 'snowflake', 'bigquery', 'redshift'],
+
+    # ML / AI
+    'Machine Learning': ['machine learning', 'ml', 'scikit-learn', 'sklearn', 'supervised learning', 'unsupervised learning'],
+    'Deep Learning': ['deep learning', 'neural networks', 'neural network', 'cnn', 'rnn', 'lstm'],
+    'TensorFlow': ['tensorflow', 'keras'],
+    'PyTorch': ['pytorch', 'torch'],
+    'Natural Language Processing': ['nlp', 'natural language processing', 'spacy', 'nltk', 'text mining'],
+    'Computer Vision': ['computer vision', 'opencv', 'image processing', 'object detection'],
+    'Large Language Models': ['llm', 'llms', 'large language models', 'large language model', 'gpt', 'prompt engineering', 'langchain', 'rag', 'retrieval augmented generation', 'fine-tuning', 'hugging face', 'huggingface', 'transformers'],
+    'MLOps': ['mlops', 'mlflow', 'kubeflow', 'model deployment', 'model serving'],
+    'Feature Engineering': ['feature engineering', 'feature selection'],
+    'Jupyter': ['jupyter', 'jupyter notebook', 'jupyterlab'],
+
+    # DevOps / Cloud
+    'Git': ['git', 'github', 'gitlab', 'bitbucket', 'version control'],
+    'Docker': ['docker', 'containers', 'containerization', 'docker compose', 'docker-compose'],
+    'Kubernetes': ['kubernetes', 'k8s', 'helm', 'openshift'],
+    'CI/CD': ['ci/cd', 'ci cd', 'continuous integration', 'continuous delivery', 'continuous deployment', 'jenkins', 'github actions', 'gitlab ci', 'circleci', 'travis ci'],
+    'AWS': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'cloudformation'],
+    'Azure': ['azure', 'microsoft azure'],
+    'Google Cloud': ['gcp', 'google cloud', 'google cloud platform'],
+    'Terraform': ['terraform', 'infrastructure as code', 'iac', 'pulumi'],
+    'Ansible': ['ansible', 'puppet', 'configuration management'],
+    'Linux': ['linux', 'unix', 'ubuntu', 'centos', 'red hat', 'rhel', 'debian'],
+    'Networking': ['networking', 'tcp/ip', 'dns', 'http', 'load balancing', 'vpn', 'subnetting', 'routing'],
+    'Monitoring': ['monitoring', 'observability', 'prometheus', 'grafana', 'datadog', 'new relic', 'elk stack', 'logging'],
+    'Serverless': ['serverless', 'aws lambda', 'cloud functions', 'azure functions'],
+    'Cloud Architecture': ['cloud architecture', 'solutions architecture', 'cloud computing', 'cloud migration'],
+
+    # Security
+    'Network Security': ['network security', 'firewalls', 'firewall', 'ids/ips', 'intrusion detection'],
+    'SIEM': ['siem', 'splunk', 'qradar', 'security information and event management'],
+    'Penetration Testing': ['penetration testing', 'pentesting', 'pen testing', 'ethical hacking', 'metasploit', 'burp suite', 'kali linux'],
+    'Vulnerability Assessment': ['vulnerability assessment', 'vulnerability management', 'nessus', 'vulnerability scanning'],
+    'Incident Response': ['incident response', 'digital forensics', 'threat hunting', 'soc'],
+    'Cryptography': ['cryptography', 'encryption', 'pki', 'tls', 'ssl'],
+    'Security Frameworks': ['nist', 'iso 27001', 'owasp', 'mitre att&ck', 'cis controls', 'gdpr', 'hipaa', 'pci dss', 'soc 2'],
+    'Identity and Access Management': ['iam', 'identity and access management', 'active directory', 'ldap', 'okta'],
+
+    # Mobile
+    'Android Development': ['android', 'android studio', 'android sdk', 'jetpack compose'],
+    'iOS Development': ['ios', 'xcode', 'uikit', 'cocoapods'],
+    'React Native': ['react native', 'react-native'],
+    'Flutter': ['flutter'],
+    'Mobile UI Design': ['mobile ui', 'material design', 'human interface guidelines'],
+    'App Store Deployment': ['app store', 'google play', 'play store', 'testflight'],
+
+    # QA
+    'Manual Testing': ['manual testing', 'test cases', 'test case design', 'test plans', 'regression testing', 'exploratory testing'],
+    'Test Automation': ['test automation', 'automated testing', 'automation testing', 'selenium', 'cypress', 'playwright', 'appium', 'webdriver'],
+    'Unit Testing': ['unit testing', 'unit tests', 'pytest', 'junit', 'jest', 'mocha', 'tdd', 'test-driven development', 'unittest'],
+    'API Testing': ['api testing', 'postman', 'rest assured', 'soapui'],
+    'Performance Testing': ['performance testing', 'load testing', 'jmeter', 'locust', 'gatling', 'stress testing'],
+    'Bug Tracking': ['bug tracking', 'defect tracking', 'bugzilla', 'defect management'],
+
+    # Design
+    'Figma': ['figma'],
+    'Adobe XD': ['adobe xd'],
+    'Sketch': ['sketch app', 'sketch.app'],
+    'Adobe Creative Suite': ['photoshop', 'illustrator', 'adobe creative suite', 'indesign', 'after effects', 'adobe creative cloud'],
+    'Wireframing': ['wireframing', 'wireframes', 'wireframe', 'balsamiq'],
+    'Prototyping': ['prototyping', 'prototypes', 'interactive prototypes', 'invision'],
+    'User Research': ['user research', 'usability testing', 'user interviews', 'personas', 'user testing', 'ux research'],
+    'Information Architecture': ['information architecture', 'card sorting', 'user flows', 'user flow', 'sitemaps'],
+    'Interaction Design': ['interaction design', 'microinteractions', 'ixd'],
+    'Visual Design': ['visual design', 'typography', 'color theory', 'layout design', 'graphic design'],
+    'Design Systems': ['design systems', 'design system', 'component library', 'style guide', 'style guides'],
+    'Design Thinking': ['design thinking', 'human-centered design', 'user-centered design'],
+
+    # Product / project / business
+    'Product Management': ['product management', 'product manager', 'product lifecycle', 'product strategy'],
+    'Product Roadmapping': ['product roadmap', 'roadmapping', 'roadmaps'],
+    'Agile': ['agile', 'scrum', 'kanban', 'sprint planning', 'scrum master'],
+    'Jira': ['jira', 'confluence', 'trello', 'asana', 'monday.com'],
+    'Project Management': ['project management', 'project planning', 'project manager', 'pmp', 'prince2', 'ms project', 'microsoft project'],
+    'Risk Management': ['risk management', 'risk assessment', 'risk analysis', 'risk mitigation'],
+    'Budgeting': ['budgeting', 'budget management', 'cost control', 'forecasting budgets'],
+    'Stakeholder Management': ['stakeholder management', 'stakeholder engagement', 'stakeholder communication', 'stakeholders'],
+    'Requirements Gathering': ['requirements gathering', 'requirements analysis', 'requirements elicitation', 'user stories', 'brd', 'functional requirements'],
+    'Business Process Modeling': ['business process modeling', 'process mapping', 'bpmn', 'process improvement', 'uml'],
+    'Market Research': ['market research', 'competitive analysis', 'competitor analysis', 'market analysis'],
+    'Product Analytics': ['product analytics', 'mixpanel', 'amplitude', 'kpis', 'okrs'],
+    'Lean Six Sigma': ['six sigma', 'lean six sigma', 'kaizen'],
+
+    # Marketing
+    'Digital Marketing': ['digital marketing', 'online marketing', 'growth marketing'],
+    'SEO': ['seo', 'search engine optimization', 'keyword research'],
+    'SEM': ['sem', 'google ads', 'ppc', 'pay-per-click', 'adwords', 'paid search'],
+    'Social Media Marketing': ['social media marketing', 'social media', 'facebook ads', 'instagram', 'linkedin ads', 'tiktok'],
+    'Content Marketing': ['content marketing', 'content strategy', 'copywriting', 'content creation', 'blogging'],
+    'Email Marketing': ['email marketing', 'mailchimp', 'email campaigns', 'marketing automation', 'hubspot'],
+    'Google Analytics': ['google analytics', 'ga4', 'google tag manager', 'web analytics'],
+    'Brand Management': ['brand management', 'branding', 'brand strategy'],
+    'Campaign Management': ['campaign management', 'marketing campaigns', 'campaign planning'],
+    'CRM': ['crm', 'salesforce', 'zoho crm', 'customer relationship management'],
+
+    # HR
+    'Recruitment': ['recruitment', 'recruiting', 'talent acquisition', 'sourcing', 'headhunting', 'interviewing'],
+    'Employee Relations': ['employee relations', 'conflict resolution', 'grievance handling', 'employee engagement'],
+    'Performance Management': ['performance management', 'performance appraisal', 'performance reviews', 'appraisals'],
+    'HR Information Systems': ['hris', 'workday', 'sap successfactors', 'bamboohr', 'hr software'],
+    'Payroll': ['payroll', 'payroll management', 'compensation and benefits', 'compensation', 'benefits administration'],
+    'Labor Law': ['labor law', 'labour law', 'employment law', 'labour compliance'],
+    'Onboarding': ['onboarding', 'employee onboarding', 'induction'],
+    'Training and Development': ['training and development', 'learning and development', 'l&d', 'employee training'],
+
+    # Finance
+    'Financial Modeling': ['financial modeling', 'financial modelling', 'dcf', 'discounted cash flow', 'valuation'],
+    'Financial Analysis': ['financial analysis', 'financial statements', 'ratio analysis', 'variance analysis'],
+    'Accounting': ['accounting', 'gaap', 'ifrs', 'bookkeeping', 'general ledger', 'reconciliation'],
+    'Forecasting': ['forecasting', 'financial forecasting', 'budget forecasting', 'fp&a'],
+    'Financial Reporting': ['financial reporting', 'management reporting', 'month-end close'],
+    'ERP Systems': ['erp', 'sap', 'oracle financials', 'quickbooks', 'netsuite', 'tally'],
+    'Investment Analysis': ['investment analysis', 'portfolio management', 'equity research', 'capital markets'],
+    'CFA': ['cfa', 'chartered financial analyst'],
+
+    # Civil engineering
+    'AutoCAD': ['autocad', 'auto cad', 'cad'],
+    'Civil 3D': ['civil 3d', 'autocad civil 3d'],
+    'Revit': ['revit', 'bim', 'building information modeling'],
+    'Structural Analysis': ['structural analysis', 'structural design', 'staad pro', 'staad.pro', 'etabs', 'sap2000', 'finite element analysis', 'fea'],
+    'Construction Management': ['construction management', 'site supervision', 'site management', 'construction planning'],
+    'Surveying': ['surveying', 'land surveying', 'total station', 'gis', 'arcgis'],
+    'Geotechnical Engineering': ['geotechnical', 'soil mechanics', 'foundation design'],
+    'Building Codes': ['building codes', 'eurocode', 'aci code', 'ibc', 'building regulations'],
+    'Quantity Surveying': ['quantity surveying', 'cost estimation', 'estimating', 'bill of quantities', 'boq'],
+    'Primavera': ['primavera', 'primavera p6', 'p6'],
+
+    # Mechanical engineering
+    'SolidWorks': ['solidworks', 'solid works'],
+    'CATIA': ['catia'],
+    'ANSYS': ['ansys', 'ansys fluent', 'abaqus'],
+    'CFD': ['cfd', 'computational fluid dynamics'],
+    'Thermodynamics': ['thermodynamics', 'heat transfer', 'hvac'],
+    'GD&T': ['gd&t', 'geometric dimensioning and tolerancing', 'tolerance analysis'],
+    'Manufacturing Processes': ['manufacturing processes', 'cnc', 'machining', 'injection molding', 'sheet metal', 'lean manufacturing'],
+    'Mechanical Design': ['mechanical design', 'machine design', 'product design', '3d modeling', '3d modelling'],
+    'Inventor': ['autodesk inventor', 'inventor', 'fusion 360', 'creo', 'nx'],
+
+    # Soft skills
+    'Communication': ['communication', 'communication skills', 'presentation skills', 'public speaking', 'presentations'],
+    'Teamwork': ['teamwork', 'team player', 'collaboration', 'cross-functional'],
+    'Leadership': ['leadership', 'team lead', 'team leadership', 'mentoring', 'mentorship', 'people management'],
+    'Problem Solving': ['problem solving', 'problem-solving', 'analytical skills', 'critical thinking', 'troubleshooting'],
+    'Time Management': ['time management', 'prioritization', 'multitasking', 'organizational skills'],
+    'Negotiation': ['negotiation', 'negotiating'],
+}
+
+ROLE_REQUIREMENTS = {
+    'General Professional Role': {
+        'Communication': 3, 'Teamwork': 3, 'Problem Solving': 3, 'Time Management': 2,
+        'Excel': 2, 'Leadership': 1, 'Project Management': 1,
+    },
+    'Software Engineer': {
+        'Python': 2, 'Java': 2, 'JavaScript': 2, 'Git': 3, 'SQL': 2, 'System Design': 3,
+        'Unit Testing': 2, 'REST APIs': 2, 'Linux': 1, 'Docker': 2, 'CI/CD': 1, 'Agile': 1,
+        'Problem Solving': 2,
+    },
+    'Frontend Developer': {
+        'HTML': 3, 'CSS': 3, 'JavaScript': 3, 'TypeScript': 2, 'React': 3, 'Responsive Design': 2,
+        'Git': 2, 'Web Accessibility': 1, 'Webpack': 1, 'Unit Testing': 1, 'REST APIs': 2, 'Redux': 1,
+    },
+    'Backend Developer': {
+        'Python': 2, 'Java': 2, 'Node.js': 2, 'SQL': 3, 'REST APIs': 3, 'Database Design': 2,
+        'Git': 2, 'Docker': 2, 'Authentication': 2, 'Microservices': 1, 'Redis': 1, 'Unit Testing': 2,
+        'System Design': 2, 'Linux': 1,
+    },
+    'Full Stack Developer': {
+        'HTML': 2, 'CSS': 2, 'JavaScript': 3, 'React': 2, 'Node.js': 2, 'SQL': 2, 'REST APIs': 3,
+        'Git': 2, 'Docker': 1, 'MongoDB': 1, 'TypeScript': 1, 'Authentication': 1, 'Unit Testing': 1,
+    },
+    'Data Scientist': {
+        'Python': 3, 'Statistics': 3, 'Machine Learning': 3, 'SQL': 2, 'Pandas': 2, 'NumPy': 2,
+        'Data Visualization': 2, 'Feature Engineering': 2, 'Deep Learning': 1, 'Jupyter': 1,
+        'Data Cleaning': 2, 'Big Data': 1, 'R': 1,
+    },
+    'Data Analyst': {
+        'SQL': 3, 'Excel': 3, 'Data Visualization': 3, 'Statistics': 2, 'Python': 2, 'Power BI': 2,
+        'Tableau': 2, 'Data Cleaning': 2, 'Pandas': 1, 'Communication': 2, 'R': 1,
+    },
+    'Machine Learning Engineer': {
+        'Python': 3, 'Machine Learning': 3, 'Deep Learning': 2, 'TensorFlow': 2, 'PyTorch': 2,
+        'MLOps': 3, 'Docker': 2, 'SQL': 1, 'Statistics': 2, 'Big Data': 1, 'Feature Engineering': 2,
+        'Git': 1, 'Cloud Architecture': 1,
+    },
+    'AI Engineer': {
+        'Python': 3, 'Large Language Models': 3, 'Machine Learning': 2, 'Deep Learning': 2,
+        'PyTorch': 2, 'Natural Language Processing': 2, 'REST APIs': 2, 'Docker': 1, 'MLOps': 2,
+        'Computer Vision': 1, 'Git': 1, 'Cloud Architecture': 1,
+    },
+    'DevOps Engineer': {
+        'Linux': 3, 'Docker': 3, 'Kubernetes': 3, 'CI/CD': 3, 'Terraform': 2, 'AWS': 2, 'Bash': 2,
+        'Monitoring': 2, 'Git': 2, 'Ansible': 1, 'Networking': 1, 'Python': 1,
+    },
+    'Cloud Engineer': {
+        'AWS': 3, 'Azure': 2, 'Google Cloud': 2, 'Terraform': 3, 'Cloud Architecture': 3, 'Linux': 2,
+        'Networking': 2, 'Docker': 2, 'Kubernetes': 2, 'Serverless': 1, 'Identity and Access Management': 2,
+        'Monitoring': 1, 'Python': 1,
+    },
+    'Cybersecurity Analyst': {
+        'Network Security': 3, 'SIEM': 3, 'Incident Response': 3, 'Vulnerability Assessment': 2,
+        'Security Frameworks': 2, 'Linux': 2, 'Networking': 2, 'Penetration Testing': 1, 'Cryptography': 1,
+        'Identity and Access Management': 1, 'Python': 1,
+    },
+    'Mobile Developer': {
+        'Android Development': 2, 'iOS Development': 2, 'Kotlin': 2, 'Swift': 2, 'Flutter': 2,
+        'React Native': 2, 'REST APIs': 2, 'Git': 2, 'Mobile UI Design': 1, 'App Store Deployment': 1,
+        'Unit Testing': 1,
+    },
+    'Web Developer': {
+        'HTML': 3, 'CSS': 3, 'JavaScript': 3, 'Responsive Design': 2, 'PHP': 1, 'React': 2, 'Git': 2,
+        'SQL': 1, 'SEO': 1, 'Web Accessibility': 1, 'REST APIs': 1,
+    },
+    'QA Engineer': {
+        'Manual Testing': 3, 'Test Automation': 3, 'API Testing': 2, 'Bug Tracking': 2, 'Unit Testing': 1,
+        'Performance Testing': 1, 'SQL': 1, 'Jira': 2, 'Agile': 1, 'Python': 1, 'Java': 1, 'CI/CD': 1,
+    },
+    'Database Administrator': {
+        'SQL': 3, 'Database Administration': 3, 'Database Design': 2, 'Oracle Database': 2, 'Linux': 2,
+        'NoSQL': 1, 'Bash': 1, 'Monitoring': 1, 'Cloud Architecture': 1, 'Identity and Access Management': 1,
+    },
+    'Product Manager': {
+        'Product Management': 3, 'Product Roadmapping': 3, 'Agile': 2, 'Stakeholder Management': 3,
+        'Market Research': 2, 'Product Analytics': 2, 'Requirements Gathering': 2, 'Jira': 1,
+        'Communication': 2, 'User Research': 1, 'SQL': 1,
+    },
+    'UX Designer': {
+        'User Research': 3, 'Wireframing': 3, 'Prototyping': 3, 'Figma': 3, 'Information Architecture': 2,
+        'Interaction Design': 2, 'Design Thinking': 2, 'Web Accessibility': 1, 'Design Systems': 1,
+        'Adobe XD': 1, 'Communication': 1,
+    },
+    'UI Designer': {
+        'Visual Design': 3, 'Figma': 3, 'Design Systems': 3, 'Prototyping': 2, 'Adobe Creative Suite': 2,
+        'Responsive Design': 2, 'Interaction Design': 1, 'Sketch': 1, 'Web Accessibility': 1, 'HTML': 1, 'CSS': 1,
+    },
+    'Marketing Manager': {
+        'Digital Marketing': 3, 'Campaign Management': 3, 'SEO': 2, 'SEM': 2, 'Social Media Marketing': 2,
+        'Content Marketing': 2, 'Google Analytics': 2, 'Brand Management': 2, 'Email Marketing': 1, 'CRM': 1,
+        'Leadership': 1, 'Budgeting': 1,
+    },
+    'HR Manager': {
+        'Recruitment': 3, 'Employee Relations': 3, 'Performance Management': 2, 'Labor Law': 2,
+        'HR Information Systems': 2, 'Payroll': 2, 'Onboarding': 1, 'Training and Development': 2,
+        'Communication': 2, 'Leadership': 1, 'Negotiation': 1,
+    },
+    'Finance Analyst': {
+        'Financial Modeling': 3, 'Financial Analysis': 3, 'Excel': 3, 'Forecasting': 2, 'Accounting': 2,
+        'Financial Reporting': 2, 'ERP Systems': 1, 'SQL': 1, 'Power BI': 1, 'Investment Analysis': 1, 'CFA': 1,
+    },
+    'Project Manager': {
+        'Project Management': 3, 'Agile': 2, 'Risk Management': 2, 'Stakeholder Management': 3, 'Budgeting': 2,
+        'Jira': 2, 'Communication': 2, 'Leadership': 2, 'Time Management': 1, 'Primavera': 1, 'Negotiation': 1,
+    },
+    'Business Analyst': {
+        'Requirements Gathering': 3, 'Business Process Modeling': 3, 'SQL': 2, 'Excel': 2,
+        'Stakeholder Management': 2, 'Data Visualization': 2, 'Agile': 1, 'Jira': 1, 'Power BI': 1,
+        'Communication': 2, 'Product Analytics': 1,
+    },
+    'Civil Engineer': {
+        'AutoCAD': 3, 'Structural Analysis': 3, 'Construction Management': 2, 'Civil 3D': 2, 'Revit': 2,
+        'Surveying': 2, 'Geotechnical Engineering': 1, 'Building Codes': 2, 'Quantity Surveying': 1,
+        'Primavera': 1, 'Project Management': 1,
+    },
+    'Mechanical Engineer': {
+        'SolidWorks': 3, 'AutoCAD': 2, 'Mechanical Design': 3, 'ANSYS': 2, 'Thermodynamics': 2,
+        'Manufacturing Processes': 2, 'GD&T': 2, 'CATIA': 1, 'CFD': 1, 'MATLAB': 1, 'Inventor': 1,
+    },
+}
@@ -0,0 +1,5 @@
+"""Infrastructure used by the SkillGap Flask app: caches, job queue, worker pools and metrics.
+
+The route handlers, prompts and report rendering stay in app.py, which builds the shared
+instances of these classes from its settings.
+"""
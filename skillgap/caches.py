@@ -0,0 +1,536 @@
+"""Caches for analyses, sessions and rendered reports, with an optional SQLite backend shared between processes."""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from skillgap.serialization import decode_json, encode_json, safe_encode
+
+
+# Purpose: Shared on-disk key/value store so several worker processes can reuse each other's results
+# Functionality:
+#   - Stores text values in a SQLite table together with an absolute expiry timestamp
+#   - Opens a short-lived connection per call so it is safe to use from any thread or process
+#   - Uses WAL journaling so readers in other workers are not blocked by writers
+#   - Treats expired rows as missing and deletes them lazily on read
+#   - Swallows database errors (logs a warning) so a broken cache never breaks an analysis
+# Used by: AnalysisResultCache and ExtractedTextCache as their optional second-level backend
+class SQLiteCacheBackend:
+    """Minimal SQLite-backed key/value store with per-entry expiry, shared between processes."""
+
+    def __init__(self, path, table='cache'):
+        self.path = path
+        self.table = table
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self):
+        # sqlite3's own context manager only commits or rolls back; the connection is closed here
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= time.time():
+                    conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                    return None
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"Warning: cache backend read failed: {e}")
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, value, time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: cache backend write failed: {e}")
+
+    def delete(self, key):
+        try:
+            with self._connect() as conn:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            print(f"Warning: cache backend delete failed: {e}")
+
+    def purge_expired(self):
+        try:
+            with self._connect() as conn:
+                conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+        except sqlite3.Error as e:
+            print(f"Warning: cache backend purge failed: {e}")
+
+
+# Purpose: Content-addressed cache of finished AI analyses so re-submissions skip the Groq round trip
+# Functionality:
+#   - Keeps the most recently used results in an in-process LRU (OrderedDict) bounded by entry count
+#   - Expires entries after a fixed TTL so results do not outlive prompt/model tweaks for long
+#   - Falls back to an optional shared backend (SQLiteCacheBackend) on local misses and promotes hits
+#   - Counts local hits, backend hits and misses so the savings can be inspected via /stats
+#   - Guards all in-memory state with a lock because Flask may serve requests from several threads
+# Used by: analyze_cv_with_groq() to look up and store results keyed by make_analysis_cache_key()
+class AnalysisResultCache:
+    """Size- and TTL-bounded LRU cache for analysis results with an optional shared backend."""
+
+    def __init__(self, max_entries=256, ttl=3600, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                with self._lock:
+                    self.backend_hits += 1
+                    self._store_local(key, value, now)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._store_local(key, value, time.time())
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl)
+
+    def _store_local(self, key, value, now):
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.backend_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'backend': type(self.backend).__name__ if self.backend is not None else None,
+                'hits': self.hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.backend_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# Purpose: Bounded, expiring store for finished analyses so /download-pdf can find them later
+# Functionality:
+#   - Serializes each session dict to JSON and zlib-compresses it to keep entries compact
+#   - Evicts least recently used sessions once max_entries or max_bytes (compressed size) is exceeded
+#   - Expires sessions after a TTL so memory does not grow without limit under sustained traffic;
+#     expired entries are popped from the LRU front on each store, so a put stays O(1) amortized
+#   - Writes through to an optional shared backend (SQLiteCacheBackend) and reads from it on local
+#     misses, so any worker can resolve a session_id created by another worker
+#   - Tracks hits, misses, evictions and expirations for the /stats endpoint
+# Used by: /analyze to save results and /download-pdf to look them up by session_id
+class SessionStore:
+    """LRU session store bounded by entry count and bytes, with TTL expiry and compressed entries."""
+
+    def __init__(self, max_entries=1000, max_bytes=32 * 1024 * 1024, ttl=7200, backend=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _pack(data):
+        return zlib.compress(encode_json(data))
+
+    @staticmethod
+    def _unpack(blob):
+        return decode_json(zlib.decompress(blob))
+
+    def put(self, session_id, data):
+        blob = self._pack(data)
+        with self._lock:
+            self._store_local(session_id, blob, time.time() + self.ttl)
+        if self.backend is not None:
+            self.backend.set(session_id, blob, self.ttl)
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                expires_at, blob = entry
+                if expires_at > now:
+                    self._entries.move_to_end(session_id)
+                    self.hits += 1
+                    return self._unpack(blob)
+                self._remove_local(session_id)
+                self.expirations += 1
+
+        if self.backend is not None:
+            blob = self.backend.get(session_id)
+            if blob is not None:
+                with self._lock:
+                    self.backend_hits += 1
+                    self._store_local(session_id, blob, now + self.ttl)
+                return self._unpack(blob)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def update(self, session_id, **fields):
+        data = self.get(session_id)
+        if data is None:
+            return False
+        data.update(fields)
+        self.put(session_id, data)
+        return True
+
+    def delete(self, session_id):
+        with self._lock:
+            if session_id in self._entries:
+                self._remove_local(session_id)
+        if self.backend is not None:
+            self.backend.delete(session_id)
+
+    def _store_local(self, session_id, blob, expires_at):
+        if session_id in self._entries:
+            self._remove_local(session_id)
+        self._entries[session_id] = (expires_at, blob)
+        self._bytes += len(blob)
+        now = time.time()
+        # Expire lazily from the least recently used end instead of scanning every entry; an expired
+        # session behind a live one is dropped when it is read or reaches the front
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if self._entries[oldest][0] > now:
+                break
+            self._remove_local(oldest)
+            self.expirations += 1
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove_local(oldest)
+            self.evictions += 1
+
+    def _remove_local(self, session_id):
+        _, blob = self._entries.pop(session_id)
+        self._bytes -= len(blob)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'backend': type(self.backend).__name__ if self.backend is not None else None,
+                'hits': self.hits,
+                'backend_hits': self.backend_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+# Purpose: Keep recently produced binary payloads (PDF reports, extracted text) in memory
+# Functionality:
+#   - LRU of bytes values bounded by their total size (max_bytes)
+#   - Ignores single values larger than the whole budget
+#   - Thread-safe; counts hits, misses and evictions for /stats
+# Used by: rendered_report_cache for /download-pdf and ExtractedTextCache for uploads
+class ByteBoundedLRUCache:
+    """LRU cache of bytes values bounded by total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+SEMANTIC_SHINGLE_WORDS = 3
+SEMANTIC_WORD_PATTERN = re.compile(r'\w+')
+SEMANTIC_SIGNATURE_BANDS = 8
+SEMANTIC_SIGNATURE_BAND_BITS = 8
+
+
+# Purpose: Cheap local embedding of a CV for near-duplicate detection
+# Functionality:
+#   - Counts overlapping 3-word shingles of the case-folded words, so a fixed typo or one added
+#     bullet only changes a few features while different people's CVs share almost none
+#     (character n-grams score unrelated CVs as similar because they share vocabulary)
+#   - Hashes each distinct shingle to 64 bits and builds an L2-normalized binary sparse vector
+#     {hash: weight}, so repeated boilerplate does not dominate the similarity
+#   - Also builds a 64-bit SimHash signature (random-hyperplane LSH) from the same hashes;
+#     vectors with high cosine similarity agree on most signature bits
+#   - Returns (vector, signature)
+# Used by: SemanticAnalysisCache lookups and inserts
+def embed_cv_text(cv_text):
+    """Returns (sparse L2-normalized n-gram vector, 64-bit SimHash signature) for CV text."""
+    words = SEMANTIC_WORD_PATTERN.findall(safe_encode(cv_text).casefold())
+    shingles = {' '.join(words[start:start + SEMANTIC_SHINGLE_WORDS])
+                for start in range(max(1, len(words) - SEMANTIC_SHINGLE_WORDS + 1))}
+    features = {int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+                for shingle in shingles}
+
+    weight = 1.0 / (len(features) ** 0.5 or 1.0)
+    bit_counts = [0] * 64
+    for feature in features:
+        for bit in range(64):
+            if (feature >> bit) & 1:
+                bit_counts[bit] += 1
+    signature = sum(1 << bit for bit, count in enumerate(bit_counts) if 2 * count > len(features))
+    return dict.fromkeys(features, weight), signature
+
+
+def cosine_similarity(left, right):
+    """Returns the dot product of two L2-normalized sparse vectors."""
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(weight * right.get(feature, 0.0) for feature, weight in left.items())
+
+
+# Purpose: Reuse an earlier analysis when the same person resubmits an almost identical CV
+# Functionality:
+#   - Keeps analyses with their CV embedding (embed_cv_text()), grouped by scope (model and output format) and normalized target role
+#   - Approximate nearest-neighbour index: the 64-bit SimHash is cut into bands and each band value
+#     is a bucket key per role, so a lookup only compares against CVs sharing at least one band
+#   - Candidates are checked with exact cosine similarity; the best one at or above the threshold wins
+#   - Bounded by max_entries with least-recently-used eviction, and by the analysis cache TTL
+#   - Thread-safe; counts hits, misses and compared candidates for /stats
+# Used by: lookup_cached_analysis() and store_cached_analysis() after an exact-key cache miss
+class SemanticAnalysisCache:
+    """LSH-indexed, per-role cache of analyses keyed by CV similarity."""
+
+    def __init__(self, max_entries=512, threshold=0.95, ttl=3600):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.candidates_checked = 0
+
+    @staticmethod
+    def _bands(signature):
+        mask = (1 << SEMANTIC_SIGNATURE_BAND_BITS) - 1
+        return [(band, (signature >> (band * SEMANTIC_SIGNATURE_BAND_BITS)) & mask) for band in range(SEMANTIC_SIGNATURE_BANDS)]
+
+    @staticmethod
+    def _role_key(target_role, scope):
+        return scope, ' '.join(safe_encode(target_role).split()).casefold()
+
+    def get(self, embedding, target_role, scope=''):
+        """Returns (analysis, similarity) for the closest earlier CV above the threshold, or None."""
+        vector, signature = embedding
+        role = self._role_key(target_role, scope)
+        now = time.time()
+        with self._lock:
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self._buckets.get((role, band), ()))
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if entry['expires_at'] <= now:
+                    continue
+                similarity = cosine_similarity(vector, entry['vector'])
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            self.candidates_checked += len(candidates)
+            if best_id is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id]['analysis'], round(best_similarity, 4)
+
+    def add(self, embedding, target_role, analysis, scope=''):
+        vector, signature = embedding
+        role = self._role_key(target_role, scope)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                'role': role,
+                'vector': vector,
+                'signature': signature,
+                'analysis': analysis,
+                'expires_at': time.time() + self.ttl
+            }
+            for band in self._bands(signature):
+                self._buckets.setdefault((role, band), set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        entry_id, entry = self._entries.popitem(last=False)
+        for band in self._bands(entry['signature']):
+            bucket = self._buckets.get((entry['role'], band))
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[(entry['role'], band)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'threshold': self.threshold,
+                'roles': len({entry['role'] for entry in self._entries.values()}),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'avg_candidates': round(self.candidates_checked / lookups, 2) if lookups else 0.0
+            }
+
+
+# Purpose: Content-addressed cache of text extracted from uploaded files
+# Functionality:
+#   - First level: ByteBoundedLRUCache of UTF-8 encoded text, bounded by EXTRACTION_CACHE_MAX_BYTES
+#   - Optional second level: SQLiteCacheBackend shared by worker processes and kept across restarts;
+#     backend hits are copied into memory
+#   - get() returns (text, 'hit' | 'backend_hit') or (None, None); counts backend hits for /stats
+#     under a lock, since uploads are extracted from several request threads at once
+# Used by: extract_text_cached()
+class ExtractedTextCache:
+    """Two-level cache of extracted document text keyed by content hash."""
+
+    def __init__(self, max_bytes, ttl, backend=None):
+        self.memory = ByteBoundedLRUCache(max_bytes)
+        self.ttl = ttl
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.backend_hits = 0
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            return value.decode('utf-8'), 'hit'
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                with self._lock:
+                    self.backend_hits += 1
+                self.memory.set(key, bytes(value))
+                return bytes(value).decode('utf-8'), 'backend_hit'
+        return None, None
+
+    def set(self, key, text):
+        value = text.encode('utf-8')
+        self.memory.set(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl)
+
+    def stats(self):
+        counters = self.memory.stats()
+        with self._lock:
+            backend_hits = self.backend_hits
+        # Backend hits first missed in memory; report them only once
+        counters['misses'] -= backend_hits
+        counters.update(
+            backend=type(self.backend).__name__ if self.backend is not None else None,
+            backend_hits=backend_hits
+        )
+        return counters
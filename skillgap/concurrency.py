@@ -0,0 +1,243 @@
+"""Admission control, request coalescing and the shared asyncio loop."""
+import asyncio
+import atexit
+import threading
+
+
+# Purpose: Signal that the server has no free analysis slot and the client should retry later
+# Functionality:
+#   - Carries the number of seconds to send back in the Retry-After header
+# Used by: ConcurrencyLimiter.acquire() and the /analyze route (converted to HTTP 503)
+class ServerBusyError(Exception):
+    """Raised when the analysis wait queue is full or a queued request waited too long."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Purpose: Protect worker threads by bounding how many analyses run and wait at the same time
+# Functionality:
+#   - Allows at most max_concurrent analyses to call Groq simultaneously
+#   - Lets up to max_queue further requests wait (up to queue_timeout seconds) for a free slot
+#   - Rejects immediately with ServerBusyError once the wait queue is full, so overload turns
+#     into fast 503 responses instead of piling up blocked workers
+#   - Counts in-flight, waiting, admitted and rejected requests for /stats
+# Used by: /analyze (normal and streaming mode) around the LLM call
+class ConcurrencyLimiter:
+    """Semaphore with a bounded wait queue that fails fast when the queue is full."""
+
+    def __init__(self, max_concurrent=32, max_queue=64, queue_timeout=30.0, retry_after=5):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def acquire(self):
+        with self._condition:
+            if self.in_flight < self.max_concurrent and self.waiting == 0:
+                self.in_flight += 1
+                self.admitted += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ServerBusyError('Server is busy. Please try again shortly.', self.retry_after)
+            self.waiting += 1
+            try:
+                admitted = self._condition.wait_for(
+                    lambda: self.in_flight < self.max_concurrent, timeout=self.queue_timeout
+                )
+            finally:
+                self.waiting -= 1
+            if not admitted:
+                self.rejected += 1
+                raise ServerBusyError('Server is busy. Please try again shortly.', self.retry_after)
+            self.in_flight += 1
+            self.admitted += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def stats(self):
+        with self._condition:
+            return {
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'rejected': self.rejected
+            }
+
+
+class FlightAbandoned(RuntimeError):
+    """The leading call stopped without a result; waiters should retry themselves."""
+
+
+class FlightCall:
+    """One in-flight call whose outcome is shared by every caller waiting on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def result(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+# Purpose: Let identical analyses that run at the same time share one Groq call
+# Functionality:
+#   - begin(key) makes the first caller for a key the leader; later callers for the same key get the
+#     leader's in-flight call back and wait on it instead of calling Groq themselves
+#   - finish() publishes the leader's value (or exception) to every waiter and forgets the key, so the
+#     next request after completion goes through the caches as usual
+#   - If the leader is cancelled (e.g. its streaming client disconnected) it finishes with FlightAbandoned,
+#     and waiters start over instead of failing: one of them becomes the new leader
+#   - do(key, fn) wraps begin/fn/finish for plain synchronous callers and returns (value, shared)
+#   - Counts leaders and coalesced callers for /stats
+# Used by: analyze_cv_with_groq(), stream_cv_analysis_with_groq() and analyze_cv_with_groq_async(),
+#   keyed by make_analysis_cache_key() (normalized CV hash, role, model and prompt version)
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key):
+        """Returns (call, is_leader); only the leader should do the work and then call finish()."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = FlightCall()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, call, value=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.value = value
+        call.error = error
+        call.done.set()
+
+    def wait(self, key):
+        """Returns (call, None) if the caller must lead, or (None, value) shared from another caller."""
+        while True:
+            call, leader = self.begin(key)
+            if leader:
+                return call, None
+            try:
+                return None, call.result()
+            except FlightAbandoned:
+                continue
+
+    def do(self, key, fn):
+        """Runs fn() once for all concurrent callers with this key; returns (value, shared)."""
+        call, value = self.wait(key)
+        if call is None:
+            return value, True
+        try:
+            value = fn()
+        except Exception as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, value=value)
+        return value, False
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / calls, 4) if calls else 0.0
+            }
+
+
+# Purpose: Own the single background event loop that every async Groq call runs on
+# Functionality:
+#   - Starts one daemon thread running loop.run_forever() on first use (never at import, so
+#     CPU pool workers and the reloader parent never start it)
+#   - submit() schedules a coroutine on that loop from any thread and returns a concurrent.futures.Future;
+#     cancelling the future cancels the task on the loop
+#   - Owns the one AsyncGroq client (and its httpx connection pool), which is bound to this loop
+#   - shutdown() closes the client on the loop, then stops the loop; registered with atexit
+# Used by: iter_batch_llm_results() and get_async_groq_client()
+class AsyncLoopThread:
+    """One long-lived asyncio event loop in a daemon thread, shared by all async callers."""
+
+    def __init__(self, name='skillgap-async'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self.client = None
+
+    def loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+                atexit.register(self.shutdown)
+            return self._loop
+
+    def is_current(self):
+        try:
+            return self._loop is not None and asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop())
+
+    def shutdown(self, timeout=5.0):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
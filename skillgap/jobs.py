@@ -0,0 +1,293 @@
+"""Durable analysis job queue and the worker threads that drain it."""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from skillgap.concurrency import ServerBusyError
+from skillgap.serialization import decode_json, encode_json, safe_encode
+
+
+# Purpose: Durable queue of analysis jobs that survives restarts and is shared by all server processes
+# Functionality:
+#   - Stores jobs in a SQLite table (WAL mode, short-lived connections like SQLiteCacheBackend)
+#   - enqueue(): returns the id of an identical queued/running job instead of adding a duplicate
+#     (same dedup_key), and raises ServerBusyError (with retry_after) once max_queue jobs are waiting
+#   - claim(): atomically hands out the next job by priority, then age (BEGIN IMMEDIATE); jobs whose
+#     worker died (lease expired) are handed out again until max_attempts is reached
+#   - complete()/fail(): store the result or error and drop the CV text from the row, but only for the
+#     attempt that still holds the job; a worker whose lease expired and whose job was handed out
+#     again gets False and leaves the newer attempt alone
+#   - renew(): extends the lease of a running attempt (JobWorkerPool renews while the handler runs)
+#   - get(): status, timestamps, result and, for waiting jobs, their position in the queue
+#   - Finished jobs are purged after result_ttl seconds
+# Used by: /analyze job mode, JobWorkerPool and the /jobs endpoints
+class JobQueue:
+    """SQLite-backed priority queue of analysis jobs with de-duplication and a depth limit."""
+
+    def __init__(self, path, max_queue=100, lease_seconds=300.0, max_attempts=3, result_ttl=7200, retry_after=5):
+        self.path = path
+        self.max_queue = max_queue
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self.retry_after = retry_after
+        self.deduplicated = 0
+        self.rejected = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        finally:
+            conn.close()
+        with self._transaction() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, dedup_key TEXT NOT NULL, status TEXT NOT NULL, priority INTEGER NOT NULL, '
+                'payload TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, '
+                'created_at REAL NOT NULL, started_at REAL, finished_at REAL, lease_expires_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority, created_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_dedup ON jobs (dedup_key, status)')
+
+    @contextmanager
+    def _transaction(self, immediate=True):
+        # Writers take the write lock up front so two workers can never claim the same job
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            # BEGIN itself may have failed (e.g. database locked), leaving nothing to roll back
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, job_id, dedup_key, payload, priority):
+        """Adds a job; returns (job_id, deduplicated) where job_id may be an existing identical job."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedup_key = ? AND status IN ('queued', 'running') LIMIT 1", (dedup_key,)
+            ).fetchone()
+            if row is not None:
+                self.deduplicated += 1
+                return row[0], True
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queue:
+                self.rejected += 1
+                raise ServerBusyError('The analysis job queue is full. Please try again shortly.', self.retry_after)
+            conn.execute(
+                "INSERT INTO jobs (id, dedup_key, status, priority, payload, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, dedup_key, priority, encode_json(payload).decode('utf-8'), now)
+            )
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'error') AND finished_at < ?", (now - self.result_ttl,)
+            )
+        return job_id, False
+
+    def claim(self):
+        """Marks the next runnable job as running and returns {'id', 'payload', 'attempts'}, or None."""
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT id, payload, attempts FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND lease_expires_at < ?) ORDER BY priority, created_at LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'error', error = ?, payload = '', finished_at = ? WHERE id = ?",
+                        (f'The job was interrupted {attempts} times and has been abandoned.', now, job_id)
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = ?, started_at = ?, lease_expires_at = ? WHERE id = ?",
+                    (attempts + 1, now, now + self.lease_seconds, job_id)
+                )
+                return {'id': job_id, 'payload': decode_json(payload), 'attempts': attempts + 1}
+
+    def renew(self, job_id, attempt):
+        """Extends the lease of a running attempt; returns False if the attempt no longer holds the job."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                (time.time() + self.lease_seconds, job_id, attempt)
+            ).rowcount == 1
+
+    def complete(self, job_id, attempt, result):
+        """Stores the result of a running attempt; returns False if the attempt no longer holds the job."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, payload = '', finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND attempts = ?",
+                (encode_json(result).decode('utf-8'), time.time(), job_id, attempt)
+            ).rowcount == 1
+
+    def fail(self, job_id, attempt, error):
+        """Marks a running attempt as failed; returns False if the attempt no longer holds the job."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'error', error = ?, payload = '', finished_at = ? "
+                "WHERE id = ? AND status = 'running' AND attempts = ?",
+                (error, time.time(), job_id, attempt)
+            ).rowcount == 1
+
+    def get(self, job_id):
+        """Returns the job's public state as a dict, or None if it does not exist (or was purged)."""
+        with self._transaction(immediate=False) as conn:
+            row = conn.execute(
+                'SELECT status, priority, result, error, attempts, created_at, started_at, finished_at '
+                'FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, priority, result, error, attempts, created_at, started_at, finished_at = row
+            job = {
+                'job_id': job_id,
+                'status': status,
+                'priority': priority,
+                'attempts': attempts,
+                'created_at': created_at,
+                'started_at': started_at,
+                'finished_at': finished_at
+            }
+            if status == 'queued':
+                job['queue_position'] = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND (priority < ? OR (priority = ? AND created_at < ?))",
+                    (priority, priority, created_at)
+                ).fetchone()[0] + 1
+            if result is not None:
+                job['result'] = decode_json(result)
+            if error is not None:
+                job['error'] = error
+            return job
+
+    def stats(self):
+        try:
+            with self._transaction(immediate=False) as conn:
+                counts = dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        except sqlite3.Error as e:
+            return {'error': str(e)}
+        return {
+            'queued': counts.get('queued', 0),
+            'running': counts.get('running', 0),
+            'done': counts.get('done', 0),
+            'error': counts.get('error', 0),
+            'max_queue': self.max_queue,
+            'deduplicated': self.deduplicated,
+            'rejected': self.rejected
+        }
+
+
+# Purpose: Run queued jobs in the background on a fixed number of threads
+# Functionality:
+#   - Threads start on first use (start()), so importing the app or running the batch CLI starts none
+#   - Each thread claims a job, runs handler(job_id, payload) and stores its return value as the result;
+#     exceptions mark the job as failed with the exception message
+#   - One heartbeat thread renews the lease of every running job a third of the way through the lease,
+#     so long analyses are not handed to another worker; an attempt that lost its job anyway (e.g. the
+#     process stalled past the lease) drops its result and is counted as "stale"
+#   - notify() wakes idle threads right away; otherwise they poll, which also picks up jobs enqueued
+#     by other server processes and jobs whose worker died
+# Used by: /analyze job mode
+class JobWorkerPool:
+    """Fixed-size pool of daemon threads draining a JobQueue."""
+
+    def __init__(self, job_queue, handler, workers=4, poll_interval=1.0):
+        self.job_queue = job_queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._running = {}
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.stale = 0
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'analysis-job-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            heartbeat = threading.Thread(target=self._renew_leases, name='analysis-job-heartbeat', daemon=True)
+            heartbeat.start()
+            self._threads.append(heartbeat)
+
+    def notify(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            try:
+                job = self.job_queue.claim()
+            except sqlite3.Error as e:
+                print(f"Warning: job queue claim failed: {e}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            with self._lock:
+                self.busy += 1
+                self._running[job['id']] = job['attempts']
+            try:
+                result = self.handler(job['id'], job['payload'])
+                stored = self.job_queue.complete(job['id'], job['attempts'], result)
+                with self._lock:
+                    if stored:
+                        self.completed += 1
+                    else:
+                        self.stale += 1
+            except Exception as e:
+                try:
+                    stored = self.job_queue.fail(job['id'], job['attempts'], safe_encode(str(e)))
+                except sqlite3.Error as db_error:
+                    print(f"Warning: could not record failure of job {job['id']}: {db_error}")
+                    stored = True
+                with self._lock:
+                    if stored:
+                        self.failed += 1
+                    else:
+                        self.stale += 1
+            finally:
+                with self._lock:
+                    self.busy -= 1
+                    self._running.pop(job['id'], None)
+
+    def _renew_leases(self):
+        while True:
+            time.sleep(self.job_queue.lease_seconds / 3)
+            with self._lock:
+                running = list(self._running.items())
+            for job_id, attempt in running:
+                try:
+                    self.job_queue.renew(job_id, attempt)
+                except sqlite3.Error as e:
+                    print(f"Warning: could not renew the lease of job {job_id}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'started': bool(self._threads),
+                'busy': self.busy,
+                'completed': self.completed,
+                'failed': self.failed,
+                'stale': self.stale
+            }
@@ -0,0 +1,123 @@
+"""Local skill detection and role-fit scoring over the skill taxonomy."""
+from collections import deque
+
+from skillgap.startup import lazy_import
+
+
+# Purpose: Find every known skill mentioned in a CV in a single pass over the text
+# Functionality:
+#   - Builds an Aho-Corasick automaton (trie + failure links) over all skill names and aliases
+#     from skill_taxonomy.SKILLS, so matching cost is linear in the text length no matter how
+#     many aliases the taxonomy has
+#   - Matches case-insensitively and only on word boundaries ("java" does not match "javascript")
+#   - Only aliases are matched, so short canonical names such as "C" or "R" never match prose
+#   - find() returns {canonical skill: number of mentions}
+# Used by: extract_skill_profile() and find_role_requirements()
+class SkillMatcher:
+    """Multi-pattern skill finder over a {skill: [aliases]} taxonomy."""
+
+    def __init__(self, skills):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for skill, aliases in skills.items():
+            for alias in set(alias.lower() for alias in aliases):
+                self._add(alias, skill)
+        self._build_failure_links()
+
+    def _add(self, pattern, skill):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), skill))
+
+    def _build_failure_links(self):
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        """Returns {skill: mention count} for every taxonomy skill found in text."""
+        text = (text or '').lower()
+        found = {}
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for end, char in enumerate(text, start=1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, skill in output[node]:
+                start = end - length
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    found[skill] = found.get(skill, 0) + 1
+        return found
+
+
+# Purpose: Score one CV against every known role at once
+# Functionality:
+#   - Holds the requirement weights of every role in ROLE_REQUIREMENTS (the dropdown roles; the
+#     generic fallback role is left out); get_role_fit_index() builds it on first use, or warm_up() does
+#   - rank() computes the weighted coverage of all roles for the CV's detected skills, then sorts roles
+#     best fit first
+#   - Scores use the same formula as heuristic_readiness_score(), so they match fast mode
+#   - Plain Python sums by default: with a few dozen roles they are as fast as NumPy and need no
+#     extra dependency; backend="numpy" builds a roles x skills matrix and scores a 0/1 skill vector
+#     with one matrix-vector product when NumPy is installed, and falls back to the same Python sums
+#     when it is not (both give the same ranking)
+# Used by: /rank-roles through get_role_fit_index()
+class RoleFitIndex:
+    """Requirement weights of all known roles, for ranking them against one CV."""
+
+    def __init__(self, skills, role_requirements, backend='python'):
+        self.skills = list(skills)
+        self.roles = [role for role in role_requirements if role != 'General Professional Role']
+        self.requirements = {role: role_requirements[role] for role in self.roles}
+        self._column = {skill: index for index, skill in enumerate(self.skills)}
+        self._np = np = lazy_import('numpy', optional=True) if backend == 'numpy' else None
+        if np is not None:
+            self._weights = np.zeros((len(self.roles), len(self.skills)), dtype=np.float32)
+            for row, role in enumerate(self.roles):
+                for skill, weight in self.requirements[role].items():
+                    self._weights[row, self._column[skill]] = weight
+            self._required = (self._weights > 0).astype(np.float32)
+            self._totals = self._weights.sum(axis=1)
+
+    def rank(self, found_skills):
+        """Returns [(role, coverage, score)] for every role, best fit first."""
+        found = [skill for skill in found_skills if skill in self._column]
+        np = self._np
+        if np is not None:
+            vector = np.zeros(len(self.skills), dtype=np.float32)
+            vector[[self._column[skill] for skill in found]] = 1.0
+            coverage = (self._weights @ vector) / self._totals
+            extra = len(found) - (self._required @ vector)
+            scores = np.clip(np.rint(10 + 85 * coverage + np.minimum(5, extra)), 0, 100)
+            order = np.argsort(-coverage, kind='stable')
+            return [(self.roles[i], round(float(coverage[i]), 3), int(scores[i])) for i in order]
+
+        found = set(found)
+        ranked = []
+        for role in self.roles:
+            requirements = self.requirements[role]
+            coverage = sum(weight for skill, weight in requirements.items() if skill in found) / sum(requirements.values())
+            extra = len(found) - sum(1 for skill in requirements if skill in found)
+            ranked.append((coverage, role, max(0, min(100, int(round(10 + 85 * coverage + min(5, extra)))))))
+        # Stable sort on the unrounded coverage, like np.argsort(kind='stable') above
+        ranked.sort(key=lambda item: -item[0])
+        return [(role, round(coverage, 3), score) for coverage, role, score in ranked]
@@ -0,0 +1,134 @@
+"""Prometheus-style metrics kept in process and served by /metrics."""
+import threading
+from collections import OrderedDict
+
+
+# Upper bounds (seconds) shared by every latency histogram, from sub-millisecond parsing to slow LLM calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# Purpose: Fixed-bucket latency histogram in the Prometheus style
+# Functionality:
+#   - Counts observations per upper bound plus their sum and total count; O(buckets) per observation
+#   - snapshot() returns cumulative bucket counts for the text exposition format
+# Used by: MetricsRegistry for every *_seconds histogram
+class Histogram:
+    """Thread-safe histogram with fixed bucket boundaries."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        """Returns ([(upper bound, cumulative count)], sum, count)."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, total, running
+
+
+# Purpose: In-process metrics registry rendered in the Prometheus text format
+# Functionality:
+#   - Metric families are declared once with a type (counter, gauge or histogram) and help text
+#   - observe()/inc() update a labelled series of a declared family
+#   - Collectors are functions called at scrape time that return (name, type, help, labels, value)
+#     tuples, used to expose counters the app already keeps (caches, limiter, Groq client, jobs)
+#   - render() produces the text exposition format served by /metrics
+# Used by: timed_stage(), the request hooks, record_token_usage() and /metrics
+class MetricsRegistry:
+    """Counters and fixed-bucket histograms with Prometheus text output."""
+
+    def __init__(self):
+        self._families = OrderedDict()
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def declare(self, name, kind, help_text):
+        self._families[name] = {'type': kind, 'help': help_text, 'series': {}}
+
+    def observe(self, name, value, **labels):
+        series = self._families[name]['series']
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = series.setdefault(key, Histogram())
+        histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        series = self._families[name]['series']
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series[key] = series.get(key, 0) + amount
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    @staticmethod
+    def _labels(labels, extra=None):
+        items = list(labels) + ([extra] if extra else [])
+        if not items:
+            return ''
+        escaped = (
+            f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+            for key, value in items
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _number(value):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(float(value)) if isinstance(value, float) else str(int(value))
+
+    def render(self):
+        lines = []
+        with self._lock:
+            families = [(name, dict(family, series=dict(family['series']))) for name, family in self._families.items()]
+        for name, family in families:
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for labels, value in family['series'].items():
+                if family['type'] == 'histogram':
+                    buckets, total, count = value.snapshot()
+                    for bound, cumulative in buckets:
+                        lines.append(f"{name}_bucket{self._labels(labels, ('le', self._number(bound)))} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(labels)} {self._number(total)}")
+                    lines.append(f"{name}_count{self._labels(labels)} {count}")
+                else:
+                    lines.append(f"{name}{self._labels(labels)} {self._number(value)}")
+
+        collected = OrderedDict()
+        for collector in self._collectors:
+            try:
+                for name, kind, help_text, labels, value in collector():
+                    collected.setdefault(name, (kind, help_text, []))[2].append((tuple(sorted(labels.items())), value))
+            except Exception as e:
+                print(f"Warning: metrics collector failed: {e}")
+        for name, (kind, help_text, samples) in collected.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if value is not None:
+                    lines.append(f"{name}{self._labels(labels)} {self._number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# The process-wide registry; modules declare their metric families on it at import
+metrics = MetricsRegistry()
@@ -0,0 +1,343 @@
+"""Retry, hedging and circuit-breaker policy for calls to the Groq API."""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from skillgap.startup import lazy_import
+
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+# Purpose: Signal that calls to Groq are being short-circuited because the upstream is unhealthy
+# Functionality:
+#   - Carries the number of seconds until the circuit breaker will allow a trial call again
+# Used by: CircuitBreaker.before_call() and describe_groq_error()
+class CircuitOpenError(Exception):
+    """Raised instead of calling Groq while the circuit breaker is open."""
+
+    def __init__(self, retry_after):
+        super().__init__('The AI service is temporarily unavailable.')
+        self.retry_after = retry_after
+
+
+# Purpose: Fail fast while the Groq API is unhealthy instead of making every request wait for it
+# Functionality:
+#   - closed: calls flow normally; consecutive retryable failures are counted
+#   - open: after failure_threshold consecutive failures, every call fails immediately
+#     with CircuitOpenError for reset_timeout seconds
+#   - half_open: after the timeout one trial call is let through; success closes the circuit,
+#     failure opens it again, and a trial that ends without an outcome (cancelled, interrupted)
+#     is released so the next call becomes the trial
+# Used by: ResilientGroqClient around every upstream attempt
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == 'open':
+                remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(remaining)
+                self.state = 'half_open'
+                self._trial_in_flight = False
+            if self.state == 'half_open':
+                if self._trial_in_flight:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.reset_timeout)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """Ends a call that neither succeeded nor failed, freeing the half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'times_opened': self.times_opened,
+                'short_circuited': self.short_circuited
+            }
+
+
+# Purpose: Rolling window of recent upstream latencies
+# Functionality:
+#   - Keeps the last `window` successful call durations
+#   - Answers percentile queries (e.g. p95) used as the hedging delay
+# Used by: ResilientGroqClient
+class LatencyTracker:
+    """Fixed-size window of latency samples with percentile lookup."""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+
+# Purpose: Resilient wrapper around the Groq chat completions API
+# Functionality:
+#   - Applies a per-call timeout to every request
+#   - Retries connection errors, timeouts, 429 and 5xx responses with full-jitter exponential
+#     backoff, honoring a Retry-After header when Groq sends one
+#   - Optional hedging: when a call runs longer than the recent p95 latency, fires one duplicate
+#     request and returns whichever finishes first successfully; sync hedges run on a pool of
+#     max_workers threads, created on first use
+#   - Routes every attempt through a CircuitBreaker so an unhealthy upstream fails fast
+#   - Provides sync, streaming and async entry points with the same policy
+#   - Counts calls, retries, failures and hedges for /stats
+# Used by: analyze_cv_with_groq(), stream_cv_analysis_with_groq() and analyze_cv_with_groq_async()
+class ResilientGroqClient:
+    """Retry, hedging and circuit-breaker policy for Groq chat completion calls."""
+
+    def __init__(self, client_factory, timeout=30.0, max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 hedge=False, hedge_percentile=95.0, hedge_min_samples=20, breaker=None, max_workers=100):
+        self.client_factory = client_factory
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_workers = max_workers
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self._hedge_executor = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @property
+    def client(self):
+        return self.client_factory()
+
+    @staticmethod
+    def is_retryable(error):
+        groq = lazy_import('groq')
+        if isinstance(error, groq.APIConnectionError):
+            return True
+        return isinstance(error, groq.APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES
+
+    def backoff_delay(self, attempt, error):
+        retry_after = None
+        response = getattr(error, 'response', None)
+        if response is not None:
+            retry_after = response.headers.get('retry-after')
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _hedge_delay(self):
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    def _run_with_retries(self, call, max_retries=None):
+        max_retries = self.max_retries if max_retries is None else max_retries
+        self._count('calls')
+        for attempt in range(max_retries + 1):
+            self.breaker.before_call()
+            started = time.perf_counter()
+            try:
+                result = call()
+            except Exception as e:
+                if not self.is_retryable(e):
+                    # Groq answered (e.g. 400/401); the upstream itself is healthy
+                    self.breaker.record_success()
+                    self._count('failures')
+                    raise
+                self.breaker.record_failure()
+                if attempt >= max_retries:
+                    self._count('failures')
+                    raise
+                self._count('retries')
+                time.sleep(self.backoff_delay(attempt, e))
+                continue
+            except BaseException:
+                # Cancelled or interrupted: no verdict on the upstream, but a half-open trial must end
+                self.breaker.release()
+                raise
+            self.latency.record(time.perf_counter() - started)
+            self.breaker.record_success()
+            return result
+
+    def _call_hedged(self, request):
+        delay = self._hedge_delay()
+        if delay is None:
+            return request()
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='groq-hedge')
+            executor = self._hedge_executor
+        primary = executor.submit(request)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        self._count('hedged')
+        hedge = executor.submit(request)
+        futures = [primary, hedge]
+        error = None
+        while futures:
+            done, pending = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count('hedge_wins')
+                    return future.result()
+                error = future.exception()
+            futures = list(pending)
+        raise error
+
+    def create(self, max_retries=None, timeout=None, **kwargs):
+        """Returns a chat completion, applying timeout, retries, hedging and the circuit breaker.
+
+        max_retries and timeout override the gateway defaults for this call.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        request = lambda: self.client.chat.completions.create(timeout=timeout, **kwargs)
+        return self._run_with_retries(lambda: self._call_hedged(request), max_retries)
+
+    def stream(self, max_retries=None, timeout=None, **kwargs):
+        """Opens a streaming chat completion; retries only apply until the stream is established."""
+        timeout = self.timeout if timeout is None else timeout
+        return self._run_with_retries(
+            lambda: self.client.chat.completions.create(stream=True, timeout=timeout, **kwargs),
+            max_retries
+        )
+
+    async def create_async(self, async_client, max_retries=None, timeout=None, **kwargs):
+        """Async variant of create() for an AsyncGroq client."""
+        max_retries = self.max_retries if max_retries is None else max_retries
+        timeout = self.timeout if timeout is None else timeout
+        self._count('calls')
+        for attempt in range(max_retries + 1):
+            self.breaker.before_call()
+            started = time.perf_counter()
+            try:
+                result = await self._call_hedged_async(async_client, timeout, kwargs)
+            except Exception as e:
+                if not self.is_retryable(e):
+                    self.breaker.record_success()
+                    self._count('failures')
+                    raise
+                self.breaker.record_failure()
+                if attempt >= max_retries:
+                    self._count('failures')
+                    raise
+                self._count('retries')
+                await asyncio.sleep(self.backoff_delay(attempt, e))
+                continue
+            except BaseException:
+                # CancelledError: the caller gave up, which says nothing about the upstream
+                self.breaker.release()
+                raise
+            self.latency.record(time.perf_counter() - started)
+            self.breaker.record_success()
+            return result
+
+    async def _call_hedged_async(self, async_client, timeout, kwargs):
+        request = lambda: async_client.chat.completions.create(timeout=timeout, **kwargs)
+        delay = self._hedge_delay()
+        if delay is None:
+            return await request()
+        primary = asyncio.ensure_future(request())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            if done:
+                return primary.result()
+            self._count('hedged')
+            hedge = asyncio.ensure_future(request())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count('hedge_wins')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The losing request, or both when the caller is cancelled
+            for task in tasks:
+                task.cancel()
+
+    def stats(self):
+        with self._lock:
+            counters = {
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins
+            }
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        counters.update({
+            'latency_p50_seconds': round(p50, 4) if p50 is not None else None,
+            'latency_p95_seconds': round(p95, 4) if p95 is not None else None,
+            'hedging': self.hedge,
+            'circuit_breaker': self.breaker.stats()
+        })
+        return counters
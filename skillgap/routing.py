@@ -0,0 +1,196 @@
+"""Routing of analyses between the fast and the large Groq model."""
+import threading
+import time
+from dataclasses import dataclass
+
+from skillgap.observability import metrics
+from skillgap.resilience import CircuitOpenError
+from skillgap.startup import lazy_import
+
+
+# Reasons that do not depend on upstream health or load; only their results are cached
+ROUTE_CACHEABLE_REASONS = {'default', 'short_cv', 'routing_disabled'}
+
+
+# Purpose: The model (and output-token cap) chosen for one analysis, and why
+# Used by: ModelRouter and the analyze_cv_with_groq() variants
+@dataclass
+class ModelRoute:
+    """Model, output-token cap and routing reason for one Groq call."""
+    tier: str
+    model: str
+    max_tokens: int
+    reason: str
+    fallback: bool = False
+
+    @property
+    def cacheable(self):
+        return self.reason in ROUTE_CACHEABLE_REASONS
+
+
+# Purpose: Choose between the large and the fast Groq model for each analysis
+# Functionality:
+#   - choose() routes by CV length, upstream health and load:
+#     * short CVs (at most ROUTE_SHORT_CV_TOKENS) go to the fast model with its smaller token cap
+#     * for ROUTE_COOLDOWN seconds after a large-model failure ('cooldown'), or after its recent p95
+#       latency reached ROUTE_LATENCY_SLO ('slo'), everything goes to the fast model; the SLO is checked
+#       whenever a large-model call finishes, so traffic returns to the large model once it recovers
+#     * when ROUTE_BUSY_QUEUE or more analyses are waiting for a slot, the fast model drains the queue
+#     * everything else goes to the large model
+#   - complete()/complete_async()/open_stream() call the routed model; large-model calls get no retries
+#     and the SLO as timeout, and a rate limit, timeout, 5xx or open breaker fails over to the fast model
+#     at once (and starts a ROUTE_COOLDOWN); a timed-out call counts as a latency sample at the SLO,
+#     since a call cut off there never records its real duration
+#   - record() adds the serving model, reason, fallback flag and latency to the response details and
+#     to per-model counters (/stats) and metrics, so the policy can be tuned from data
+#   - With MODEL_ROUTING off every call uses the large model with the gateway's own retry policy
+# Used by: analyze_cv_with_groq(), stream_cv_analysis_with_groq() and analyze_cv_with_groq_async()
+class ModelRouter:
+    """Routes analyses between a fast and a large model, with failover to the fast one."""
+
+    def __init__(self, gateways, models, max_tokens, enabled=True, short_cv_tokens=250, latency_slo=12.0,
+                 busy_queue=8, cooldown=30.0, queue_depth=None):
+        self.gateways = gateways
+        self.models = models
+        self.max_tokens = max_tokens
+        self.enabled = enabled
+        self.short_cv_tokens = short_cv_tokens
+        self.latency_slo = latency_slo
+        self.busy_queue = busy_queue
+        self.cooldown = cooldown
+        self.queue_depth = queue_depth
+        self._degraded_until = 0.0
+        self._degraded_reason = None
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+        self.served = {}
+
+    def _route(self, tier, reason, fallback=False):
+        return ModelRoute(tier, self.models[tier], self.max_tokens[tier], reason, fallback)
+
+    def large_model_degraded(self):
+        """Returns why the large model should be avoided right now ('cooldown' or 'slo'), or None."""
+        with self._lock:
+            if time.monotonic() < self._degraded_until:
+                return self._degraded_reason
+        return None
+
+    def _slo_breached(self):
+        latency = self.gateways['large'].latency
+        return len(latency) >= 10 and latency.percentile(95) >= self.latency_slo
+
+    def _degrade(self, reason):
+        with self._lock:
+            self._degraded_until = time.monotonic() + self.cooldown
+            self._degraded_reason = reason
+
+    def cacheable_route(self, cv_tokens):
+        """Returns the route choose() takes while the large model is healthy and idle (the cached one)."""
+        if not self.enabled:
+            return self._route('large', 'routing_disabled')
+        if cv_tokens <= self.short_cv_tokens:
+            return self._route('fast', 'short_cv')
+        return self._route('large', 'default')
+
+    def choose(self, cv_tokens):
+        """Returns the ModelRoute for a CV of about cv_tokens tokens."""
+        route = self.cacheable_route(cv_tokens)
+        if route.reason != 'default':
+            return route
+        degraded = self.large_model_degraded()
+        if degraded:
+            return self._route('fast', degraded)
+        if self.queue_depth is not None and self.queue_depth() >= self.busy_queue:
+            return self._route('fast', 'load')
+        return self._route('large', 'default')
+
+    def _call_options(self, route):
+        options = {'model': route.model, 'max_tokens': route.max_tokens}
+        if self.enabled and route.tier == 'large':
+            # Fail over instead of retrying or waiting past the SLO
+            options.update(max_retries=0, timeout=self.latency_slo)
+        return options
+
+    def _fail_over(self, route, error):
+        if not self.enabled or route.tier != 'large':
+            return None
+        if not isinstance(error, CircuitOpenError) and not self.gateways['large'].is_retryable(error):
+            return None
+        if isinstance(error, lazy_import('groq').APITimeoutError):
+            self.gateways['large'].latency.record(self.latency_slo)
+        self._degrade('slo' if self._slo_breached() else 'cooldown')
+        with self._lock:
+            self.fallbacks += 1
+        return self._route('fast', 'fallback', fallback=True)
+
+    def complete(self, route, **kwargs):
+        """Runs a chat completion on the routed model; returns (completion, route that served it)."""
+        try:
+            return self.gateways[route.tier].create(**self._call_options(route), **kwargs), route
+        except Exception as e:
+            fallback = self._fail_over(route, e)
+            if fallback is None:
+                raise
+        return self.gateways['fast'].create(**self._call_options(fallback), **kwargs), fallback
+
+    async def complete_async(self, async_client, route, **kwargs):
+        """Async variant of complete()."""
+        try:
+            return await self.gateways[route.tier].create_async(async_client, **self._call_options(route), **kwargs), route
+        except Exception as e:
+            fallback = self._fail_over(route, e)
+            if fallback is None:
+                raise
+        return await self.gateways['fast'].create_async(async_client, **self._call_options(fallback), **kwargs), fallback
+
+    def open_stream(self, route, **kwargs):
+        """Opens a streaming completion on the routed model; returns (stream, route that serves it)."""
+        try:
+            return self.gateways[route.tier].stream(**self._call_options(route), **kwargs), route
+        except Exception as e:
+            fallback = self._fail_over(route, e)
+            if fallback is None:
+                raise
+        return self.gateways['fast'].stream(**self._call_options(fallback), **kwargs), fallback
+
+    def record(self, route, seconds, details=None):
+        """Counts a served call and adds its model and latency to the response details."""
+        if self.enabled and route.tier == 'large' and self._slo_breached():
+            self._degrade('slo')
+        with self._lock:
+            key = (route.model, route.reason)
+            self.served[key] = self.served.get(key, 0) + 1
+        metrics.inc('skillgap_model_requests_total', model=route.model, reason=route.reason)
+        metrics.observe('skillgap_model_latency_seconds', seconds, model=route.model)
+        if details is not None:
+            details.update({
+                'model': route.model,
+                'model_reason': route.reason,
+                'model_fallback': route.fallback,
+                'llm_seconds': round(seconds, 3)
+            })
+
+    def stats(self):
+        with self._lock:
+            served = [{'model': model, 'reason': reason, 'count': count} for (model, reason), count in self.served.items()]
+            fallbacks = self.fallbacks
+        latency = {}
+        for tier, gateway in self.gateways.items():
+            p50 = gateway.latency.percentile(50)
+            p95 = gateway.latency.percentile(95)
+            latency[self.models[tier]] = {
+                'p50_seconds': round(p50, 4) if p50 is not None else None,
+                'p95_seconds': round(p95, 4) if p95 is not None else None
+            }
+        return {
+            'enabled': self.enabled,
+            'models': dict(self.models),
+            'large_model_degraded': self.large_model_degraded(),
+            'fallbacks': fallbacks,
+            'served': served,
+            'latency': latency
+        }
+
+
+metrics.declare('skillgap_model_requests_total', 'counter', 'Groq calls served, by model and routing reason.')
+metrics.declare('skillgap_model_latency_seconds', 'histogram', 'Groq call latency by serving model.')
@@ -0,0 +1,76 @@
+"""JSON and text encoding shared by responses, SSE frames, sessions and the job queue."""
+import json
+import os
+from datetime import date, datetime, time
+
+from skillgap.startup import lazy_import
+
+
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto').strip().lower()
+# Decides once whether orjson is used; None until the first encode_json() call
+_orjson = None
+_orjson_checked = False
+
+
+def get_orjson():
+    """Returns the orjson module when JSON_BACKEND allows it and it is installed, else None."""
+    global _orjson, _orjson_checked
+    if not _orjson_checked:
+        _orjson = lazy_import('orjson', optional=True) if JSON_BACKEND in ('auto', 'orjson') else None
+        _orjson_checked = True
+    return _orjson
+
+
+# Purpose: Serialize a response payload to UTF-8 JSON bytes in one pass
+# Functionality:
+#   - Uses orjson when it is installed (JSON_BACKEND=auto or orjson), otherwise json.dumps with
+#     ensure_ascii=False; both walk the payload once and reject values JSON cannot represent (TypeError)
+#   - Both give the same bytes: compact separators, non-str keys (int, float, bool, None) as strings
+#     and dates/times in ISO 8601, so output does not change with the installed backend
+#   - Text that is not valid UTF-8 (lone surrogates from broken uploads or model output) is replaced
+#     while encoding the finished document to bytes, with the same '?' that safe_encode() would give,
+#     instead of rebuilding every dict, list and string beforehand
+#   - orjson refuses such text, so those payloads take the json.dumps path
+# Used by: json_response() (safe_jsonify()/safe_jsonify_error()), iter_json_lines(), format_sse(),
+#          SessionStore and JobQueue
+def encode_json(data):
+    """Returns data as UTF-8 encoded JSON bytes."""
+    orjson = get_orjson()
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_encode_default).encode('utf-8', errors='replace')
+
+
+def _encode_default(value):
+    """json.dumps fallback for the types orjson serializes natively."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def decode_json(data):
+    """Parses JSON from UTF-8 bytes or text, with orjson when it is installed."""
+    orjson = get_orjson()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Purpose: Safely convert any Python object to a UTF-8 encoded string
+# Functionality:
+#   - Handles None values by returning empty string
+#   - If input is bytes, decodes using UTF-8 (replaces undecodable characters)
+#   - Converts any other type to string, encodes to UTF-8, then decodes back
+#   - Uses 'replace' error handler to substitute problematic characters with replacement character
+#   - Ensures no encoding errors crash the application when handling user data
+# Used by: Text processing functions and JSON encoding to prevent encoding errors
+def safe_encode(text):
+    """Safely converts any text to UTF-8 string, replacing any unencodable characters."""
+    if text is None:
+        return ""
+    if isinstance(text, bytes):
+        return text.decode('utf-8', errors='replace')
+    return str(text).encode('utf-8', errors='replace').decode('utf-8')
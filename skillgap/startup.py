@@ -0,0 +1,64 @@
+"""Cold-start accounting: deferred imports of heavy dependencies and the startup profile."""
+import importlib
+import os
+import sys
+import threading
+import time
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return round(int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    except (ImportError, OSError):
+        return None
+
+
+# Cold-start numbers reported by /stats, /metrics and `python app.py --startup-profile`
+startup_profile = {
+    'module_import_ms': None,
+    'rss_mb_after_import': None,
+    'lazy_imports': {},
+    'warmup_ms': None
+}
+_lazy_import_lock = threading.Lock()
+
+
+# Purpose: Import heavy optional-path dependencies (Groq SDK, PDF/DOCX libraries, ReportLab, NumPy) on first use
+# Functionality:
+#   - Returns the module straight from sys.modules once loaded, so repeated calls are a dict lookup
+#   - Otherwise imports it under a lock and records the import time and RSS growth in startup_profile
+#   - optional=True returns None instead of raising when the package is not installed
+#   - Keeps cold starts (e.g. serverless requests for / or /health) from paying for libraries they never use
+# Used by: get_groq_client(), the PDF/DOCX extractors, get_pdf_styles()/generate_pdf_report() and RoleFitIndex
+def lazy_import(name, optional=False):
+    """Imports a module on first use and records what the import cost."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with _lazy_import_lock:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        started = time.perf_counter()
+        rss_before = current_rss_mb()
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            if optional:
+                return None
+            raise
+        rss_after = current_rss_mb()
+        startup_profile['lazy_imports'][name] = {
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+            'rss_delta_mb': round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None
+        }
+        return module
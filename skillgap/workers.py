@@ -0,0 +1,283 @@
+"""Process pool for CPU-bound work: PDF rendering and document text extraction."""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from skillgap.concurrency import ServerBusyError
+from skillgap.observability import metrics
+from skillgap.resilience import LatencyTracker
+
+
+class CPUPoolBusy(ServerBusyError):
+    """Raised by CPUWorkerPool.submit() when no worker or queue slot freed up in time."""
+
+
+class CPUTaskTimeout(Exception):
+    """Raised by CPUWorkerPool.run() when a task did not finish within its timeout."""
+
+
+def run_cpu_task(function, args):
+    """Runs one pool task in a worker and returns (result, wall-clock start, seconds)."""
+    started_at = time.time()
+    started = time.perf_counter()
+    result = function(*args)
+    return result, started_at, time.perf_counter() - started
+
+
+# One ProcessPoolExecutor of a CPUWorkerPool and the tasks still running on it
+class CPUExecutor:
+    def __init__(self, executor):
+        self.executor = executor
+        self.pending = 0
+        # Set once a task overran its timeout: the executor takes no new work and is
+        # terminated as soon as its other tasks have finished
+        self.stuck = False
+
+
+# Future handed to CPUWorkerPool callers: resolves to the task's own result and cancels the
+# underlying process pool future with it
+class CPUTaskFuture(Future):
+    def __init__(self, inner, owner):
+        super().__init__()
+        self._inner = inner
+        self.owner = owner
+        self.released = False
+
+    def cancel(self):
+        return self._inner.cancel() and super().cancel()
+
+
+# Purpose: Managed process pool for CPU-bound work (PDF rendering, PDF/DOCX text extraction)
+# Functionality:
+#   - Keeps ReportLab layout and document parsing off the request threads, which under the GIL
+#     would otherwise stall every other request (and the streaming LLM traffic) in the worker
+#   - CPU_POOL_WORKERS processes started with the forkserver method (spawn where it is missing), never
+#     forked from the threaded server; the fork server preloads PyPDF2 and ReportLab and every worker
+#     runs warm_cpu_worker(), so no task pays for those imports. warm() starts them ahead of time.
+#   - Workers are replaced after CPU_POOL_MAX_TASKS_PER_WORKER tasks (max_tasks_per_child) to contain
+#     memory growth in ReportLab/PyPDF2; on Python 3.10, which lacks max_tasks_per_child, workers
+#     are kept for the life of the executor instead
+#   - submit() waits up to CPU_POOL_QUEUE_TIMEOUT for one of CPU_POOL_MAX_QUEUE queue slots and then
+#     raises CPUPoolBusy (a ServerBusyError, so routes answer 503 with Retry-After); busy work never
+#     falls back to the request thread
+#   - run() waits up to a per-task timeout (CPU_POOL_TASK_TIMEOUT) and raises CPUTaskTimeout. The
+#     executor the task ran on stops taking work and a fresh one serves new tasks; the old one's
+#     processes are terminated once its other callers' tasks have finished
+#   - Only when process pools cannot be created at all (e.g. some serverless runtimes) do tasks run
+#     on the calling thread
+#   - Records queue wait and run time per task name for /stats and /metrics
+# Used by: render_session_report(), extract_text_offloaded(), extract_pdf_pages() and iter_batch_extractions()
+class CPUWorkerPool:
+    """Process pool with warm workers, a bounded queue, task timeouts and worker recycling."""
+
+    def __init__(self, workers, max_queue, task_timeout, max_tasks_per_worker, queue_timeout=5.0,
+                 initializer=None, preload_modules=(), retry_after=5):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.task_timeout = task_timeout
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self.queue_timeout = queue_timeout
+        self.initializer = initializer
+        self.preload_modules = list(preload_modules)
+        self.retry_after = retry_after
+        self._current = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        # Tasks submitted and not finished yet, running or waiting for a worker
+        self.pending = 0
+        self.counts = {'completed': 0, 'failed': 0, 'timeouts': 0, 'rejected': 0, 'inline': 0, 'terminated': 0}
+        self.wait_latency = LatencyTracker()
+        self.run_latency = LatencyTracker()
+
+    def _context(self):
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(self.preload_modules)
+            return context
+        return multiprocessing.get_context('spawn')
+
+    def _current_executor(self):
+        """Returns the CPUExecutor taking new work, creating it if needed. Call with the lock held."""
+        if self._unavailable:
+            raise NotImplementedError('process pools are unavailable here')
+        if self._current is None:
+            options = dict(max_workers=self.workers, mp_context=self._context(), initializer=self.initializer)
+            try:
+                try:
+                    executor = ProcessPoolExecutor(max_tasks_per_child=self.max_tasks_per_worker, **options)
+                except TypeError:
+                    # max_tasks_per_child is Python 3.11+; older interpreters run without worker recycling
+                    executor = ProcessPoolExecutor(**options)
+            except (OSError, NotImplementedError, ImportError, ValueError, TypeError):
+                self._unavailable = True
+                raise NotImplementedError('process pools are unavailable here')
+            self._current = CPUExecutor(executor)
+        return self._current
+
+    def _release(self, future):
+        """Frees the queue slot of a finished or abandoned task. Call with the lock held."""
+        if future.released:
+            return False
+        future.released = True
+        self.pending -= 1
+        future.owner.pending -= 1
+        self._slot_freed.notify()
+        return future.owner.stuck and future.owner.pending == 0
+
+    def _terminate(self, owner):
+        with self._lock:
+            self.counts['terminated'] += 1
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list((getattr(owner.executor, '_processes', None) or {}).values()):
+            process.terminate()
+        owner.executor.shutdown(wait=False, cancel_futures=True)
+
+    def available(self):
+        """Returns False when process pools cannot be created here."""
+        with self._lock:
+            try:
+                self._current_executor()
+            except NotImplementedError:
+                return False
+        return True
+
+    def queue_depth(self):
+        """Tasks waiting for a free worker."""
+        return max(0, self.pending - self.workers)
+
+    def warm(self):
+        """Starts the worker processes ahead of the first task."""
+        with self._lock:
+            owner = self._current_executor()
+        # Workers are started one per submission until the pool is full
+        for _ in range(self.workers):
+            owner.executor.submit(int)
+
+    def submit(self, name, function, *args):
+        """Queues function(*args) in a worker process and returns a Future for its result."""
+        deadline = time.monotonic() + self.queue_timeout
+        with self._lock:
+            while self.pending >= self.workers + self.max_queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counts['rejected'] += 1
+                    raise CPUPoolBusy('The server is busy processing documents. Please try again shortly.', self.retry_after)
+                self._slot_freed.wait(remaining)
+            owner = self._current_executor()
+            self.pending += 1
+            owner.pending += 1
+        submitted_at = time.time()
+        try:
+            inner = owner.executor.submit(run_cpu_task, function, args)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+                owner.pending -= 1
+                self._slot_freed.notify()
+                if self._current is owner:
+                    # Broken or shut down: the next task gets a fresh executor
+                    self._current = None
+            raise
+        outer = CPUTaskFuture(inner, owner)
+        inner.add_done_callback(lambda done: self._finish(name, submitted_at, done, outer))
+        return outer
+
+    def _finish(self, name, submitted_at, inner, outer):
+        broken = not inner.cancelled() and isinstance(inner.exception(), BrokenProcessPool)
+        with self._lock:
+            abandoned = outer.released
+            terminate = self._release(outer)
+            if broken and self._current is outer.owner:
+                # A worker died (e.g. out of memory): the next task gets a fresh executor
+                self._current = None
+        if terminate:
+            self._terminate(outer.owner)
+        if inner.cancelled():
+            Future.cancel(outer)
+            return
+        error = inner.exception()
+        if error is not None:
+            if not abandoned:
+                # A task that timed out was already counted; its error is the terminated worker
+                with self._lock:
+                    self.counts['failed'] += 1
+                metrics.inc('skillgap_cpu_tasks_total', task=name, outcome='error')
+            outer.set_exception(error)
+            return
+        result, started_at, seconds = inner.result()
+        waited = max(0.0, started_at - submitted_at)
+        with self._lock:
+            self.counts['completed'] += 1
+        self.wait_latency.record(waited)
+        self.run_latency.record(seconds)
+        metrics.inc('skillgap_cpu_tasks_total', task=name, outcome='ok')
+        metrics.observe('skillgap_cpu_task_wait_seconds', waited, task=name)
+        metrics.observe('skillgap_cpu_task_run_seconds', seconds, task=name)
+        outer.set_result(result)
+
+    def abandon(self, future):
+        """Gives up on a task that overran: cancels it, or retires the executor it is running on."""
+        if future.cancel():
+            return
+        owner = future.owner
+        with self._lock:
+            owner.stuck = True
+            if self._current is owner:
+                self._current = None
+            terminate = self._release(future)
+        if terminate:
+            self._terminate(owner)
+
+    def run(self, name, function, *args, timeout=None):
+        """Runs function(*args) in a worker and returns its result."""
+        timeout = self.task_timeout if timeout is None else timeout
+        if multiprocessing.parent_process() is not None:
+            # Already inside a worker: never nest pools
+            return function(*args)
+        try:
+            future = self.submit(name, function, *args)
+        except NotImplementedError as e:
+            return self._run_inline(name, function, args, e)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.counts['timeouts'] += 1
+            metrics.inc('skillgap_cpu_tasks_total', task=name, outcome='timeout')
+            self.abandon(future)
+            raise CPUTaskTimeout(f'{name} did not finish within {timeout:g}s')
+
+    def _run_inline(self, name, function, args, reason):
+        with self._lock:
+            first = not self.counts['inline']
+            self.counts['inline'] += 1
+        if first:
+            print(f"Warning: CPU pool unavailable, running {name} in-process: {reason}")
+        metrics.inc('skillgap_cpu_tasks_total', task=name, outcome='inline')
+        return function(*args)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counts, workers=self.workers, max_queue=self.max_queue, pending=self.pending,
+                         queue_depth=self.queue_depth(), max_tasks_per_worker=self.max_tasks_per_worker,
+                         started=self._current is not None, available=not self._unavailable)
+        for label, latency in (('wait', self.wait_latency), ('run', self.run_latency)):
+            p50 = latency.percentile(50)
+            p95 = latency.percentile(95)
+            stats[f'{label}_p50_seconds'] = round(p50, 4) if p50 is not None else None
+            stats[f'{label}_p95_seconds'] = round(p95, 4) if p95 is not None else None
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            owner, self._current = self._current, None
+        if owner is not None:
+            owner.executor.shutdown(wait=True, cancel_futures=True)
+
+
+metrics.declare('skillgap_cpu_tasks_total', 'counter', 'CPU pool tasks by task and outcome (ok, error, timeout, inline).')
+metrics.declare('skillgap_cpu_task_wait_seconds', 'histogram', 'Time CPU pool tasks waited for a worker.')
+metrics.declare('skillgap_cpu_task_run_seconds', 'histogram', 'Time CPU pool tasks ran in a worker.')
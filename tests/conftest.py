@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+# app.py reads its settings at import time: keep the tests off shared paths and background threads
+os.environ['STARTUP_WARMUP'] = '0'
+# '' is the documented in-process default: every cache stays in memory
+os.environ['ANALYSIS_CACHE_BACKEND'] = ''
+os.environ['SESSION_STORE_BACKEND'] = ''
+os.environ['EXTRACTION_CACHE_BACKEND'] = ''
+os.environ['JOB_QUEUE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='skillgap_tests_'), 'jobs.sqlite3')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces time.time() with a clock the test moves forward by hand."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    """Replaces time.monotonic() with a clock the test moves forward by hand."""
+    now = [1_000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
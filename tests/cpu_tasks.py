@@ -0,0 +1,16 @@
+"""Tasks for test_cpu_pool.py; worker processes import them by module name."""
+import os
+import time
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def worker_pid():
+    return os.getpid()
+
+
+def fail(message):
+    raise ValueError(message)
@@ -0,0 +1,89 @@
+import pytest
+
+import app
+from fake_groq_server import SAMPLE_ANALYSIS
+
+
+def test_parses_the_sample_analysis():
+    result = app.parse_analysis(SAMPLE_ANALYSIS)
+    assert [(skill.name, skill.priority) for skill in result.missing_skills[:3]] == [
+        ('Docker', 1), ('System Design', 2), ('Kubernetes', 3)
+    ]
+    assert result.missing_skills[0] == app.MissingSkill('Docker', 'Containerizing and shipping services', 'YouTube', 1)
+    assert result.missing_skills[3] == app.MissingSkill('CI/CD', 'Automating builds and deployments', 'FreeCodeCamp')
+    assert len(result.missing_skills) == 7
+    assert result.current_skills == ['Python', 'SQL', 'Git', 'REST APIs']
+    assert [(step.step, step.skill) for step in result.roadmap] == [
+        (1, 'Docker'), (2, 'CI/CD'), (3, 'Testing'), (4, 'Cloud Platforms'), (5, 'System Design')
+    ]
+    assert result.roadmap[0].detail == 'Every modern deployment starts with containers, about 2 weeks'
+    assert result.score == 68
+    assert result.explanation.startswith('The candidate has a solid programming foundation')
+    assert result.notes == []
+
+
+def test_round_trips_through_markdown_and_dict():
+    result = app.parse_analysis(SAMPLE_ANALYSIS)
+    assert app.parse_analysis(app.render_analysis_markdown(result)) == result
+    assert app.AnalysisResult.from_dict(result.to_dict()) == result
+
+
+def test_missing_sections_stay_empty():
+    result = app.parse_analysis('**JOB READINESS SCORE:**\nScore: 140/100')
+    assert result.score == 100
+    assert (result.missing_skills, result.current_skills, result.roadmap, result.explanation) == ([], [], [], '')
+
+
+def test_sections_in_any_order():
+    text = '\n'.join([
+        '**EXPLANATION:** Strong backend profile.',
+        '**CURRENT SKILLS IDENTIFIED:**', '- Go',
+        '**JOB READINESS SCORE:**', 'Score: 75/100',
+        '**MISSING SKILLS:**', '- Kafka - Event streaming'
+    ])
+    result = app.parse_analysis(text)
+    assert result.explanation == 'Strong backend profile.'
+    assert result.current_skills == ['Go']
+    assert result.score == 75
+    assert result.missing_skills == [app.MissingSkill('Kafka', 'Event streaming')]
+
+
+def test_text_outside_known_sections_is_kept_in_notes():
+    result = app.parse_analysis('Error analyzing CV: rate limited\n**BONUS TIPS:**\nUse metrics')
+    assert result.notes == ['Error analyzing CV: rate limited', '**BONUS TIPS:**', 'Use metrics']
+
+
+def feed_in_chunks(text, size):
+    parser = app.AnalysisSectionParser()
+    sections = []
+    for start in range(0, len(text), size):
+        sections.extend(parser.feed(text[start:start + size]))
+    return sections + parser.finish()
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, len(SAMPLE_ANALYSIS)])
+def test_streamed_sections_match_the_full_parse(size):
+    sections = feed_in_chunks(SAMPLE_ANALYSIS, size)
+    assert [section['name'] for section in sections] == [
+        'missing_skills', 'current_skills', 'roadmap', 'score', 'explanation'
+    ]
+    parsed = app.parse_analysis(SAMPLE_ANALYSIS).to_dict()
+    for section in sections:
+        assert section['data'] == parsed[section['name']]
+
+
+def test_heading_split_across_chunks_is_recognized():
+    parser = app.AnalysisSectionParser()
+    assert parser.feed('**CURRENT SKI') == []
+    assert parser.feed('LLS IDENTIFIED:**\n- Python\n**JOB READ') == []
+    finished = parser.feed('INESS SCORE:**\nScore: 5')
+    assert [(section['name'], section['data']) for section in finished] == [('current_skills', ['Python'])]
+    # The last line has no newline: finish() must flush it
+    assert parser.feed('0/100') == []
+    assert [(section['name'], section['data']) for section in parser.finish()] == [('score', 50)]
+
+
+def test_unknown_sections_are_passed_through_without_data():
+    sections = feed_in_chunks('**BONUS TIPS:**\nUse metrics\n**EXPLANATION:**\nDone.', 5)
+    assert sections[0] == {'name': 'bonus_tips', 'title': 'BONUS TIPS', 'content': 'Use metrics'}
+    assert sections[1]['data'] == 'Done.'
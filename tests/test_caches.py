@@ -0,0 +1,232 @@
+import sqlite3
+
+import pytest
+
+import app
+from skillgap.caches import (
+    AnalysisResultCache, ByteBoundedLRUCache, ExtractedTextCache, SemanticAnalysisCache, SQLiteCacheBackend, SessionStore,
+    cosine_similarity, embed_cv_text
+)
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    return SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), table='test_cache')
+
+
+def test_byte_bounded_lru_evicts_least_recently_used():
+    cache = ByteBoundedLRUCache(10)
+    cache.set('a', b'1234')
+    cache.set('b', b'1234')
+    assert cache.get('a') == b'1234'
+    cache.set('c', b'1234')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234' and cache.get('c') == b'1234'
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['evictions']) == (2, 8, 1)
+
+
+def test_byte_bounded_lru_ignores_values_larger_than_the_budget():
+    cache = ByteBoundedLRUCache(4)
+    cache.set('big', b'12345')
+    assert cache.get('big') is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_byte_bounded_lru_replacing_a_key_keeps_the_byte_count():
+    cache = ByteBoundedLRUCache(10)
+    cache.set('a', b'123456')
+    cache.set('a', b'12')
+    assert cache.stats()['bytes'] == 2
+
+
+def test_sqlite_backend_expires_entries(sqlite_backend, clock):
+    sqlite_backend.set('key', 'value', ttl=10)
+    assert sqlite_backend.get('key') == 'value'
+    clock[0] += 11
+    assert sqlite_backend.get('key') is None
+
+
+def test_sqlite_backend_delete_and_purge(sqlite_backend, clock):
+    sqlite_backend.set('gone', 'value', ttl=10)
+    sqlite_backend.set('kept', 'value', ttl=100)
+    sqlite_backend.delete('gone')
+    assert sqlite_backend.get('gone') is None
+    clock[0] += 50
+    sqlite_backend.purge_expired()
+    assert sqlite_backend.get('kept') == 'value'
+
+
+def test_sqlite_backend_closes_every_connection(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracked_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, 'connect', tracked_connect)
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'))
+    backend.set('a', b'1', ttl=60)
+    assert backend.get('a') == b'1'
+    backend.delete('a')
+    backend.purge_expired()
+    assert len(opened) == 5
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError, match='closed'):
+            conn.execute('SELECT 1')
+
+
+def test_analysis_cache_expires_and_bounds_entries(clock):
+    cache = AnalysisResultCache(max_entries=2, ttl=60)
+    cache.set('a', 'A')
+    cache.set('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.set('c', 'C')
+    assert cache.get('b') is None
+    clock[0] += 61
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_analysis_cache_promotes_backend_hits(sqlite_backend):
+    writer = AnalysisResultCache(ttl=60, backend=sqlite_backend)
+    writer.set('key', 'analysis')
+    reader = AnalysisResultCache(ttl=60, backend=sqlite_backend)
+    assert reader.get('key') == 'analysis'
+    assert reader.get('key') == 'analysis'
+    stats = reader.stats()
+    assert (stats['backend_hits'], stats['hits'], stats['misses']) == (1, 1, 0)
+
+
+def test_analysis_cache_key_normalizes_whitespace_and_role_case():
+    key = app.make_analysis_cache_key('Python  developer\n with SQL', 'Data Scientist', model='m')
+    assert key == app.make_analysis_cache_key(' Python developer with   SQL ', '  data scientist', model='m')
+    assert key != app.make_analysis_cache_key('Python developer with SQL', 'Data Scientist', model='other')
+    assert key != app.make_analysis_cache_key('Python developer with SQL', 'Data Scientist', model='m', output_format='json')
+
+
+def test_session_store_round_trip_and_update():
+    store = SessionStore(max_entries=10, max_bytes=1 << 20, ttl=60)
+    store.put('s1', {'target_role': 'Data Scientist', 'result': {'score': 72}})
+    assert store.get('s1') == {'target_role': 'Data Scientist', 'result': {'score': 72}}
+    assert store.update('s1', pdf_ready=True)
+    assert store.get('s1')['pdf_ready'] is True
+    assert not store.update('missing', pdf_ready=True)
+
+
+def test_session_store_evicts_by_count_and_bytes():
+    store = SessionStore(max_entries=2, max_bytes=1 << 20, ttl=60)
+    for session_id in ('s1', 's2', 's3'):
+        store.put(session_id, {'id': session_id})
+    assert store.get('s1') is None
+    assert store.stats()['evictions'] == 1
+
+    blob_size = len(SessionStore._pack({'id': 'x' * 200}))
+    store = SessionStore(max_entries=10, max_bytes=blob_size * 2, ttl=60)
+    for session_id in ('s1', 's2', 's3'):
+        store.put(session_id, {'id': session_id + 'x' * 198})
+    assert store.get('s1') is None
+    assert store.stats()['bytes'] <= blob_size * 2
+
+
+def test_session_store_expires_sessions(clock):
+    store = SessionStore(ttl=60)
+    store.put('s1', {'a': 1})
+    clock[0] += 61
+    assert store.get('s1') is None
+    assert store.stats()['expirations'] == 1
+
+
+def test_session_store_expires_lazily_from_the_lru_front(clock):
+    store = SessionStore(ttl=60)
+    store.put('old', {'a': 1})
+    clock[0] += 30
+    store.put('recent', {'b': 2})
+    store.get('old')
+    clock[0] += 31
+    # 'old' expired but was read after 'recent', so it sits behind a live entry and stays until it is touched
+    store.put('new', {'c': 3})
+    assert store.stats()['entries'] == 3
+    assert store.get('old') is None
+    clock[0] += 30
+    store.put('newest', {'d': 4})
+    stats = store.stats()
+    assert (stats['entries'], stats['expirations']) == (2, 2)
+    assert store.get('recent') is None and store.get('new') == {'c': 3}
+
+
+def test_session_store_reads_sessions_written_by_another_worker(sqlite_backend):
+    SessionStore(ttl=60, backend=sqlite_backend).put('s1', {'a': 1})
+    other = SessionStore(ttl=60, backend=sqlite_backend)
+    assert other.get('s1') == {'a': 1}
+    assert other.stats()['backend_hits'] == 1
+
+
+def test_extracted_text_cache_levels(sqlite_backend):
+    cache = ExtractedTextCache(1 << 20, ttl=60, backend=sqlite_backend)
+    assert cache.get('digest') == (None, None)
+    cache.set('digest', 'Ünïcode CV text')
+    assert cache.get('digest') == ('Ünïcode CV text', 'hit')
+
+    other = ExtractedTextCache(1 << 20, ttl=60, backend=sqlite_backend)
+    assert other.get('digest') == ('Ünïcode CV text', 'backend_hit')
+    assert other.get('digest') == ('Ünïcode CV text', 'hit')
+    stats = other.stats()
+    assert (stats['hits'], stats['backend_hits'], stats['misses']) == (1, 1, 0)
+
+
+CV_TEXT = ' '.join(
+    f'Built service {index} in Python and Go, cut its p95 latency by {index * 3} percent and mentored {index % 4} engineers.'
+    for index in range(20)
+)
+# The same CV with one typo fixed
+NEAR_DUPLICATE = CV_TEXT.replace('service 7 in', 'services 7 in')
+OTHER_CV = ' '.join(f'Taught class {index} of chemistry and ran {index + 2} lab sessions a week.' for index in range(20))
+
+
+def test_semantic_cache_hits_a_near_duplicate_at_the_threshold():
+    similarity = cosine_similarity(embed_cv_text(CV_TEXT)[0], embed_cv_text(NEAR_DUPLICATE)[0])
+    assert 0.9 < similarity < 1.0
+    cache = SemanticAnalysisCache(threshold=similarity)
+    cache.add(embed_cv_text(CV_TEXT), 'Backend Developer', 'analysis')
+    assert cache.get(embed_cv_text(NEAR_DUPLICATE), ' backend  developer ') == ('analysis', round(similarity, 4))
+    assert cache.stats()['hits'] == 1
+
+
+def test_semantic_cache_misses_below_the_threshold():
+    similarity = cosine_similarity(embed_cv_text(CV_TEXT)[0], embed_cv_text(NEAR_DUPLICATE)[0])
+    cache = SemanticAnalysisCache(threshold=similarity + 1e-6)
+    cache.add(embed_cv_text(CV_TEXT), 'Backend Developer', 'analysis')
+    assert cache.get(embed_cv_text(NEAR_DUPLICATE), 'Backend Developer') is None
+    assert cache.get(embed_cv_text(OTHER_CV), 'Backend Developer') is None
+    assert cache.stats()['misses'] == 2
+
+
+def test_semantic_cache_never_matches_another_role_or_scope():
+    cache = SemanticAnalysisCache(threshold=0.5)
+    cache.add(embed_cv_text(CV_TEXT), 'Backend Developer', 'analysis', scope='large:markdown')
+    assert cache.get(embed_cv_text(CV_TEXT), 'Data Scientist', 'large:markdown') is None
+    assert cache.get(embed_cv_text(CV_TEXT), 'Backend Developer', 'fast:markdown') is None
+    assert cache.get(embed_cv_text(CV_TEXT), 'Backend Developer', 'large:markdown') == ('analysis', 1.0)
+
+
+def test_lookup_reports_semantic_hits_and_promotes_them(monkeypatch):
+    monkeypatch.setattr(app, 'analysis_result_cache', AnalysisResultCache(ttl=60))
+    monkeypatch.setattr(app, 'semantic_analysis_cache', SemanticAnalysisCache(threshold=0.9))
+    scope = app.semantic_cache_scope(app.cache_model_for(CV_TEXT))
+    app.semantic_analysis_cache.add(embed_cv_text(CV_TEXT), 'Backend Developer', 'analysis', scope)
+
+    details = {}
+    analysis, _, embedding = app.lookup_cached_analysis(NEAR_DUPLICATE, 'Backend Developer', details)
+    assert analysis == 'analysis' and embedding is not None
+    assert details['cache'] == 'semantic' and details['cache_similarity'] >= 0.9
+
+    details = {}
+    assert app.lookup_cached_analysis(NEAR_DUPLICATE, 'Backend Developer', details)[0] == 'analysis'
+    assert details['cache'] == 'exact'
+
+    details = {}
+    assert app.lookup_cached_analysis(NEAR_DUPLICATE, 'Data Scientist', details)[0] is None
+    assert details['cache'] == 'miss'
@@ -0,0 +1,117 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import app
+from cpu_tasks import fail, sleep_for, worker_pid
+from skillgap import workers
+from skillgap.workers import CPUPoolBusy, CPUTaskTimeout, CPUWorkerPool
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(workers=1, max_queue=4, task_timeout=5.0, max_tasks_per_worker=100, **kwargs):
+        pool = CPUWorkerPool(workers, max_queue, task_timeout, max_tasks_per_worker, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_runs_tasks_in_worker_processes(make_pool):
+    pool = make_pool()
+    assert pool.run('sleep', sleep_for, 0) == 0
+    assert pool.run('pid', worker_pid) != multiprocessing.current_process().pid
+    stats = pool.stats()
+    assert (stats['completed'], stats['inline'], stats['pending']) == (2, 0, 0)
+
+
+def test_task_errors_reach_the_caller(make_pool):
+    pool = make_pool()
+    with pytest.raises(ValueError, match='broken'):
+        pool.run('fail', fail, 'broken')
+    assert pool.run('sleep', sleep_for, 0) == 0
+    assert pool.stats()['failed'] == 1
+
+
+def test_timeout_terminates_the_stuck_worker_and_the_pool_recovers(make_pool):
+    pool = make_pool(task_timeout=0.5)
+    pool.run('warm', sleep_for, 0)
+    with pytest.raises(CPUTaskTimeout):
+        pool.run('stuck', sleep_for, 30)
+    assert wait_until(lambda: pool.stats()['terminated'] == 1)
+    assert pool.run('after', sleep_for, 0) == 0
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_timeout_does_not_kill_other_callers_tasks(make_pool):
+    pool = make_pool(workers=2, task_timeout=10.0)
+    pool.warm()
+    outcome = {}
+
+    def innocent():
+        try:
+            outcome['result'] = pool.run('innocent', sleep_for, 1.5)
+        except Exception as e:
+            outcome['result'] = e
+
+    thread = threading.Thread(target=innocent)
+    thread.start()
+    time.sleep(0.3)
+    with pytest.raises(CPUTaskTimeout):
+        pool.run('stuck', sleep_for, 30, timeout=0.5)
+    thread.join(10)
+    assert outcome['result'] == 1.5
+    assert wait_until(lambda: pool.stats()['terminated'] == 1)
+    stats = pool.stats()
+    assert (stats['failed'], stats['inline']) == (0, 0)
+
+
+def test_workers_are_recycled_after_max_tasks(make_pool):
+    pool = make_pool(max_tasks_per_worker=2)
+    pids = [pool.run('pid', worker_pid) for _ in range(5)]
+    assert len(set(pids)) >= 3
+
+
+def test_rejects_with_retry_after_when_busy(make_pool):
+    pool = make_pool(max_queue=0, queue_timeout=0.2, retry_after=7)
+    running = pool.submit('sleep', sleep_for, 1)
+    with pytest.raises(app.ServerBusyError) as busy:
+        pool.run('extra', sleep_for, 0)
+    assert isinstance(busy.value, CPUPoolBusy) and busy.value.retry_after == 7
+    assert running.result(10) == 1
+    assert pool.run('extra', sleep_for, 0) == 0
+    assert pool.stats()['rejected'] == 1
+
+
+def test_queued_task_waits_for_a_free_slot(make_pool):
+    pool = make_pool(max_queue=0, queue_timeout=5.0)
+    running = pool.submit('sleep', sleep_for, 0.3)
+    assert pool.run('next', sleep_for, 0) == 0
+    assert running.result(5) == 0.3
+
+
+def test_pools_without_max_tasks_per_child_still_use_processes(make_pool, monkeypatch):
+    def executor_without_recycling(max_tasks_per_child=None, **kwargs):
+        if max_tasks_per_child is not None:
+            raise TypeError("unexpected keyword argument 'max_tasks_per_child'")
+        return ProcessPoolExecutor(**kwargs)
+
+    monkeypatch.setattr(workers, 'ProcessPoolExecutor', executor_without_recycling)
+    pool = make_pool()
+    assert pool.run('pid', worker_pid) != multiprocessing.current_process().pid
+    assert pool.stats()['inline'] == 0
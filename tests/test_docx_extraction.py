@@ -0,0 +1,93 @@
+from io import BytesIO
+
+import docx
+import pytest
+
+import app
+
+
+def save(document):
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_lines(data):
+    """Reading-order lines built with python-docx: headers, body paragraphs and table rows, footers."""
+    document = docx.Document(BytesIO(data))
+    lines = []
+    for section in document.sections:
+        lines.extend(paragraph.text for paragraph in section.header.paragraphs)
+    for block in document.element.body.iterchildren():
+        if block.tag == f'{app.WORD_NAMESPACE}p':
+            lines.append(docx.text.paragraph.Paragraph(block, document).text)
+        elif block.tag == f'{app.WORD_NAMESPACE}tbl':
+            for row in docx.table.Table(block, document).rows:
+                lines.append('\t'.join(
+                    ' '.join(paragraph.text for paragraph in cell.paragraphs if paragraph.text.strip())
+                    for cell in row.cells
+                ))
+    for section in document.sections:
+        lines.extend(paragraph.text for paragraph in section.footer.paragraphs)
+    return lines
+
+
+@pytest.fixture
+def cv_docx():
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = 'Jane Doe · jane@example.com'
+    document.add_heading('Experience', level=1)
+    paragraph = document.add_paragraph('Backend engineer: ')
+    paragraph.add_run('Python').bold = True
+    paragraph.add_run(', SQL and Docker')
+    run = document.add_paragraph().add_run('Skills')
+    run.add_tab()
+    run.add_text('Kubernetes')
+    run.add_break()
+    run.add_text('Résumé — Ünïcode ✓')
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Languages'
+    table.cell(0, 1).text = 'Python, Go'
+    table.cell(1, 0).text = 'Cloud'
+    table.cell(1, 1).text = 'AWS'
+    table.cell(1, 1).add_paragraph('GCP')
+    document.add_paragraph('')
+    document.add_paragraph('References available on request.')
+    document.sections[0].footer.paragraphs[0].text = 'Page footer'
+    return save(document)
+
+
+def test_body_paragraphs_match_python_docx():
+    document = docx.Document()
+    for text in ('Summary', 'Python and SQL developer', '', 'Ünïcode — “quotes”'):
+        document.add_paragraph(text)
+    data = save(document)
+    assert app.extract_docx_xml_text(data)['text'] == app.extract_docx_paragraph_text(data)
+
+
+def test_reading_order_matches_python_docx(cv_docx):
+    result = app.extract_docx_xml_text(cv_docx)
+    assert result['text'] == '\n'.join(python_docx_lines(cv_docx)) + '\n'
+    assert result['parts'] == 3 and not result['truncated']
+
+
+def test_xml_text_is_a_superset_of_python_docx_paragraphs(cv_docx):
+    lines = app.extract_docx_xml_text(cv_docx)['text'].split('\n')
+    for paragraph in app.extract_docx_paragraph_text(cv_docx).split('\n'):
+        assert paragraph in lines
+
+
+def test_stops_at_the_character_budget(cv_docx):
+    result = app.extract_docx_xml_text(cv_docx, max_chars=40)
+    assert result['truncated']
+    assert len(result['text']) < len(app.extract_docx_xml_text(cv_docx)['text'])
+
+
+def test_falls_back_to_python_docx_for_unreadable_xml(monkeypatch, cv_docx):
+    def broken(source, max_chars=None):
+        raise ValueError('unreadable')
+
+    monkeypatch.setattr(app, 'extract_docx_xml_text', broken)
+    stats = {}
+    assert app.extract_text_from_docx(cv_docx, stats) == app.extract_docx_paragraph_text(cv_docx)
+    assert stats['engine'] == 'python-docx'
@@ -0,0 +1,163 @@
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import app
+from skillgap.concurrency import ServerBusyError
+from skillgap.jobs import JobQueue, JobWorkerPool
+
+
+@pytest.fixture
+def job_queue(tmp_path, clock):
+    return JobQueue(str(tmp_path / 'jobs.sqlite3'), max_queue=3, lease_seconds=30, max_attempts=2, result_ttl=60)
+
+
+def test_claim_runs_jobs_by_priority_then_age(job_queue, clock):
+    job_queue.enqueue('low', 'k1', {'n': 1}, app.JOB_PRIORITIES['low'])
+    clock[0] += 1
+    job_queue.enqueue('normal', 'k2', {'n': 2}, app.JOB_PRIORITIES['normal'])
+    clock[0] += 1
+    job_queue.enqueue('high', 'k3', {'n': 3}, app.JOB_PRIORITIES['high'])
+    assert job_queue.get('low')['queue_position'] == 3
+    assert [job_queue.claim()['id'] for _ in range(3)] == ['high', 'normal', 'low']
+    assert job_queue.claim() is None
+
+
+def test_enqueue_deduplicates_and_rejects_when_full(job_queue):
+    assert job_queue.enqueue('a', 'same', {}, 5) == ('a', False)
+    assert job_queue.enqueue('b', 'same', {}, 5) == ('a', True)
+    job_queue.enqueue('c', 'k2', {}, 5)
+    job_queue.enqueue('d', 'k3', {}, 5)
+    with pytest.raises(ServerBusyError) as busy:
+        job_queue.enqueue('e', 'k4', {}, 5)
+    assert busy.value.retry_after == 5
+    assert job_queue.stats()['deduplicated'] == 1 and job_queue.stats()['rejected'] == 1
+
+
+def test_complete_stores_the_result_and_drops_the_payload(job_queue):
+    job_queue.enqueue('a', 'k', {'cv_text': 'secret'}, 5)
+    job = job_queue.claim()
+    assert job == {'id': 'a', 'payload': {'cv_text': 'secret'}, 'attempts': 1}
+    assert job_queue.complete('a', job['attempts'], {'score': 80})
+    state = job_queue.get('a')
+    assert (state['status'], state['result']) == ('done', {'score': 80})
+    with sqlite3.connect(job_queue.path) as conn:
+        assert conn.execute("SELECT payload FROM jobs WHERE id = 'a'").fetchone()[0] == ''
+
+
+def test_fail_records_the_error(job_queue):
+    job_queue.enqueue('a', 'k', {}, 5)
+    job = job_queue.claim()
+    assert job_queue.fail('a', job['attempts'], 'boom')
+    state = job_queue.get('a')
+    assert (state['status'], state['error']) == ('error', 'boom')
+
+
+def test_expired_lease_is_claimed_again_and_fences_the_old_attempt(job_queue, clock):
+    job_queue.enqueue('a', 'k', {}, 5)
+    first = job_queue.claim()
+    assert job_queue.claim() is None
+    clock[0] += 31
+    second = job_queue.claim()
+    assert (second['id'], second['attempts']) == ('a', 2)
+    assert not job_queue.renew('a', first['attempts'])
+    assert not job_queue.complete('a', first['attempts'], {'stale': True})
+    assert not job_queue.fail('a', first['attempts'], 'stale')
+    assert job_queue.complete('a', second['attempts'], {'fresh': True})
+    assert job_queue.get('a')['result'] == {'fresh': True}
+    assert not job_queue.fail('a', second['attempts'], 'after done')
+
+
+def test_renew_keeps_a_long_running_job(job_queue, clock):
+    job_queue.enqueue('a', 'k', {}, 5)
+    job = job_queue.claim()
+    clock[0] += 20
+    assert job_queue.renew('a', job['attempts'])
+    clock[0] += 20
+    assert job_queue.claim() is None
+
+
+def test_jobs_interrupted_too_often_are_abandoned(job_queue, clock):
+    job_queue.enqueue('a', 'k', {}, 5)
+    job_queue.claim()
+    clock[0] += 31
+    job_queue.claim()
+    clock[0] += 31
+    assert job_queue.claim() is None
+    state = job_queue.get('a')
+    assert state['status'] == 'error' and 'interrupted 2 times' in state['error']
+
+
+def test_finished_jobs_are_purged_after_the_result_ttl(job_queue, clock):
+    job_queue.enqueue('a', 'k1', {}, 5)
+    job_queue.complete('a', job_queue.claim()['attempts'], {})
+    clock[0] += 61
+    job_queue.enqueue('b', 'k2', {}, 5)
+    assert job_queue.get('a') is None
+
+
+def test_failed_begin_is_reported_without_a_rollback_error(job_queue, monkeypatch):
+    blocker = sqlite3.connect(job_queue.path, isolation_level=None)
+    blocker.execute('BEGIN IMMEDIATE')
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, 'connect', lambda *args, **kwargs: connect(*args, **dict(kwargs, timeout=0.05)))
+    try:
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            job_queue.enqueue('a', 'k', {}, 5)
+    finally:
+        blocker.execute('ROLLBACK')
+        blocker.close()
+
+
+def test_worker_pool_runs_jobs_and_counts_stale_results(tmp_path):
+    job_queue = JobQueue(str(tmp_path / 'pool.sqlite3'), lease_seconds=30)
+    started = threading.Event()
+    release = threading.Event()
+
+    def handler(job_id, payload):
+        started.set()
+        release.wait(5)
+        return {'job': job_id}
+
+    pool = JobWorkerPool(job_queue, handler, workers=1, poll_interval=0.05)
+    job_queue.enqueue('a', 'k', {}, 5)
+    pool.start()
+    assert started.wait(5)
+    # Another worker took the job over meanwhile: this attempt must not overwrite it
+    with sqlite3.connect(job_queue.path) as conn:
+        conn.execute("UPDATE jobs SET attempts = attempts + 1 WHERE id = 'a'")
+    release.set()
+    deadline = time.monotonic() + 5
+    while pool.stats()['stale'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert pool.stats()['stale'] == 1 and pool.stats()['completed'] == 0
+    assert job_queue.get('a')['status'] == 'running'
+
+
+def test_stats_and_metrics_do_not_open_the_job_queue(tmp_path, monkeypatch):
+    path = tmp_path / 'never.sqlite3'
+    monkeypatch.setattr(app, 'JOB_QUEUE_PATH', str(path))
+    monkeypatch.setattr(app, '_job_queue', None)
+    monkeypatch.setattr(app, '_job_workers', None)
+    client = app.app.test_client()
+    assert client.get('/stats').get_json()['jobs'] is None
+    assert b'skillgap_jobs' not in client.get('/metrics').data
+    assert not path.exists()
+
+
+def test_queued_job_payload_leaves_the_skill_profile_to_the_worker(tmp_path, monkeypatch):
+    job_queue = JobQueue(str(tmp_path / 'analyze.sqlite3'))
+    monkeypatch.setattr(app, 'get_job_queue', lambda: job_queue)
+    # Nothing drains the queue: the test claims the job itself
+    monkeypatch.setattr(app, 'get_job_workers', lambda: SimpleNamespace(start=lambda: None, notify=lambda: None))
+    response = app.app.test_client().post('/analyze?mode=job', data={
+        'target_role': 'Backend Developer',
+        'cv_text': 'Backend developer with five years of Python, Django, PostgreSQL and Docker experience.'
+    })
+    assert response.status_code == 202
+    job = job_queue.claim()
+    assert job['id'] == response.get_json()['job_id']
+    assert 'skill_profile' not in job['payload']['details']
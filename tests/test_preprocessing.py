@@ -0,0 +1,89 @@
+from io import BytesIO
+
+import pytest
+
+import app
+
+
+def make_pdf(pages):
+    """Builds a PDF whose pages hold the given lines, one drawString per line."""
+    canvas = pytest.importorskip('reportlab.pdfgen.canvas')
+    buffer = BytesIO()
+    document = canvas.Canvas(buffer)
+    for lines in pages:
+        for row, line in enumerate(lines):
+            document.drawString(72, 780 - 18 * row, line)
+        document.showPage()
+    document.save()
+    return buffer.getvalue()
+
+
+def test_strips_page_numbers_only_at_page_edges():
+    pages = ['Jane Doe\nExperience\nAcme\n1', 'Skills\n2 of 3\nPython', 'Page 3\nEducation\nMSc\n4/7']
+    assert app.strip_page_furniture(pages) == ['Jane Doe\nExperience\nAcme', 'Skills\nPython', 'Education\nMSc']
+
+
+def test_years_are_not_page_numbers():
+    pages = ['2018\nAcme Corp\nEngineer', 'Globex\nLead\n2019/2023']
+    assert app.strip_page_furniture(pages) == pages
+
+
+def test_running_header_and_footer_keep_their_first_copy():
+    body = ['Summary\nBuilds APIs', 'Experience\nAcme', 'Education\nMSc']
+    pages = [f'Jane Doe - CV\n{text}\nConfidential' for text in body]
+    assert app.strip_page_furniture(pages) == [
+        'Jane Doe - CV\nSummary\nBuilds APIs\nConfidential',
+        'Experience\nAcme',
+        'Education\nMSc'
+    ]
+
+
+def test_lines_repeated_inside_pages_are_kept():
+    pages = [f'Role {index}\nAcme {index}\nLead {index}\n2018\nResponsibilities:\n- Task {index}\nTeam {index}\nEnd {index}'
+             for index in range(3)]
+    assert app.strip_page_furniture(pages) == pages
+
+
+def test_single_page_keeps_everything_but_its_page_number():
+    assert app.strip_page_furniture(['Jane Doe\nPython\nJane Doe\n1']) == ['Jane Doe\nPython\nJane Doe']
+
+
+def test_extract_pdf_pages_strips_furniture():
+    pages = [['Jane Doe - CV', f'Section {index}', f'Company {index}', '2018', f'Role {index}', f'Team {index}',
+              f'Page {index + 1} of 3'] for index in range(3)]
+    result = app.extract_pdf_pages(make_pdf(pages), workers=1)
+    lines = result['text'].split('\n')
+    assert lines.count('Jane Doe - CV') == 1
+    assert lines.count('2018') == 3
+    assert not any(line.startswith('Page ') for line in lines)
+    assert result['pages_processed'] == 3
+
+
+def test_preprocess_keeps_years_and_repeated_headings():
+    text = '\n'.join([
+        'Jane Doe', '', 'Acme Corp', '2019/2023', 'Responsibilities:', '- Built APIs', '',
+        'Globex', '2018', 'Responsibilities:', '- Ran the team', '',
+        'Initech', '2016', 'Responsibilities:', '- Wrote tests'
+    ])
+    cleaned, _ = app.preprocess_cv_text(text, token_budget=0)
+    assert cleaned.count('Responsibilities:') == 3
+    assert '2019/2023' in cleaned and '\n2018\n' in cleaned and '\n2016\n' in cleaned
+
+
+def test_preprocess_leaves_pasted_page_like_lines_alone():
+    text = 'Skills\n\n3\n\nPython\n\n3\n\nSQL\n\n3'
+    cleaned, _ = app.preprocess_cv_text(text, token_budget=0)
+    assert cleaned == text
+
+
+def test_preprocess_drops_duplicate_paragraphs_but_not_headings():
+    section = 'Built the billing service\nand its reporting pipeline'
+    text = f'Experience\n\n{section}\n\nExperience\n\n{section}'
+    cleaned, _ = app.preprocess_cv_text(text, token_budget=0)
+    assert cleaned == f'Experience\n\n{section}\n\nExperience'
+
+
+def test_preprocess_normalizes_whitespace_and_truncates_to_the_budget():
+    cleaned, stats = app.preprocess_cv_text('Python\r\n\r\n\r\n  Django   Flask\x07\n' + 'word ' * 200, token_budget=20)
+    assert cleaned.startswith('Python\n\nDjango Flask\n')
+    assert stats['truncated'] and app.estimate_tokens(cleaned) <= 20
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from skillgap.resilience import CircuitBreaker, CircuitOpenError, ResilientGroqClient
+
+
+def status_error(status, retry_after=None):
+    headers = {'retry-after': retry_after} if retry_after is not None else {}
+    response = httpx.Response(status, headers=headers, request=httpx.Request('POST', 'https://api.groq.test'))
+    return groq.APIStatusError('upstream error', response=response, body=None)
+
+
+def fake_client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_breaker_opens_after_consecutive_failures_and_short_circuits(monotonic):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    monotonic[0] += 10
+    with pytest.raises(CircuitOpenError) as opened:
+        breaker.before_call()
+    assert opened.value.retry_after == pytest.approx(20)
+    assert breaker.stats()['times_opened'] == 1 and breaker.stats()['short_circuited'] == 1
+
+
+def test_breaker_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+
+def test_breaker_half_open_allows_one_trial(monotonic):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    monotonic[0] += 30
+    breaker.before_call()
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    breaker.before_call()
+
+
+def test_breaker_failed_trial_opens_again(monotonic):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    monotonic[0] += 30
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open' and breaker.stats()['times_opened'] == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_interrupted_trial_releases_the_half_open_slot(monotonic):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    monotonic[0] += 30
+
+    def interrupted(**kwargs):
+        raise KeyboardInterrupt
+
+    gateway = ResilientGroqClient(lambda: fake_client(interrupted), breaker=breaker)
+    with pytest.raises(KeyboardInterrupt):
+        gateway.create(model='m', messages=[])
+    assert breaker.state == 'half_open'
+    breaker.before_call()
+
+
+def test_cancelled_async_trial_releases_the_half_open_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    gateway = ResilientGroqClient(lambda: None, breaker=breaker)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang(**kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        call = asyncio.ensure_future(gateway.create_async(fake_client(hang), model='m', messages=[]))
+        await started.wait()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(scenario())
+    assert breaker.state == 'half_open'
+    breaker.before_call()
+
+
+def test_backoff_honors_retry_after_up_to_the_cap():
+    gateway = ResilientGroqClient(lambda: None, backoff_base=0.5, backoff_max=8.0)
+    assert gateway.backoff_delay(0, status_error(429, '2')) == 2.0
+    assert gateway.backoff_delay(0, status_error(429, '120')) == 8.0
+    for attempt in range(5):
+        assert 0 <= gateway.backoff_delay(attempt, status_error(503)) <= min(8.0, 0.5 * 2 ** attempt)
+    assert 0 <= gateway.backoff_delay(0, status_error(503, 'Wed, 21 Oct 2026 07:28:00 GMT')) <= 0.5
+
+
+def test_retries_retryable_errors_with_the_retry_after_delay(monkeypatch):
+    delays = []
+    monkeypatch.setattr(time, 'sleep', delays.append)
+    outcomes = [status_error(429, '3'), status_error(503, '1'), 'analysis']
+
+    def create(**kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    gateway = ResilientGroqClient(lambda: fake_client(create), max_retries=3)
+    assert gateway.create(model='m', messages=[]) == 'analysis'
+    assert delays == [3.0, 1.0]
+    stats = gateway.stats()
+    assert (stats['calls'], stats['retries'], stats['failures']) == (1, 2, 0)
+    assert stats['circuit_breaker']['state'] == 'closed'
+
+
+def test_non_retryable_errors_are_raised_at_once(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: pytest.fail('should not back off'))
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        raise status_error(400)
+
+    gateway = ResilientGroqClient(lambda: fake_client(create), max_retries=3)
+    with pytest.raises(groq.APIStatusError):
+        gateway.create(model='m', messages=[])
+    assert len(calls) == 1 and gateway.stats()['failures'] == 1
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+
+    def create(**kwargs):
+        raise status_error(502)
+
+    gateway = ResilientGroqClient(lambda: fake_client(create), max_retries=2,
+                                  breaker=CircuitBreaker(failure_threshold=10))
+    with pytest.raises(groq.APIStatusError):
+        gateway.create(model='m', messages=[])
+    stats = gateway.stats()
+    assert (stats['retries'], stats['failures']) == (2, 1)
+    assert stats['circuit_breaker']['consecutive_failures'] == 3
+
+
+def test_hedge_wins_when_the_primary_is_slow():
+    release = threading.Event()
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            release.wait(5)
+            return 'primary'
+        return 'hedge'
+
+    gateway = ResilientGroqClient(lambda: fake_client(create), hedge=True, hedge_min_samples=1)
+    gateway.latency.record(0.05)
+    try:
+        assert gateway.create(model='m', messages=[]) == 'hedge'
+    finally:
+        release.set()
+    stats = gateway.stats()
+    assert (stats['hedged'], stats['hedge_wins']) == (1, 1)
+
+
+def test_no_hedge_when_the_primary_is_fast():
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return 'primary'
+
+    gateway = ResilientGroqClient(lambda: fake_client(create), hedge=True, hedge_min_samples=1)
+    gateway.latency.record(1.0)
+    assert gateway.create(model='m', messages=[]) == 'primary'
+    assert len(calls) == 1 and gateway.stats()['hedged'] == 0
+
+
+def test_async_hedge_cancels_the_losing_request():
+    gateway = ResilientGroqClient(lambda: None, hedge=True, hedge_min_samples=1)
+    gateway.latency.record(0.05)
+    cancelled = []
+
+    async def scenario():
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                return 'primary'
+            return 'hedge'
+
+        result = await gateway.create_async(fake_client(create), model='m', messages=[])
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == 'hedge'
+    assert cancelled == [True] and gateway.stats()['hedge_wins'] == 1
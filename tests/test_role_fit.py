@@ -0,0 +1,54 @@
+import pytest
+
+import app
+from skill_taxonomy import ROLE_REQUIREMENTS, SKILLS
+from skillgap import matching
+
+
+def reference_rank(found):
+    """Ranks roles with the per-role formula of heuristic_readiness_score()."""
+    ranked = []
+    for role, requirements in ROLE_REQUIREMENTS.items():
+        if role == 'General Professional Role':
+            continue
+        coverage = sum(weight for skill, weight in requirements.items() if skill in found) / sum(requirements.values())
+        extra = len(found) - sum(1 for skill in requirements if skill in found)
+        ranked.append((role, round(coverage, 3), max(0, min(100, int(round(10 + 85 * coverage + min(5, extra)))))))
+    return sorted(ranked, key=lambda item: -item[1])
+
+
+SAMPLES = [
+    set(),
+    {'Python', 'SQL', 'Docker'},
+    set(list(SKILLS)[:12]),
+    set(SKILLS),
+]
+
+
+def test_python_backend_is_the_default():
+    assert app.ROLE_FIT_BACKEND == 'python'
+    assert app.get_role_fit_index()._np is None
+
+
+@pytest.mark.parametrize('found', SAMPLES)
+def test_python_backend_matches_reference(found):
+    ranked = matching.RoleFitIndex(SKILLS, ROLE_REQUIREMENTS).rank(found)
+    assert {(role, coverage, score) for role, coverage, score in ranked} == set(reference_rank(found))
+    assert [coverage for _, coverage, _ in ranked] == sorted((coverage for _, coverage, _ in ranked), reverse=True)
+
+
+def test_numpy_backend_falls_back_without_numpy(monkeypatch):
+    lazy_import = matching.lazy_import
+    monkeypatch.setattr(matching, 'lazy_import', lambda name, optional=False: None if name == 'numpy' else lazy_import(name, optional))
+    index = matching.RoleFitIndex(SKILLS, ROLE_REQUIREMENTS, backend='numpy')
+    assert index._np is None
+    found = {'Python', 'SQL', 'Docker'}
+    assert index.rank(found) == matching.RoleFitIndex(SKILLS, ROLE_REQUIREMENTS).rank(found)
+
+
+@pytest.mark.parametrize('found', SAMPLES)
+def test_numpy_backend_matches_python_backend(found):
+    pytest.importorskip('numpy')
+    index = matching.RoleFitIndex(SKILLS, ROLE_REQUIREMENTS, backend='numpy')
+    assert index._np is not None
+    assert index.rank(found) == matching.RoleFitIndex(SKILLS, ROLE_REQUIREMENTS).rank(found)
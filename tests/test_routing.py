@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from skillgap.resilience import CircuitBreaker, ResilientGroqClient
+from skillgap.routing import ModelRouter
+
+REQUEST = httpx.Request('POST', 'https://api.groq.test')
+
+
+def gateway(outcomes):
+    """ResilientGroqClient over a fake client that returns or raises the queued outcomes in turn."""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        outcome = outcomes.pop(0) if outcomes else kwargs['model']
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    resilient = ResilientGroqClient(lambda: client, max_retries=0, breaker=CircuitBreaker(failure_threshold=100))
+    resilient.calls_made = calls
+    return resilient
+
+
+def make_router(large_outcomes=(), queue_depth=None):
+    gateways = {'large': gateway(list(large_outcomes)), 'fast': gateway([])}
+    return ModelRouter(gateways, {'large': 'large-model', 'fast': 'fast-model'}, {'large': 1500, 'fast': 1200},
+                       short_cv_tokens=250, latency_slo=2.0, busy_queue=8, cooldown=30.0, queue_depth=queue_depth)
+
+
+def test_short_cvs_go_to_the_fast_model():
+    router = make_router()
+    route = router.choose(100)
+    assert (route.tier, route.reason, route.max_tokens, route.cacheable) == ('fast', 'short_cv', 1200, True)
+    route = router.choose(1000)
+    assert (route.tier, route.reason, route.cacheable) == ('large', 'default', True)
+
+
+def test_routing_disabled_always_uses_the_large_model():
+    router = make_router()
+    router.enabled = False
+    assert (router.choose(100).tier, router.choose(100).reason) == ('large', 'routing_disabled')
+
+
+def test_busy_queue_drains_through_the_fast_model():
+    depth = [0]
+    router = make_router(queue_depth=lambda: depth[0])
+    assert router.choose(1000).reason == 'default'
+    depth[0] = 8
+    route = router.choose(1000)
+    assert (route.tier, route.reason, route.cacheable) == ('fast', 'load', False)
+
+
+def test_large_model_failure_falls_back_and_cools_down(monotonic):
+    error = groq.APIStatusError('rate limited', response=httpx.Response(429, request=REQUEST), body=None)
+    router = make_router([error])
+    completion, route = router.complete(router.choose(1000), messages=[])
+    assert completion == 'fast-model' and (route.reason, route.fallback) == ('fallback', True)
+    assert router.gateways['large'].calls_made[0]['timeout'] == 2.0
+    assert (router.choose(1000).tier, router.choose(1000).reason) == ('fast', 'cooldown')
+    monotonic[0] += 30
+    assert router.choose(1000).reason == 'default'
+    assert router.stats()['fallbacks'] == 1
+
+
+def test_non_retryable_errors_do_not_fall_back():
+    error = groq.APIStatusError('bad request', response=httpx.Response(400, request=REQUEST), body=None)
+    router = make_router([error])
+    with pytest.raises(groq.APIStatusError):
+        router.complete(router.choose(1000), messages=[])
+    assert router.choose(1000).reason == 'default'
+
+
+def test_timeouts_count_as_samples_at_the_slo(monotonic):
+    router = make_router([groq.APITimeoutError(request=REQUEST)])
+    for _ in range(9):
+        router.gateways['large'].latency.record(0.5)
+    _, route = router.complete(router.choose(1000), messages=[])
+    assert route.fallback
+    assert router.gateways['large'].latency.percentile(95) == 2.0
+    assert router.choose(1000).reason == 'slo'
+    assert router.stats()['large_model_degraded'] == 'slo'
+
+
+def test_slow_large_model_trips_the_slo_until_it_recovers(monotonic):
+    router = make_router()
+    latency = router.gateways['large'].latency
+    for _ in range(10):
+        latency.record(2.5)
+    route = router.choose(1000)
+    completion, served = router.complete(route, messages=[])
+    router.record(served, 2.5)
+    assert completion == 'large-model' and router.choose(1000).reason == 'slo'
+
+    monotonic[0] += 30
+    assert router.choose(1000).reason == 'default'
+    for _ in range(200):
+        latency.record(0.5)
+    router.record(router.choose(1000), 0.5)
+    assert router.choose(1000).reason == 'default'
@@ -0,0 +1,48 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from skillgap import serialization
+from skillgap.serialization import decode_json, encode_json, safe_encode
+
+PAYLOADS = [
+    {'analysis': 'Découvrez — 日本語 ✅', 'score': 68, 'ratio': 0.125, 'ok': True, 'missing': None},
+    {1: 'int key', 2.5: 'float key', True: 'bool key', None: 'none key'},
+    {'nested': [{'a': [1, 2, {'b': []}]}, (3, 4)], 'empty': {}},
+    {'created': datetime(2026, 10, 16, 9, 30, 5), 'day': date(2026, 10, 16), 'at': time(14, 5)},
+    {'aware': datetime(2026, 10, 16, 9, 30, 5, 250, tzinfo=timezone(timedelta(hours=2)))},
+    ['line\nbreak', 'quote "', 'tab\t', '\x00'],
+]
+
+
+@pytest.fixture
+def stdlib_json(monkeypatch):
+    monkeypatch.setattr(serialization, 'get_orjson', lambda: None)
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_stdlib_output_matches_orjson(payload, monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    expected = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    monkeypatch.setattr(serialization, 'get_orjson', lambda: None)
+    assert encode_json(payload) == expected
+
+
+def test_stdlib_encoding_is_compact_utf8(stdlib_json):
+    assert encode_json({'a': [1, 'é']}) == '{"a":[1,"é"]}'.encode('utf-8')
+    assert encode_json({'when': datetime(2026, 1, 2, 3, 4)}) == b'{"when":"2026-01-02T03:04:00"}'
+
+
+def test_lone_surrogates_are_replaced_like_safe_encode():
+    broken = 'bad \ud800 text'
+    assert decode_json(encode_json({'text': broken})) == {'text': safe_encode(broken)}
+
+
+def test_unsupported_values_raise_type_error(stdlib_json):
+    with pytest.raises(TypeError):
+        encode_json({'value': object()})
+
+
+def test_decode_round_trip():
+    assert decode_json(encode_json(PAYLOADS[0])) == PAYLOADS[0]
+    assert decode_json(encode_json(PAYLOADS[0]).decode('utf-8')) == PAYLOADS[0]
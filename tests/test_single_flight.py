@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from skillgap.concurrency import FlightAbandoned, SingleFlight
+
+
+def run_followers(flight, key, count, fn):
+    """Starts count threads calling flight.do(key, fn); returns (threads, outcomes list)."""
+    outcomes = []
+
+    def follow():
+        try:
+            outcomes.append(flight.do(key, fn))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=follow) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_followers(flight, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.stats()['coalesced'] < count:
+        if time.monotonic() >= deadline:
+            pytest.fail('followers never joined the flight')
+        time.sleep(0.01)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return 'analysis'
+
+    leader, leader_outcome = run_followers(flight, 'cv', 1, work)
+    while not calls:
+        time.sleep(0.01)
+    followers, outcomes = run_followers(flight, 'cv', 4, work)
+    wait_for_followers(flight, 4)
+    release.set()
+    for thread in leader + followers:
+        thread.join(5)
+    assert len(calls) == 1
+    assert leader_outcome == [('analysis', False)]
+    assert outcomes == [('analysis', True)] * 4
+    stats = flight.stats()
+    assert (stats['in_flight'], stats['leaders'], stats['coalesced'], stats['coalesced_ratio']) == (0, 1, 4, 0.8)
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+    # Finished flights are forgotten: the next caller leads again
+    assert flight.do('a', lambda: 3) == (3, False)
+    assert flight.stats()['leaders'] == 3
+
+
+def test_leader_error_reaches_every_follower():
+    flight = SingleFlight()
+    call, leader = flight.begin('cv')
+    assert leader
+    followers, outcomes = run_followers(flight, 'cv', 3, lambda: pytest.fail('followers must not run'))
+    wait_for_followers(flight, 3)
+    error = ValueError('upstream failed')
+    flight.finish('cv', call, error=error)
+    for thread in followers:
+        thread.join(5)
+    assert outcomes == [error] * 3
+
+
+def test_abandoned_leader_hands_the_work_to_a_follower():
+    flight = SingleFlight()
+    call, leader = flight.begin('cv')
+    assert leader
+    calls = []
+
+    def work():
+        calls.append(1)
+        return 'analysis'
+
+    followers, outcomes = run_followers(flight, 'cv', 3, work)
+    wait_for_followers(flight, 3)
+    flight.finish('cv', call, error=FlightAbandoned())
+    for thread in followers:
+        thread.join(5)
+    # One follower became the new leader; the others either shared its result or led after it finished
+    assert len(outcomes) == 3 and all(value == 'analysis' for value, _ in outcomes)
+    assert 1 <= len(calls) == sum(not shared for _, shared in outcomes)
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_wait_makes_the_caller_lead_when_nobody_is_running():
+    flight = SingleFlight()
+    call, value = flight.wait('cv')
+    assert call is not None and value is None
+    flight.finish('cv', call, value='analysis')
+    assert call.result() == 'analysis'
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+import app
+from skill_taxonomy import SKILLS
+from skillgap.matching import SkillMatcher
+
+
+def substring_scan(skills, text):
+    """Straightforward reference: look up every alias with str.find and check word boundaries."""
+    text = text.lower()
+    found = {}
+    for skill, aliases in skills.items():
+        for alias in set(alias.lower() for alias in aliases):
+            start = text.find(alias)
+            while start != -1:
+                end = start + len(alias)
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    found[skill] = found.get(skill, 0) + 1
+                start = text.find(alias, start + 1)
+    return found
+
+
+TEXTS = [
+    '',
+    'Senior Python developer (Python3, Django) with SQL and Docker.',
+    'JavaScript and TypeScript, but no Java; also java ee and J2EE.',
+    'C++, C#, .NET Core, ASP.NET and node.js/express.js on AWS.',
+    'CI/CD with docker-compose, scikit-learn models, A/B testing.',
+    'pythonic javascripts cpp11 golang-based',
+    'Ünïcode résumé: Python — SQL; “Docker” · Kubernetes…',
+    'python python PYTHON Python.',
+]
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_matches_the_substring_scan(text):
+    assert SkillMatcher(SKILLS).find(text) == substring_scan(SKILLS, text)
+
+
+def test_matches_the_substring_scan_on_generated_cvs():
+    matcher = app.get_skill_matcher()
+    aliases = [alias for names in SKILLS.values() for alias in names]
+    filler = ['experience', 'with', 'and', 'team', 'built', '-', '/', '.', ',', '(', ')', 'a', 'c', 'r', 'go']
+    rng = random.Random(42)
+    for _ in range(50):
+        words = [rng.choice(aliases) if rng.random() < 0.3 else rng.choice(filler) for _ in range(rng.randint(20, 200))]
+        text = rng.choice([' ', '', '\n']).join(words)
+        assert matcher.find(text) == substring_scan(SKILLS, text)
+
+
+def test_short_canonical_names_do_not_match_prose():
+    found = app.get_skill_matcher().find('I can write R code in C as well as Go')
+    assert not {'R', 'C', 'Go'} & set(found)